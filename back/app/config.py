@@ -15,6 +15,24 @@ class Config:
     # OSRM
     OSRM_BASE_URL = os.getenv('OSRM_BASE_URL', 'http://router.project-osrm.org')
     
+    # Trabajos del algoritmo genético en segundo plano
+    AG_JOBS_CONCURRENTES = int(os.getenv('AG_JOBS_CONCURRENTES', 2))
+    AG_JOBS_MAX_COLA = int(os.getenv('AG_JOBS_MAX_COLA', 20))
+    AG_JOBS_RETENCION = int(os.getenv('AG_JOBS_RETENCION', 100))
+    # Máximo de ejecuciones independientes (reinicios) por petición
+    AG_MAX_REINICIOS = int(os.getenv('AG_MAX_REINICIOS', 16))
+    # Directorio donde volcar un .pstats (cProfile) por ejecución; vacío para desactivar
+    AG_CPROFILE_DIR = os.getenv('AG_CPROFILE_DIR') or None
+    
+    # Élites guardadas para arrancar en caliente escenarios repetidos
+    AG_SOLUCIONES_DIR = os.getenv('AG_SOLUCIONES_DIR', 'data/soluciones_ag')
+    AG_SOLUCIONES_MAX = int(os.getenv('AG_SOLUCIONES_MAX', 200))
+    
+    # Caché de resultados completos de run-scenario
+    AG_RESULTADOS_DIR = os.getenv('AG_RESULTADOS_DIR', 'data/resultados_ag')
+    AG_RESULTADOS_TTL = int(os.getenv('AG_RESULTADOS_TTL', 3600))
+    AG_RESULTADOS_MAX_MB = int(os.getenv('AG_RESULTADOS_MAX_MB', 256))
+    
     # CORS para desarrollo React
     CORS_ORIGINS = [
         "http://localhost:3000",
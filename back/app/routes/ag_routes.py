@@ -1,57 +1,267 @@
-from flask import Blueprint, request, jsonify, current_app
-from core.exceptions import ValidationError, GeneticAlgorithmError
+import queue
+import threading
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from core.exceptions import ValidationError, GeneticAlgorithmError, JobQueueFullError, JobStateError
 from core.helpers import ResponseFormatter
+from services.algorithms.core.solution_store import SolutionStore
 from services.algorithms.main.genetic_algorithm import LogisticsGeneticAlgorithm
+from services.jobs.job_manager import GAJobManager
+from services.jobs.reoptimization import (
+    GENERACIONES_REOPTIMIZACION, MAX_GENERACIONES_REOPTIMIZACION, SEGUNDOS_REOPTIMIZACION,
+    MAX_SEGUNDOS_REOPTIMIZACION
+)
+from services.jobs.result_cache import GAResultCache
 
 ag_bp = Blueprint('ag', __name__)
 
+def _validar_datos_ag(data):
+    """Validar el payload del frontend y devolver (frontend_data, parametros_ag)"""
+    if not data:
+        raise ValidationError("No se recibieron datos")
+
+    if 'datos_actuales_frontend_a_backend' not in data:
+        raise ValidationError("Estructura de datos incorrecta")
+
+    frontend_data = data['datos_actuales_frontend_a_backend']
+
+    required_keys = ['map_data', 'scenario_config']
+    missing_keys = [key for key in required_keys if key not in frontend_data]
+    if missing_keys:
+        raise ValidationError(f"Faltan campos requeridos: {missing_keys}")
+
+    map_data = frontend_data['map_data']
+    if not map_data.get('rutas_data'):
+        raise ValidationError("map_data requiere rutas_data")
+
+    scenario_config = frontend_data['scenario_config']
+    if not scenario_config.get('vehiculos_disponibles') or not scenario_config.get('tipo_desastre'):
+        raise ValidationError("scenario_config requiere vehiculos_disponibles y tipo_desastre")
+
+    parametros_ag = scenario_config.get('configuracion', {})
+
+    reinicios = parametros_ag.get('reinicios', 1)
+    max_reinicios = current_app.config['AG_MAX_REINICIOS']
+    if not isinstance(reinicios, int) or isinstance(reinicios, bool) or not 1 <= reinicios <= max_reinicios:
+        raise ValidationError(f"reinicios debe ser un entero entre 1 y {max_reinicios}")
+
+    current_app.logger.info(f"Ejecutando AG con {len(scenario_config['vehiculos_disponibles'])} vehículos y {len(map_data['rutas_data'])} rutas")
+
+    return frontend_data, parametros_ag
+
+def _solution_store() -> SolutionStore:
+    """Historial de élites para arranque en caliente, uno por aplicación"""
+    store = current_app.extensions.get('ag_soluciones')
+    if store is None:
+        store = current_app.extensions.setdefault('ag_soluciones', SolutionStore(
+            current_app.config['AG_SOLUCIONES_DIR'],
+            max_escenarios=current_app.config['AG_SOLUCIONES_MAX']
+        ))
+    return store
+
+def _result_cache() -> GAResultCache:
+    """Caché de resultados de run-scenario, una por aplicación"""
+    cache = current_app.extensions.get('ag_resultados')
+    if cache is None:
+        cache = current_app.extensions.setdefault('ag_resultados', GAResultCache(
+            current_app.config['AG_RESULTADOS_DIR'],
+            ttl_segundos=current_app.config['AG_RESULTADOS_TTL'],
+            max_bytes=current_app.config['AG_RESULTADOS_MAX_MB'] * 1024 * 1024
+        ))
+    return cache
+
+def _job_manager() -> GAJobManager:
+    """Gestor de trabajos del AG, uno por aplicación"""
+    manager = current_app.extensions.get('ag_jobs')
+    if manager is None:
+        manager = current_app.extensions.setdefault('ag_jobs', GAJobManager(
+            max_concurrentes=current_app.config['AG_JOBS_CONCURRENTES'],
+            max_cola=current_app.config['AG_JOBS_MAX_COLA'],
+            retencion=current_app.config['AG_JOBS_RETENCION'],
+            solution_store=_solution_store(),
+            directorio_cprofile=current_app.config['AG_CPROFILE_DIR']
+        ))
+    return manager
+
 @ag_bp.route('/run-scenario', methods=['POST'])
 def run_genetic_algorithm():
     """Ejecutar algoritmo genético para optimización logística"""
     try:
-        data = request.get_json()
-        
-        if not data:
-            raise ValidationError("No se recibieron datos")
-        
-        if 'datos_actuales_frontend_a_backend' not in data:
-            raise ValidationError("Estructura de datos incorrecta")
-        
-        frontend_data = data['datos_actuales_frontend_a_backend']
-        
-        required_keys = ['map_data', 'scenario_config']
-        missing_keys = [key for key in required_keys if key not in frontend_data]
-        if missing_keys:
-            raise ValidationError(f"Faltan campos requeridos: {missing_keys}")
-        
-        map_data = frontend_data['map_data']
-        if not map_data.get('rutas_data'):
-            raise ValidationError("map_data requiere rutas_data")
-        
-        scenario_config = frontend_data['scenario_config']
-        if not scenario_config.get('vehiculos_disponibles') or not scenario_config.get('tipo_desastre'):
-            raise ValidationError("scenario_config requiere vehiculos_disponibles y tipo_desastre")
-        
-        parametros_ag = scenario_config.get('configuracion', {})
-        
-        current_app.logger.info(f"Ejecutando AG con {len(scenario_config['vehiculos_disponibles'])} vehículos y {len(map_data['rutas_data'])} rutas")
-        
-        ag = LogisticsGeneticAlgorithm(frontend_data, parametros_ag)
-        resultado = ag.ejecutar()
-        
-        return jsonify(ResponseFormatter.success(
+        frontend_data, parametros_ag = _validar_datos_ag(request.get_json())
+        solution_store = _solution_store()
+        directorio_cprofile = current_app.config['AG_CPROFILE_DIR']
+
+        def calcular():
+            ag = LogisticsGeneticAlgorithm(frontend_data, parametros_ag, solution_store=solution_store,
+                                           directorio_cprofile=directorio_cprofile)
+            return ag.ejecutar()
+
+        cache = _result_cache()
+        resultado, origen = cache.obtener_o_calcular(cache.clave(frontend_data, parametros_ag), calcular)
+
+        respuesta = jsonify(ResponseFormatter.success(
             data=resultado,
             message="Algoritmo genético ejecutado exitosamente"
         ))
-        
+        respuesta.headers['X-AG-Cache'] = origen
+        return respuesta
+
     except ValidationError as e:
         current_app.logger.error(f"Error de validación AG: {e}")
         return jsonify(ResponseFormatter.error(str(e), "VALIDATION_ERROR")), 400
-        
+
+    except GeneticAlgorithmError as e:
+        current_app.logger.error(f"Error AG: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "GENETIC_ALGORITHM_ERROR")), 500
+
+    except Exception as e:
+        current_app.logger.error(f"Error AG inesperado: {e}")
+        return jsonify(ResponseFormatter.error("Error interno del servidor", "INTERNAL_ERROR")), 500
+
+@ag_bp.route('/run-scenario/stream', methods=['POST'])
+def stream_genetic_algorithm():
+    """Ejecutar el algoritmo genético emitiendo el progreso como Server-Sent Events"""
+    try:
+        frontend_data, parametros_ag = _validar_datos_ag(request.get_json())
+        cada = max(1, request.args.get('cada', 1, type=int))
+
+        ag = LogisticsGeneticAlgorithm(frontend_data, parametros_ag, solution_store=_solution_store(),
+                                       directorio_cprofile=current_app.config['AG_CPROFILE_DIR'])
+
+    except ValidationError as e:
+        current_app.logger.error(f"Error de validación AG: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "VALIDATION_ERROR")), 400
+
     except GeneticAlgorithmError as e:
         current_app.logger.error(f"Error AG: {e}")
         return jsonify(ResponseFormatter.error(str(e), "GENETIC_ALGORITHM_ERROR")), 500
-        
+
+    except Exception as e:
+        current_app.logger.error(f"Error AG inesperado: {e}")
+        return jsonify(ResponseFormatter.error("Error interno del servidor", "INTERNAL_ERROR")), 500
+
+    eventos = queue.Queue()
+
+    def ejecutar():
+        try:
+            resultado = ag.ejecutar(lambda progreso: eventos.put(('generacion', progreso)), cada)
+            eventos.put(('resultado', ResponseFormatter.success(
+                data=resultado,
+                message="Algoritmo genético ejecutado exitosamente"
+            )))
+        except Exception as e:
+            eventos.put(('error', ResponseFormatter.error(str(e), "GENETIC_ALGORITHM_ERROR")))
+
+    def emitir():
+        hilo = threading.Thread(target=ejecutar, name="ag-stream", daemon=True)
+        hilo.start()
+        try:
+            while True:
+                evento, datos = eventos.get()
+                yield f"event: {evento}\ndata: {current_app.json.dumps(datos)}\n\n"
+                if evento != 'generacion':
+                    break
+        finally:
+            # El cliente cerró la conexión: detener el AG en la siguiente generación
+            ag.control.cancelar()
+
+    return Response(stream_with_context(emitir()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@ag_bp.route('/jobs', methods=['POST'])
+def submit_genetic_algorithm_job():
+    """Encolar una ejecución del algoritmo genético en segundo plano"""
+    try:
+        frontend_data, parametros_ag = _validar_datos_ag(request.get_json())
+
+        trabajo = _job_manager().enviar(frontend_data, parametros_ag)
+
+        return jsonify(ResponseFormatter.success(
+            data={"job_id": trabajo.id, "estado": trabajo.estado},
+            message="Trabajo del algoritmo genético encolado"
+        )), 202
+
+    except ValidationError as e:
+        current_app.logger.error(f"Error de validación AG: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "VALIDATION_ERROR")), 400
+
+    except JobQueueFullError as e:
+        current_app.logger.warning(f"Trabajo AG rechazado: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "QUEUE_FULL")), 429
+
+    except Exception as e:
+        current_app.logger.error(f"Error AG inesperado: {e}")
+        return jsonify(ResponseFormatter.error("Error interno del servidor", "INTERNAL_ERROR")), 500
+
+@ag_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_genetic_algorithm_job(job_id):
+    """Consultar estado, progreso y resultado de un trabajo"""
+    manager = _job_manager()
+    trabajo = manager.obtener(job_id)
+
+    if trabajo is None:
+        return jsonify(ResponseFormatter.error(f"Trabajo {job_id} no encontrado", "JOB_NOT_FOUND")), 404
+
+    return jsonify(ResponseFormatter.success(data=manager.describir(trabajo)))
+
+@ag_bp.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_genetic_algorithm_job(job_id):
+    """Solicitar la cancelación de un trabajo en cola o en ejecución"""
+    manager = _job_manager()
+    trabajo = manager.cancelar(job_id)
+
+    if trabajo is None:
+        return jsonify(ResponseFormatter.error(f"Trabajo {job_id} no encontrado", "JOB_NOT_FOUND")), 404
+
+    return jsonify(ResponseFormatter.success(
+        data=manager.describir(trabajo),
+        message="Cancelación solicitada"
+    ))
+
+@ag_bp.route('/jobs/<job_id>/reoptimizar', methods=['POST'])
+def reoptimize_genetic_algorithm_job(job_id):
+    """Reoptimizar un trabajo completado tras cerrar/abrir rutas o cambiar la flota"""
+    try:
+        data = request.get_json(silent=True) or {}
+        generaciones = min(int(data.get('generaciones', GENERACIONES_REOPTIMIZACION)),
+                           MAX_GENERACIONES_REOPTIMIZACION)
+        max_segundos = min(float(data.get('max_segundos', SEGUNDOS_REOPTIMIZACION)),
+                           MAX_SEGUNDOS_REOPTIMIZACION)
+        if generaciones < 1 or not max_segundos > 0:
+            raise ValidationError("generaciones y max_segundos deben ser positivos")
+
+        manager = _job_manager()
+        trabajo = manager.reoptimizar(job_id, data.get('delta'), generaciones, max_segundos)
+
+        if trabajo is None:
+            return jsonify(ResponseFormatter.error(f"Trabajo {job_id} no encontrado", "JOB_NOT_FOUND")), 404
+
+        return jsonify(ResponseFormatter.success(
+            data={"job_id": trabajo.id, "estado": trabajo.estado, "reoptimiza": job_id},
+            message="Reoptimización encolada"
+        )), 202
+
+    except (TypeError, ValueError) as e:
+        current_app.logger.error(f"Error de validación AG: {e}")
+        return jsonify(ResponseFormatter.error("generaciones y max_segundos deben ser numéricos", "VALIDATION_ERROR")), 400
+
+    except ValidationError as e:
+        current_app.logger.error(f"Error de validación AG: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "VALIDATION_ERROR")), 400
+
+    except JobStateError as e:
+        current_app.logger.warning(f"Reoptimización rechazada: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "JOB_NOT_COMPLETED")), 409
+
+    except JobQueueFullError as e:
+        current_app.logger.warning(f"Reoptimización rechazada: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "QUEUE_FULL")), 429
+
+    except GeneticAlgorithmError as e:
+        current_app.logger.error(f"Error AG: {e}")
+        return jsonify(ResponseFormatter.error(str(e), "GENETIC_ALGORITHM_ERROR")), 500
+
     except Exception as e:
         current_app.logger.error(f"Error AG inesperado: {e}")
-        return jsonify(ResponseFormatter.error("Error interno del servidor", "INTERNAL_ERROR")), 500
\ No newline at end of file
+        return jsonify(ResponseFormatter.error("Error interno del servidor", "INTERNAL_ERROR")), 500
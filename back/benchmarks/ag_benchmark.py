@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Benchmark del algoritmo genético con escenarios sintéticos
+
+Genera payloads datos_actuales_frontend_a_backend de tamaño creciente y
+ejecuta LogisticsGeneticAlgorithm sin la base de datos de localidades.
+
+Uso (desde back/):
+    python -m benchmarks.ag_benchmark --salida benchmarks/baseline.json
+    python -m benchmarks.ag_benchmark --comparar benchmarks/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.data.data_loader import data_loader
+from services.algorithms.core.data_manager import DataManager
+from services.algorithms.main.genetic_algorithm import LogisticsGeneticAlgorithm
+
+# (rutas, vehículos)
+TAMAÑOS_ESCENARIO: List[Tuple[int, int]] = [(10, 5), (25, 12), (50, 25), (100, 50)]
+
+PROBABILIDAD_RUTA_CERRADA = 0.15
+
+
+class LocalidadesSinteticas:
+    """Sustituye a DatabaseService: población determinista por clave de localidad"""
+
+    def __init__(self, seed: int):
+        self.seed = seed
+
+    def get_localidad_by_clave(self, clave_localidad: str) -> Dict[str, Any]:
+        rng = random.Random(f"{self.seed}:{clave_localidad}")
+        return {'clave_localidad': clave_localidad, 'poblacion': rng.randint(1000, 50000)}
+
+
+def generar_payload(total_rutas: int, total_vehiculos: int, tipo_desastre: str,
+                    rng: random.Random) -> Dict[str, Any]:
+    """Payload con el formato que envía el frontend a /api/ag/run-scenario"""
+    vehiculos = data_loader.get_vehiculos()
+    tipos = sorted({v['tipo'] for v in vehiculos})
+
+    rutas_data = []
+    for i in range(total_rutas):
+        rutas_data.append({
+            'id': i + 1,
+            'clave_localidad': f"{rng.randint(1, 32):02d}{rng.randint(1, 570):03d}{i:04d}",
+            'distancia_km': round(rng.uniform(3, 80), 2),
+            'estado': 'cerrada' if rng.random() < PROBABILIDAD_RUTA_CERRADA else 'abierta',
+            'vehiculos_permitidos': rng.sample(tipos, rng.randint(1, len(tipos)))
+        })
+
+    flota: Dict[str, int] = {}
+    for _ in range(total_vehiculos):
+        modelo = rng.choice(vehiculos)['modelo']
+        flota[modelo] = flota.get(modelo, 0) + 1
+
+    return {
+        'map_data': {'rutas_data': rutas_data},
+        'scenario_config': {
+            'vehiculos_disponibles': [{'modelo': m, 'cantidad': c} for m, c in flota.items()],
+            'tipo_desastre': tipo_desastre
+        }
+    }
+
+
+def _crear_ag(payload: Dict[str, Any], parametros_ag: Dict[str, Any], seed: int) -> LogisticsGeneticAlgorithm:
+    data_manager = DataManager(db_service=LocalidadesSinteticas(seed))
+    return LogisticsGeneticAlgorithm(payload, dict(parametros_ag, seed=seed), data_manager)
+
+
+def medir_escenario(payload: Dict[str, Any], parametros_ag: Dict[str, Any], seed: int,
+                    medir_memoria: bool = True, archivo_cprofile: Optional[str] = None) -> Dict[str, Any]:
+    ag = _crear_ag(payload, parametros_ag, seed)
+    inicio = time.perf_counter()
+    resultado = ag.ejecutar(archivo_cprofile=archivo_cprofile)
+    duracion = time.perf_counter() - inicio
+
+    cache = ag.fitness_cache.metricas()
+    evaluaciones = cache['aciertos'] + cache['fallos']
+    generaciones = len(ag.evolucion_fitness)
+
+    medicion = {
+        'tiempo_s': duracion,
+        'generaciones': generaciones,
+        'generaciones_por_segundo': generaciones / duracion if duracion > 0 else 0.0,
+        'evaluaciones': evaluaciones,
+        'evaluaciones_calculadas': cache['fallos'],
+        'evaluaciones_por_segundo': evaluaciones / duracion if duracion > 0 else 0.0,
+        'fitness_final': resultado['solucion_optima']['fitness'],
+        'memoria_pico_mb': None
+    }
+
+    if 'perfil' in resultado:
+        medicion['perfil'] = {
+            operador: datos['tiempo_s'] for operador, datos in resultado['perfil']['operadores'].items()
+        }
+
+    if medir_memoria:
+        # Segunda ejecución con la misma semilla: tracemalloc distorsiona los tiempos
+        tracemalloc.start()
+        try:
+            _crear_ag(payload, parametros_ag, seed).ejecutar()
+            _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        medicion['memoria_pico_mb'] = pico / (1024 * 1024)
+
+    return medicion
+
+
+def ejecutar_benchmark(tamaños: List[Tuple[int, int]], desastres: List[str],
+                       parametros_ag: Dict[str, Any], seed: int,
+                       medir_memoria: bool = True, directorio_cprofile: Optional[str] = None) -> Dict[str, Any]:
+    resultados = []
+
+    for total_rutas, total_vehiculos in tamaños:
+        for tipo_desastre in desastres:
+            rng = random.Random(f"{seed}:{total_rutas}:{total_vehiculos}:{tipo_desastre}")
+            payload = generar_payload(total_rutas, total_vehiculos, tipo_desastre, rng)
+            archivo_cprofile = None
+            if directorio_cprofile:
+                archivo_cprofile = os.path.join(
+                    directorio_cprofile, f"ag_{total_rutas}x{total_vehiculos}_{tipo_desastre}.pstats"
+                )
+            medicion = medir_escenario(payload, parametros_ag, seed, medir_memoria, archivo_cprofile)
+
+            resultados.append({
+                'rutas': total_rutas,
+                'vehiculos': total_vehiculos,
+                'tipo_desastre': tipo_desastre,
+                **medicion
+            })
+            print(f"[INFO] {total_rutas} rutas / {total_vehiculos} vehículos / {tipo_desastre}: "
+                  f"{medicion['generaciones_por_segundo']:.1f} gen/s, "
+                  f"{medicion['evaluaciones_por_segundo']:.0f} eval/s, "
+                  f"fitness {medicion['fitness_final']:.4f}")
+
+    return {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'entorno': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'plataforma': platform.platform(),
+            'procesadores': os.cpu_count()
+        },
+        'seed': seed,
+        'parametros_ag': parametros_ag,
+        'resultados': resultados
+    }
+
+
+def comparar(actual: Dict[str, Any], referencia: Dict[str, Any], tolerancia: float) -> List[str]:
+    """Escenarios cuyo throughput cayó más de `tolerancia` respecto a la referencia"""
+    def clave(r):
+        return r['rutas'], r['vehiculos'], r['tipo_desastre']
+
+    previos = {clave(r): r for r in referencia.get('resultados', [])}
+    regresiones = []
+
+    for resultado in actual['resultados']:
+        previo = previos.get(clave(resultado))
+        if not previo or not previo['generaciones_por_segundo']:
+            continue
+
+        ratio = resultado['generaciones_por_segundo'] / previo['generaciones_por_segundo']
+        print(f"[INFO] {clave(resultado)}: {ratio:.2f}x gen/s, "
+              f"fitness {previo['fitness_final']:.4f} -> {resultado['fitness_final']:.4f}")
+        if ratio < 1 - tolerancia:
+            regresiones.append(f"{clave(resultado)}: {ratio:.2f}x")
+
+    return regresiones
+
+
+def _parsear_tamaños(valor: Optional[str]) -> List[Tuple[int, int]]:
+    if not valor:
+        return TAMAÑOS_ESCENARIO
+    return [tuple(int(x) for x in par.split('x')) for par in valor.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del algoritmo genético")
+    parser.add_argument('--tamaños', help="Escenarios RUTASxVEHICULOS separados por coma, p. ej. 10x5,50x25")
+    parser.add_argument('--desastres', help="Tipos de desastre separados por coma (por defecto todos)")
+    parser.add_argument('--generaciones', type=int, default=50)
+    parser.add_argument('--poblacion', type=int, default=50)
+    parser.add_argument('--motor', default='objetos')
+    parser.add_argument('--seed', type=int, default=12345)
+    parser.add_argument('--sin-memoria', action='store_true', help="No medir memoria pico")
+    parser.add_argument('--perfil', action='store_true', help="Incluir tiempo por operador")
+    parser.add_argument('--cprofile', help="Directorio donde volcar un .pstats por escenario")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados")
+    parser.add_argument('--comparar', help="Baseline JSON con el que comparar")
+    parser.add_argument('--tolerancia', type=float, default=0.2)
+    args = parser.parse_args()
+
+    desastres = (args.desastres.split(',') if args.desastres
+                 else [d['tipo'] for d in data_loader.get_desastres()])
+    parametros_ag = {
+        'generaciones': args.generaciones,
+        'poblacion_size': args.poblacion,
+        'motor': args.motor,
+        'perfil': args.perfil
+    }
+
+    if args.cprofile:
+        os.makedirs(args.cprofile, exist_ok=True)
+
+    reporte = ejecutar_benchmark(_parsear_tamaños(args.tamaños), desastres, parametros_ag,
+                                 args.seed, not args.sin_memoria, args.cprofile)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+        print(f"[INFO] Resultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as archivo:
+            regresiones = comparar(reporte, json.load(archivo), args.tolerancia)
+        if regresiones:
+            print(f"[ERROR] Regresiones de rendimiento: {regresiones}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Ajuste de parámetros del algoritmo genético sobre un corpus de escenarios
+
+Busca por rejilla o por successive halving en un espacio de valores de
+ConfiguracionAG, registra la curva fitness-tiempo de cada ejecución y
+recomienda, por grupo de tamaño (número de rutas), la configuración más
+barata que alcanza la calidad objetivo. La calidad de una ejecución es su
+fitness dividido por el mejor fitness conocido del escenario.
+
+`generaciones` actúa como presupuesto: cada configuración se ejecuta con el
+valor más alto de su ronda y la curva da el fitness en cada valor menor,
+así que no hace falta repetirla por generación.
+
+Uso (desde back/):
+    python -m benchmarks.ag_tuning --salida benchmarks/tuning.json
+    python -m benchmarks.ag_tuning --estrategia halving --recomendaciones entities/data/configuracion_ag.json
+    python -m benchmarks.ag_tuning --corpus escenarios/ --espacio espacio.json
+"""
+
+import argparse
+import dataclasses
+import glob
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.algorithms.core.data_manager import DataManager
+from services.algorithms.main.genetic_algorithm import LogisticsGeneticAlgorithm
+from services.algorithms.models import ConfiguracionAG
+from benchmarks.ag_benchmark import LocalidadesSinteticas, generar_payload
+
+TAMAÑOS_CORPUS: List[Tuple[int, int]] = [(10, 5), (25, 12), (50, 25), (100, 50)]
+
+ESPACIO_BUSQUEDA: Dict[str, List[Any]] = {
+    'poblacion_size': [30, 50, 100],
+    'generaciones': [25, 50, 100, 200],
+    'prob_cruza': [0.6, 0.8, 0.9],
+    'prob_mutacion': [0.05, 0.1, 0.2]
+}
+
+# Límite superior de rutas de cada grupo; el último grupo no tiene límite
+LIMITES_RUTAS = (25, 100)
+
+
+@dataclasses.dataclass
+class Escenario:
+    nombre: str
+    rutas: int
+    payload: Dict[str, Any]
+    sintetico: bool
+    seed: int
+
+
+def grupo_rutas(total_rutas: int) -> Optional[int]:
+    """max_rutas del grupo al que pertenece un escenario (None para el último)."""
+    for limite in LIMITES_RUTAS:
+        if total_rutas <= limite:
+            return limite
+    return None
+
+
+def corpus_sintetico(tamaños: List[Tuple[int, int]], desastres: List[str], por_tamaño: int,
+                     seed: int) -> List[Escenario]:
+    escenarios = []
+    for (total_rutas, total_vehiculos), tipo_desastre in itertools.product(tamaños, desastres):
+        for i in range(por_tamaño):
+            nombre = f"{total_rutas}x{total_vehiculos}_{tipo_desastre}_{i}"
+            rng = random.Random(f"{seed}:{nombre}")
+            escenarios.append(Escenario(
+                nombre, total_rutas, generar_payload(total_rutas, total_vehiculos, tipo_desastre, rng),
+                True, seed + len(escenarios)
+            ))
+    return escenarios
+
+
+def corpus_archivos(directorio: str, seed: int) -> List[Escenario]:
+    """Payloads JSON guardados, con o sin la envoltura datos_actuales_frontend_a_backend."""
+    escenarios = []
+    for ruta in sorted(glob.glob(os.path.join(directorio, '*.json'))):
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            payload = json.load(archivo)
+        payload = payload.get('datos_actuales_frontend_a_backend', payload)
+        escenarios.append(Escenario(
+            os.path.splitext(os.path.basename(ruta))[0], len(payload['map_data']['rutas_data']),
+            payload, False, seed + len(escenarios)
+        ))
+    return escenarios
+
+
+def _ejecutar_corrida(escenario: Escenario, parametros_ag: Dict[str, Any]) -> Dict[str, Any]:
+    """Una ejecución con su curva [(generación, segundos, mejor fitness)]."""
+    data_manager = DataManager(db_service=LocalidadesSinteticas(escenario.seed)) if escenario.sintetico else None
+    ag = LogisticsGeneticAlgorithm(escenario.payload, dict(parametros_ag, seed=escenario.seed), data_manager)
+
+    curva = []
+    resultado = ag.ejecutar(lambda progreso: curva.append((
+        progreso['generacion'], progreso['tiempo_transcurrido_s'], progreso['mejor_fitness']
+    )))
+    return {
+        'escenario': escenario.nombre,
+        'parametros_ag': parametros_ag,
+        'fitness_final': resultado['solucion_optima']['fitness'],
+        'tiempo_s': ag.control.segundos_transcurridos(),
+        'curva': curva
+    }
+
+
+def _punto_curva(curva: List[tuple], generaciones: int) -> Optional[Tuple[float, float]]:
+    """(segundos, mejor fitness) al completar `generaciones`.
+
+    Si la ejecución se detuvo antes (p. ej. por estancamiento) vale su último punto.
+    """
+    alcanzado = None
+    for generacion, segundos, fitness in curva:
+        if generacion > generaciones:
+            break
+        alcanzado = (segundos, fitness if alcanzado is None else max(fitness, alcanzado[1]))
+    return alcanzado
+
+
+class AjusteAG:
+    """Búsqueda de configuraciones y recomendación por grupo de tamaño."""
+
+    def __init__(self, escenarios: List[Escenario], espacio: Dict[str, List[Any]], objetivo: float,
+                 procesos: int = 0, fijos: Optional[Dict[str, Any]] = None):
+        self.escenarios = escenarios
+        self.presupuestos = sorted(espacio.get('generaciones', [ConfiguracionAG.generaciones]))
+        otros = {clave: valores for clave, valores in espacio.items() if clave != 'generaciones'}
+        self.configuraciones = [dict(zip(otros, valores)) for valores in itertools.product(*otros.values())]
+        self.objetivo = objetivo
+        self.procesos = procesos if procesos > 0 else (os.cpu_count() or 1)
+        self.fijos = fijos or {}
+        self.corridas: List[Dict[str, Any]] = []
+        self._mejores: Optional[Dict[str, float]] = None
+
+    def rejilla(self) -> None:
+        self._ejecutar_ronda(self.configuraciones, self.presupuestos[-1])
+
+    def successive_halving(self, eta: int = 3) -> None:
+        """Cada ronda conserva la mejor 1/eta de las configuraciones y sube el presupuesto."""
+        candidatas = self.configuraciones
+        for ronda, presupuesto in enumerate(self.presupuestos):
+            self._ejecutar_ronda(candidatas, presupuesto)
+            if ronda == len(self.presupuestos) - 1:
+                break
+            calidades = [self.calidad(configuracion, presupuesto) for configuracion in candidatas]
+            orden = sorted(range(len(candidatas)), key=lambda i: calidades[i], reverse=True)
+            candidatas = [candidatas[i] for i in orden[:max(1, math.ceil(len(candidatas) / eta))]]
+
+    def _ejecutar_ronda(self, configuraciones: List[Dict[str, Any]], presupuesto: int) -> None:
+        tareas = [
+            (escenario, dict(self.fijos, **configuracion, generaciones=presupuesto))
+            for configuracion in configuraciones for escenario in self.escenarios
+        ]
+        print(f"[INFO] {len(configuraciones)} configuraciones x {len(self.escenarios)} escenarios "
+              f"con {presupuesto} generaciones")
+
+        if self.procesos > 1:
+            with ProcessPoolExecutor(max_workers=self.procesos) as pool:
+                corridas = list(pool.map(_ejecutar_corrida, *zip(*tareas)))
+        else:
+            corridas = [_ejecutar_corrida(escenario, parametros) for escenario, parametros in tareas]
+        self.corridas.extend(corridas)
+        self._mejores = None
+
+    def mejor_conocido(self, escenario: str) -> float:
+        if self._mejores is None:
+            self._mejores = {}
+            for corrida in self.corridas:
+                previo = self._mejores.get(corrida['escenario'], 0.0)
+                self._mejores[corrida['escenario']] = max(previo, corrida['fitness_final'])
+        return self._mejores.get(escenario, 0.0)
+
+    def _puntos(self, configuracion: Dict[str, Any], generaciones: int,
+                escenarios: List[Escenario]) -> Optional[List[Tuple[float, float]]]:
+        """(segundos, calidad) en cada escenario con la corrida de mayor presupuesto, o None si falta alguno."""
+        puntos = []
+        for escenario in escenarios:
+            corridas = [
+                corrida for corrida in self.corridas
+                if corrida['escenario'] == escenario.nombre and
+                all(corrida['parametros_ag'].get(clave) == valor for clave, valor in configuracion.items()) and
+                corrida['parametros_ag']['generaciones'] >= generaciones
+            ]
+            if not corridas:
+                return None
+            corrida = max(corridas, key=lambda c: c['parametros_ag']['generaciones'])
+            punto = _punto_curva(corrida['curva'], generaciones)
+            if punto is None:
+                punto = (corrida['tiempo_s'], corrida['fitness_final'])
+            segundos, fitness = punto
+            puntos.append((segundos, fitness / max(self.mejor_conocido(escenario.nombre), 1e-12)))
+        return puntos
+
+    def calidad(self, configuracion: Dict[str, Any], generaciones: int,
+                escenarios: Optional[List[Escenario]] = None) -> float:
+        puntos = self._puntos(configuracion, generaciones, escenarios or self.escenarios)
+        return float(np.mean([calidad for _, calidad in puntos])) if puntos else 0.0
+
+    def recomendaciones(self) -> List[Dict[str, Any]]:
+        """Configuración más barata que alcanza el objetivo en cada grupo de tamaño.
+
+        Si ninguna lo alcanza, se recomienda la de mayor calidad.
+        """
+        grupos: Dict[Optional[int], List[Escenario]] = {}
+        for escenario in self.escenarios:
+            grupos.setdefault(grupo_rutas(escenario.rutas), []).append(escenario)
+
+        recomendaciones = []
+        for limite in sorted(grupos, key=lambda l: math.inf if l is None else l):
+            candidatas = []
+            for configuracion, generaciones in itertools.product(self.configuraciones, self.presupuestos):
+                puntos = self._puntos(configuracion, generaciones, grupos[limite])
+                if puntos is None:
+                    continue
+                candidatas.append({
+                    'configuracion': dict(configuracion, generaciones=generaciones),
+                    'calidad': float(np.mean([calidad for _, calidad in puntos])),
+                    'calidad_minima': float(min(calidad for _, calidad in puntos)),
+                    'segundos': float(np.mean([segundos for segundos, _ in puntos]))
+                })
+            if not candidatas:
+                continue
+
+            validas = [c for c in candidatas if c['calidad'] >= self.objetivo]
+            elegida = (min(validas, key=lambda c: c['segundos']) if validas
+                       else max(candidatas, key=lambda c: c['calidad']))
+            recomendaciones.append({
+                'max_rutas': limite,
+                'escenarios': len(grupos[limite]),
+                'alcanza_objetivo': bool(validas),
+                **elegida
+            })
+        return recomendaciones
+
+    def reporte(self, estrategia: str) -> Dict[str, Any]:
+        return {
+            'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'entorno': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'plataforma': platform.platform(),
+                'procesadores': os.cpu_count()
+            },
+            'estrategia': estrategia,
+            'objetivo': self.objetivo,
+            'escenarios': [{'nombre': e.nombre, 'rutas': e.rutas} for e in self.escenarios],
+            'recomendaciones': self.recomendaciones(),
+            'corridas': self.corridas
+        }
+
+
+def _parsear_tamaños(valor: Optional[str]) -> List[Tuple[int, int]]:
+    if not valor:
+        return TAMAÑOS_CORPUS
+    return [tuple(int(x) for x in par.split('x')) for par in valor.split(',')]
+
+
+def _cargar_espacio(valor: Optional[str]) -> Dict[str, List[Any]]:
+    """Espacio desde un archivo JSON o JSON en línea; sólo campos de ConfiguracionAG."""
+    if not valor:
+        return ESPACIO_BUSQUEDA
+    if os.path.exists(valor):
+        with open(valor, 'r', encoding='utf-8') as archivo:
+            espacio = json.load(archivo)
+    else:
+        espacio = json.loads(valor)
+
+    campos = {campo.name for campo in dataclasses.fields(ConfiguracionAG)}
+    desconocidos = set(espacio) - campos
+    if desconocidos:
+        raise SystemExit(f"[ERROR] Campos que no son de ConfiguracionAG: {sorted(desconocidos)}")
+    return {clave: valores if isinstance(valores, list) else [valores] for clave, valores in espacio.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ajuste de parámetros del algoritmo genético")
+    parser.add_argument('--corpus', help="Directorio con payloads JSON (por defecto, escenarios sintéticos)")
+    parser.add_argument('--tamaños', help="Escenarios sintéticos RUTASxVEHICULOS separados por coma")
+    parser.add_argument('--desastres', default='terremoto', help="Tipos de desastre separados por coma")
+    parser.add_argument('--por-tamaño', type=int, default=2, help="Escenarios sintéticos por tamaño y desastre")
+    parser.add_argument('--espacio', help="Espacio de búsqueda: archivo JSON o JSON en línea")
+    parser.add_argument('--estrategia', choices=['rejilla', 'halving'], default='halving')
+    parser.add_argument('--eta', type=int, default=3, help="Factor de reducción de successive halving")
+    parser.add_argument('--objetivo', type=float, default=0.99,
+                        help="Calidad mínima: fracción del mejor fitness conocido de cada escenario")
+    parser.add_argument('--motor', default='objetos')
+    parser.add_argument('--procesos', type=int, default=0, help="Procesos en paralelo (0 = todos los núcleos)")
+    parser.add_argument('--seed', type=int, default=12345)
+    parser.add_argument('--salida', help="Archivo JSON con el reporte completo y las curvas")
+    parser.add_argument('--recomendaciones', help="Archivo JSON de configuración recomendada para DataManager")
+    args = parser.parse_args()
+
+    escenarios = (corpus_archivos(args.corpus, args.seed) if args.corpus else
+                  corpus_sintetico(_parsear_tamaños(args.tamaños), args.desastres.split(','),
+                                   args.por_tamaño, args.seed))
+    if not escenarios:
+        raise SystemExit("[ERROR] El corpus no tiene escenarios")
+
+    # Sin siembra desde otras ejecuciones, para que cada corrida dependa sólo de su configuración
+    fijos = {'motor': args.motor, 'siembra_historial': 0}
+    ajuste = AjusteAG(escenarios, _cargar_espacio(args.espacio), args.objetivo, args.procesos, fijos)
+    if args.estrategia == 'rejilla':
+        ajuste.rejilla()
+    else:
+        ajuste.successive_halving(args.eta)
+
+    reporte = ajuste.reporte(args.estrategia)
+    for recomendacion in reporte['recomendaciones']:
+        grupo = recomendacion['max_rutas'] or 'sin límite'
+        print(f"[INFO] Rutas <= {grupo}: {recomendacion['configuracion']} "
+              f"calidad {recomendacion['calidad']:.4f}, {recomendacion['segundos']:.2f} s"
+              f"{'' if recomendacion['alcanza_objetivo'] else ' (no alcanza el objetivo)'}")
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+        print(f"[INFO] Reporte guardado en {args.salida}")
+
+    if args.recomendaciones:
+        with open(args.recomendaciones, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'fecha': reporte['fecha'],
+                'estrategia': args.estrategia,
+                'objetivo': args.objetivo,
+                'grupos': [
+                    {clave: recomendacion[clave] for clave in
+                     ('max_rutas', 'configuracion', 'calidad', 'segundos', 'escenarios', 'alcanza_objetivo')}
+                    for recomendacion in reporte['recomendaciones']
+                ]
+            }, archivo, indent=2, ensure_ascii=False)
+        print(f"[INFO] Recomendaciones guardadas en {args.recomendaciones}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,4 +16,12 @@ class GeneticAlgorithmError(EmergencLogisticsException):
 
 class DataLoadError(EmergencLogisticsException):
     """Error al cargar datos"""
+    pass
+
+class JobQueueFullError(EmergencLogisticsException):
+    """Error cuando la cola de trabajos en segundo plano está llena"""
+    pass
+
+class JobStateError(EmergencLogisticsException):
+    """Error cuando el trabajo no está en un estado que permita la operación"""
     pass
\ No newline at end of file
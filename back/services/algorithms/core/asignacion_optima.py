@@ -0,0 +1,57 @@
+import numpy as np
+
+
+def asignacion_minima(costos: np.ndarray) -> np.ndarray:
+    """Asignación de costo mínimo (método húngaro por caminos más cortos).
+
+    `costos` es (n, m) con n <= m; devuelve, para cada fila, la columna que
+    le corresponde, sin columnas repetidas. O(n² m), con el bucle interno
+    vectorizado sobre las columnas. Las celdas prohibidas deben llevar un
+    costo finito grande, no infinito.
+    """
+    n, m = costos.shape
+    if n > m:
+        raise ValueError("La matriz de costos debe tener al menos tantas columnas como filas")
+
+    # Potenciales de filas (u) y columnas (v); la columna 0 es ficticia
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    fila_de_columna = np.zeros(m + 1, dtype=np.int64)
+    camino = np.zeros(m + 1, dtype=np.int64)
+    a = np.vstack([np.zeros((1, m)), costos.astype(np.float64)])
+
+    for fila in range(1, n + 1):
+        fila_de_columna[0] = fila
+        columna = 0
+        minimos = np.full(m + 1, np.inf)
+        usadas = np.zeros(m + 1, dtype=bool)
+
+        while fila_de_columna[columna] != 0:
+            usadas[columna] = True
+            i0 = fila_de_columna[columna]
+            libres = ~usadas[1:]
+            reducidos = a[i0] - u[i0] - v[1:]
+
+            mejora = libres & (reducidos < minimos[1:])
+            minimos[1:][mejora] = reducidos[mejora]
+            camino[1:][mejora] = columna
+
+            candidatos = np.where(libres, minimos[1:], np.inf)
+            siguiente = int(np.argmin(candidatos)) + 1
+            delta = candidatos[siguiente - 1]
+
+            u[fila_de_columna[usadas]] += delta
+            v[usadas] -= delta
+            minimos[~usadas] -= delta
+            columna = siguiente
+
+        while columna:
+            anterior = camino[columna]
+            fila_de_columna[columna] = fila_de_columna[anterior]
+            columna = anterior
+
+    resultado = np.empty(n, dtype=np.int64)
+    for columna in range(1, m + 1):
+        if fila_de_columna[columna]:
+            resultado[fila_de_columna[columna] - 1] = columna - 1
+    return resultado
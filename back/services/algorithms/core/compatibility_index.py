@@ -0,0 +1,65 @@
+import numpy as np
+from typing import Dict, FrozenSet, List
+from ..models import Ruta, EstadoRuta
+
+
+class CompatibilityIndex:
+    """Compatibilidad vehículo-ruta precalculada una vez por escenario.
+
+    Un vehículo puede recorrer una ruta si su tipo coincide (por subcadena,
+    sin distinguir mayúsculas) con alguno de los vehiculos_permitidos, o si
+    la ruta no restringe tipos. Las consultas posteriores son O(1).
+
+    Para la reparación se guarda además, por vehículo, una máscara de bits con
+    las rutas compatibles y abiertas: el bit j corresponde a rutas[j].
+    """
+
+    def __init__(self, rutas: List[Ruta], vehiculos_expandidos: List[dict]):
+        self.rutas = rutas
+        self.indice_ruta: Dict[int, int] = {ruta.id: j for j, ruta in enumerate(rutas)}
+
+        compatibles_por_tipo: Dict[str, np.ndarray] = {}
+        self.matriz = np.zeros((len(vehiculos_expandidos), len(rutas)), dtype=bool)
+        for i, vehiculo in enumerate(vehiculos_expandidos):
+            tipo = vehiculo['tipo'].lower()
+            if tipo not in compatibles_por_tipo:
+                compatibles_por_tipo[tipo] = np.array(
+                    [self._tipo_permitido(tipo, ruta) for ruta in rutas], dtype=bool
+                )
+            self.matriz[i] = compatibles_por_tipo[tipo]
+
+        abiertas = np.array([ruta.estado == EstadoRuta.ABIERTA for ruta in rutas], dtype=bool)
+        self.matriz_factibilidad = self.matriz & abiertas
+
+        self._rutas_compatibles: Dict[int, List[Ruta]] = {}
+        self._ids_compatibles: Dict[int, FrozenSet[int]] = {}
+        self._mascaras_factibles: Dict[int, int] = {}
+        for i, vehiculo in enumerate(vehiculos_expandidos):
+            columnas = np.flatnonzero(self.matriz[i])
+            self._rutas_compatibles[vehiculo['id']] = [rutas[j] for j in columnas]
+            self._ids_compatibles[vehiculo['id']] = frozenset(rutas[j].id for j in columnas)
+
+            mascara = 0
+            for j in np.flatnonzero(self.matriz_factibilidad[i]):
+                mascara |= 1 << int(j)
+            self._mascaras_factibles[vehiculo['id']] = mascara
+
+    @staticmethod
+    def _tipo_permitido(tipo_vehiculo: str, ruta: Ruta) -> bool:
+        if not ruta.vehiculos_permitidos:
+            return True
+
+        return any(tipo_permitido.lower() in tipo_vehiculo or
+                   tipo_vehiculo in tipo_permitido.lower()
+                   for tipo_permitido in ruta.vehiculos_permitidos)
+
+    def es_compatible(self, vehiculo_id: int, ruta_id: int) -> bool:
+        return ruta_id in self._ids_compatibles.get(vehiculo_id, ())
+
+    def rutas_compatibles(self, vehiculo_id: int) -> List[Ruta]:
+        """Rutas compatibles con el vehículo, en el orden original del escenario."""
+        return self._rutas_compatibles.get(vehiculo_id, [])
+
+    def mascara_factible(self, vehiculo_id: int) -> int:
+        """Bits de las rutas abiertas y compatibles con el vehículo (0 si no existe)."""
+        return self._mascaras_factibles.get(vehiculo_id, 0)
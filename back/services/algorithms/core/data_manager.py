@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from core.base_service import BaseService
 from core.exceptions import ValidationError
 from services.data.data_loader import data_loader
@@ -6,9 +6,9 @@ from services.data.database_service import DatabaseService
 from ..models import *
 
 class DataManager(BaseService):
-    def __init__(self):
+    def __init__(self, db_service: Optional[DatabaseService] = None):
         super().__init__()
-        self.db_service = DatabaseService()
+        self.db_service = db_service or DatabaseService()
     
     def procesar_datos_entrada(self, datos_frontend: Dict[str, Any]) -> Tuple[ScenarioData, List[Insumo]]:
         try:
@@ -25,7 +25,7 @@ class DataManager(BaseService):
             tipo_desastre = self._procesar_tipo_desastre(tipo_desastre_str)
             
             config_ag = self._procesar_configuracion_ag(
-                scenario_config.get('configuracion', {})
+                scenario_config.get('configuracion', {}), len(rutas)
             )
             
             scenario_data = ScenarioData(
@@ -158,15 +158,47 @@ class DataManager(BaseService):
                 ]
             )
     
-    def _procesar_configuracion_ag(self, config_data: Dict[str, Any]) -> ConfiguracionAG:
+    def _procesar_configuracion_ag(self, config_data: Dict[str, Any], total_rutas: int = 0) -> ConfiguracionAG:
+        # Los valores enviados tienen prioridad sobre los recomendados para el tamaño del escenario
+        config_data = {**self._configuracion_recomendada(total_rutas), **config_data}
         return ConfiguracionAG(
             poblacion_size=config_data.get('poblacion_size', 50),
             generaciones=config_data.get('generaciones', 100),
             prob_cruza=config_data.get('prob_cruza', 0.8),
             prob_mutacion=config_data.get('prob_mutacion', 0.15),
-            elitismo_rate=config_data.get('elitismo_rate', 0.1)
+            elitismo_rate=config_data.get('elitismo_rate', 0.1),
+            motor=config_data.get('motor', 'objetos'),
+            cache_fitness=config_data.get('cache_fitness', True),
+            cache_fitness_max=config_data.get('cache_fitness_max', 10000),
+            evaluacion_paralela=config_data.get('evaluacion_paralela', False),
+            procesos_evaluacion=config_data.get('procesos_evaluacion', 0),
+            lote_evaluacion=config_data.get('lote_evaluacion', 16),
+            islas=config_data.get('islas', 1),
+            intervalo_migracion=config_data.get('intervalo_migracion', 10),
+            migrantes=config_data.get('migrantes', 2),
+            topologia_migracion=config_data.get('topologia_migracion', 'anillo'),
+            generaciones_estancamiento=config_data.get('generaciones_estancamiento', 0),
+            mejora_minima=config_data.get('mejora_minima', 0.0),
+            fitness_objetivo=config_data.get('fitness_objetivo'),
+            max_segundos=config_data.get('max_segundos'),
+            seed=config_data.get('seed'),
+            perfil=config_data.get('perfil', False),
+            siembra_mochila=config_data.get('siembra_mochila', 0.2),
+            prob_mejora_local=config_data.get('prob_mejora_local', 0.1),
+            siembra_historial=config_data.get('siembra_historial', 0.2),
+            tamaño_frente=config_data.get('tamaño_frente', 20),
+            tamaño_torneo=config_data.get('tamaño_torneo', 3),
+            siembra_emparejamiento=config_data.get('siembra_emparejamiento', 0.2),
+            reinicios=config_data.get('reinicios', 1)
         )
     
+    def _configuracion_recomendada(self, total_rutas: int) -> Dict[str, Any]:
+        """Configuración del primer grupo de tamaño que admite total_rutas."""
+        for grupo in data_loader.get_configuracion_ag_recomendada().get('grupos', []):
+            if grupo.get('max_rutas') is None or total_rutas <= grupo['max_rutas']:
+                return grupo.get('configuracion', {})
+        return {}
+    
     def _cargar_insumos(self) -> List[Insumo]:
         try:
             insumos_data = data_loader.get_categorias_insumos()
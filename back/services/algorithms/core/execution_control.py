@@ -0,0 +1,121 @@
+import time
+from typing import Any, Callable, Dict, Optional
+from ..models import ConfiguracionAG
+
+PARADA_GENERACIONES = "generaciones_completadas"
+PARADA_ESTANCAMIENTO = "estancamiento"
+PARADA_FITNESS_OBJETIVO = "fitness_objetivo"
+PARADA_TIEMPO = "tiempo_maximo"
+PARADA_CANCELADA = "cancelado"
+
+
+class ExecutionControl:
+    """Estado de una ejecución del AG compartido por los motores.
+
+    Se consulta una vez por generación para decidir si la evolución debe
+    detenerse antes de completar config.generaciones. cancelar() puede
+    llamarse desde otro hilo (cancelación cooperativa).
+    """
+
+    def __init__(self, config: ConfiguracionAG):
+        self.config = config
+        self._cancelado = False
+        self._observador: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._cada = 1
+        self.iniciar()
+
+    def iniciar(self) -> None:
+        """Reiniciar el estado de la ejecución conservando una cancelación previa."""
+        self.inicio = time.monotonic()
+        self.generaciones = 0
+        self.mejor_fitness: Optional[float] = None
+        self.motivo_parada: Optional[str] = None
+
+        self._mejor_referencia: Optional[float] = None
+        self._generaciones_sin_mejora = 0
+
+    def observar(self, callback: Optional[Callable[[Dict[str, Any]], None]], cada: int = 1) -> None:
+        """Registrar un callback que recibe el progreso cada `cada` generaciones."""
+        self._observador = callback
+        self._cada = max(1, cada)
+
+    @property
+    def observado(self) -> bool:
+        return self._observador is not None
+
+    def debe_notificar(self) -> bool:
+        return self._observador is not None and self.generaciones % self._cada == 0
+
+    def notificar(self, fitness_actual: float, fitness_medio: float) -> None:
+        if self._observador is None:
+            return
+
+        transcurrido = self.segundos_transcurridos()
+        self._observador({
+            "generacion": self.generaciones,
+            "generaciones_totales": self.config.generaciones,
+            "mejor_fitness": fitness_actual,
+            "fitness_medio": fitness_medio,
+            "tiempo_transcurrido_s": transcurrido,
+            "generaciones_por_segundo": self.generaciones / transcurrido if transcurrido > 0 else 0.0
+        })
+
+    def cancelar(self) -> None:
+        self._cancelado = True
+
+    @property
+    def cancelado(self) -> bool:
+        return self._cancelado
+
+    @property
+    def detenido(self) -> bool:
+        if self.motivo_parada is None:
+            if self._cancelado:
+                self.motivo_parada = PARADA_CANCELADA
+            elif self._tiempo_agotado():
+                self.motivo_parada = PARADA_TIEMPO
+        return self.motivo_parada is not None
+
+    def segundos_transcurridos(self) -> float:
+        return time.monotonic() - self.inicio
+
+    def registrar_generacion(self, fitness_actual: float) -> None:
+        self.generaciones += 1
+        if self.mejor_fitness is None or fitness_actual > self.mejor_fitness:
+            self.mejor_fitness = fitness_actual
+
+        if self._mejor_referencia is None or fitness_actual > self._mejor_referencia + self.config.mejora_minima:
+            self._mejor_referencia = fitness_actual
+            self._generaciones_sin_mejora = 0
+        else:
+            self._generaciones_sin_mejora += 1
+
+        if self._cancelado:
+            self.motivo_parada = PARADA_CANCELADA
+        elif self.config.fitness_objetivo is not None and fitness_actual >= self.config.fitness_objetivo:
+            self.motivo_parada = PARADA_FITNESS_OBJETIVO
+        elif (self.config.generaciones_estancamiento > 0 and
+              self._generaciones_sin_mejora >= self.config.generaciones_estancamiento):
+            self.motivo_parada = PARADA_ESTANCAMIENTO
+        elif self._tiempo_agotado():
+            self.motivo_parada = PARADA_TIEMPO
+
+    def _tiempo_agotado(self) -> bool:
+        return self.config.max_segundos is not None and self.segundos_transcurridos() >= self.config.max_segundos
+
+    def progreso(self) -> Dict[str, Any]:
+        total = max(1, self.config.generaciones)
+        return {
+            "generacion": self.generaciones,
+            "generaciones_totales": self.config.generaciones,
+            "porcentaje": min(100.0, self.generaciones / total * 100),
+            "mejor_fitness": self.mejor_fitness,
+            "tiempo_transcurrido_s": self.segundos_transcurridos()
+        }
+
+    def metricas(self) -> Dict[str, Any]:
+        return {
+            "criterio_parada": self.motivo_parada or PARADA_GENERACIONES,
+            "generaciones_configuradas": self.config.generaciones,
+            "tiempo_ejecucion_s": self.segundos_transcurridos()
+        }
@@ -0,0 +1,109 @@
+import hashlib
+import struct
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import numpy as np
+from ..models import Individual
+
+# Bytes del digest de cada clave (128 bits)
+TAMAÑO_CLAVE = 16
+
+
+class FitnessCache:
+    """Cache LRU de fitness indexada por un hash canónico del genoma
+
+    Las claves son digests blake2b de 128 bits del contenido del genoma, no
+    hash() de 64 bits: una colisión devolvería el fitness de otro genoma sin
+    ningún error, y PoblacionUnica descartaría un individuo que no es clon.
+    """
+
+    def __init__(self, max_size: int = 10000, habilitado: bool = True):
+        self.max_size = max(1, max_size)
+        self.habilitado = habilitado
+        self._cache: "OrderedDict[bytes, float]" = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    @staticmethod
+    def clave_individuo(individuo: Individual) -> bytes:
+        digest = hashlib.blake2b(digest_size=TAMAÑO_CLAVE)
+        for asignacion in individuo:
+            digest.update(struct.pack('<qqd', asignacion.vehiculo_id, asignacion.ruta_id,
+                                      asignacion.peso_total_kg))
+            digest.update(asignacion.insumos.tobytes())
+        return digest.digest()
+
+    @staticmethod
+    def clave_arrays(rutas: np.ndarray, insumos: np.ndarray, pesos: np.ndarray) -> bytes:
+        return hashlib.blake2b(rutas.tobytes() + pesos.tobytes() + insumos.tobytes(),
+                               digest_size=TAMAÑO_CLAVE).digest()
+
+    def obtener(self, clave: bytes) -> Optional[float]:
+        fitness = self._cache.get(clave)
+        if fitness is None:
+            self.fallos += 1
+            return None
+
+        self._cache.move_to_end(clave)
+        self.aciertos += 1
+        return fitness
+
+    def guardar(self, clave: bytes, fitness: float) -> None:
+        self._cache[clave] = fitness
+        self._cache.move_to_end(clave)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def evaluar(self, elementos: Sequence[Any], claves: Callable[[Any], bytes],
+                evaluar_lote: Callable[[List[Any]], Sequence[float]]) -> List[float]:
+        """Evaluar elementos reutilizando fitness conocidos.
+
+        Los fallos (incluidos duplicados dentro del mismo lote) se evalúan
+        una sola vez en una llamada a evaluar_lote.
+        """
+        if not self.habilitado:
+            self.fallos += len(elementos)
+            return list(evaluar_lote(list(elementos)))
+
+        resultados: List[Optional[float]] = [None] * len(elementos)
+        pendientes: Dict[bytes, List[int]] = {}
+
+        for i, elemento in enumerate(elementos):
+            clave = claves(elemento)
+            if clave in pendientes:
+                pendientes[clave].append(i)
+                self.aciertos += 1
+                continue
+
+            fitness = self.obtener(clave)
+            if fitness is None:
+                pendientes[clave] = [i]
+            else:
+                resultados[i] = fitness
+
+        if pendientes:
+            primeros = [posiciones[0] for posiciones in pendientes.values()]
+            fitnesses = evaluar_lote([elementos[i] for i in primeros])
+
+            for (clave, posiciones), fitness in zip(pendientes.items(), fitnesses):
+                self.guardar(clave, fitness)
+                for i in posiciones:
+                    resultados[i] = fitness
+
+        return resultados
+
+    def acumular(self, metricas: Dict[str, Any]) -> None:
+        """Sumar contadores de otra cache (p. ej. de una isla en otro proceso)."""
+        self.aciertos += metricas.get("aciertos", 0)
+        self.fallos += metricas.get("fallos", 0)
+
+    def metricas(self) -> Dict[str, Any]:
+        consultas = self.aciertos + self.fallos
+        return {
+            "habilitado": self.habilitado,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas > 0 else 0,
+            "entradas": len(self._cache),
+            "max_entradas": self.max_size
+        }
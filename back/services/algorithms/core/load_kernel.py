@@ -0,0 +1,68 @@
+import numpy as np
+from array import array
+from operator import mul
+from typing import List, Sequence
+from ..models import Insumo
+
+
+class LoadKernel:
+    """Peso real de la carga y capacidad de cada vehículo.
+
+    Todos los operadores calculan el peso como el producto de las
+    cantidades por el vector peso_kg del catálogo y lo comparan con
+    maximo_peso_ton del vehículo. capacidades_kg sigue el orden de
+    vehiculos_expandidos, que es también el de las columnas de PoblacionArrays.
+    """
+
+    def __init__(self, insumos: List[Insumo], vehiculos_expandidos: List[dict]):
+        self.total_insumos = len(insumos)
+        self.vector_peso_kg = np.array([insumo.peso_kg for insumo in insumos], dtype=np.float64)
+        self.peso_medio_kg = float(self.vector_peso_kg.mean()) if self.total_insumos else 0.0
+        self._pesos_kg = self.vector_peso_kg.tolist()
+
+        self.capacidades_kg = np.array([v['maximo_peso_ton'] * 1000 for v in vehiculos_expandidos],
+                                       dtype=np.float64)
+        self._capacidad_por_id = {v['id']: float(c) for v, c in zip(vehiculos_expandidos, self.capacidades_kg)}
+
+    def capacidad(self, vehiculo_id: int) -> float:
+        return self._capacidad_por_id.get(vehiculo_id, 0.0)
+
+    def peso(self, cantidades: Sequence[int]) -> float:
+        if isinstance(cantidades, np.ndarray):
+            return float(cantidades @ self.vector_peso_kg)
+        # Para un solo vector corto, sum/map evita el coste fijo de NumPy
+        return float(sum(map(mul, cantidades, self._pesos_kg)))
+
+    def pesos(self, insumos: np.ndarray) -> np.ndarray:
+        """Pesos de una matriz (..., insumos) de cantidades, p. ej. (poblacion, vehiculos)."""
+        return insumos @ self.vector_peso_kg
+
+    def recortar(self, cantidades: array, capacidad_kg: float) -> float:
+        """Escalar en sitio las cantidades que exceden la capacidad; devuelve el peso final."""
+        peso = self.peso(cantidades)
+        if peso <= capacidad_kg:
+            return peso
+
+        factor = capacidad_kg / peso
+        for i, cantidad in enumerate(cantidades):
+            if cantidad:
+                cantidades[i] = int(cantidad * factor)
+
+        return self.peso(cantidades)
+
+    def recortar_matrices(self, insumos: np.ndarray, capacidades_kg: np.ndarray) -> np.ndarray:
+        """Versión vectorizada de recortar sobre (poblacion, vehiculos, insumos)."""
+        pesos = self.pesos(insumos)
+        exceso = pesos > capacidades_kg
+        if exceso.any():
+            factor = np.where(exceso, capacidades_kg / np.where(exceso, pesos, 1.0), 1.0)
+            insumos[...] = np.floor(insumos * factor[..., None]).astype(insumos.dtype)
+            pesos = self.pesos(insumos)
+        return pesos
+
+    @staticmethod
+    def eficiencia(pesos: np.ndarray, capacidades_kg: np.ndarray) -> np.ndarray:
+        """Aprovechamiento por asignación: peso/capacidad, o 0.1 si hay sobrecarga."""
+        capacidad_segura = np.where(capacidades_kg > 0, capacidades_kg, 1.0)
+        return np.where(pesos > capacidades_kg, 0.1,
+                        np.where(capacidades_kg > 0, np.minimum(1.0, pesos / capacidad_segura), 0.0))
@@ -0,0 +1,71 @@
+import time
+from contextlib import nullcontext
+from typing import Any, Dict, List
+
+
+class _Medicion:
+    __slots__ = ("perfilador", "operador", "inicio")
+
+    def __init__(self, perfilador: "OperatorProfiler", operador: str):
+        self.perfilador = perfilador
+        self.operador = operador
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.perfilador.registrar(self.operador, time.perf_counter() - self.inicio)
+        return False
+
+
+class OperatorProfiler:
+    """Tiempo de pared y número de llamadas por operador y por generación.
+
+    Deshabilitado, medir() devuelve siempre el mismo contexto vacío para que
+    las ejecuciones normales no paguen por la instrumentación.
+    """
+
+    _SIN_MEDICION = nullcontext()
+
+    def __init__(self, habilitado: bool = False):
+        self.habilitado = habilitado
+        self.tiempos: Dict[str, float] = {}
+        self.llamadas: Dict[str, int] = {}
+        self.por_generacion: List[Dict[str, float]] = []
+        self._generacion_actual: Dict[str, float] = {}
+
+    def medir(self, operador: str):
+        if not self.habilitado:
+            return self._SIN_MEDICION
+        return _Medicion(self, operador)
+
+    def registrar(self, operador: str, segundos: float) -> None:
+        self.tiempos[operador] = self.tiempos.get(operador, 0.0) + segundos
+        self.llamadas[operador] = self.llamadas.get(operador, 0) + 1
+        self._generacion_actual[operador] = self._generacion_actual.get(operador, 0.0) + segundos
+
+    def cerrar_generacion(self) -> None:
+        if self.habilitado:
+            self.por_generacion.append(self._generacion_actual)
+            self._generacion_actual = {}
+
+    def acumular(self, resumen: Dict[str, Any]) -> None:
+        """Sumar los totales de otro perfil (p. ej. de una isla en otro proceso)."""
+        for operador, datos in resumen.get("operadores", {}).items():
+            self.tiempos[operador] = self.tiempos.get(operador, 0.0) + datos["tiempo_s"]
+            self.llamadas[operador] = self.llamadas.get(operador, 0) + datos["llamadas"]
+
+    def resumen(self) -> Dict[str, Any]:
+        total = sum(self.tiempos.values())
+        return {
+            "tiempo_total_s": total,
+            "operadores": {
+                operador: {
+                    "tiempo_s": tiempo,
+                    "llamadas": self.llamadas[operador],
+                    "porcentaje": tiempo / total * 100 if total > 0 else 0.0
+                }
+                for operador, tiempo in sorted(self.tiempos.items(), key=lambda x: x[1], reverse=True)
+            },
+            "por_generacion": self.por_generacion
+        }
@@ -0,0 +1,111 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+import numpy as np
+from core.base_service import BaseService
+from ..models import Individual
+from ..operators.evaluation import EvaluationOperator
+
+_evaluador_worker: Optional[EvaluationOperator] = None
+
+
+def _inicializar_worker(eval_operator: EvaluationOperator) -> None:
+    global _evaluador_worker
+    _evaluador_worker = eval_operator
+
+
+def _evaluar_lote_individuos(individuos: List[Individual]) -> List[float]:
+    return _evaluador_worker.evaluar_poblacion(individuos)
+
+
+def _evaluar_lote_matrices(rutas: np.ndarray, insumos: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+    return _evaluador_worker.evaluar_matrices(rutas, insumos, pesos)
+
+
+def _objetivos_lote_matrices(rutas: np.ndarray, insumos: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+    return _evaluador_worker.objetivos_matrices(rutas, insumos, pesos)
+
+
+class ParallelEvaluator(BaseService):
+    """Evaluación de poblaciones en un ProcessPoolExecutor.
+
+    El EvaluationOperator se envía una sola vez a cada worker mediante el
+    initializer; después sólo viajan lotes de individuos. Las poblaciones
+    menores a dos lotes se evalúan en serie porque el costo de IPC domina.
+    """
+
+    def __init__(self, eval_operator: EvaluationOperator, habilitado: bool = False,
+                 procesos: int = 0, tamaño_lote: int = 16):
+        super().__init__()
+        self.eval_operator = eval_operator
+        self.habilitado = habilitado
+        self.procesos = procesos if procesos > 0 else (os.cpu_count() or 1)
+        self.tamaño_lote = max(1, tamaño_lote)
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _usar_pool(self, tamaño_poblacion: int) -> bool:
+        return (self.habilitado and self.procesos > 1 and
+                tamaño_poblacion >= 2 * self.tamaño_lote)
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.procesos,
+                initializer=_inicializar_worker,
+                initargs=(self.eval_operator,)
+            )
+        return self._pool
+
+    def evaluar_poblacion(self, poblacion: List[Individual]) -> List[float]:
+        if not self._usar_pool(len(poblacion)):
+            return self.eval_operator.evaluar_poblacion(poblacion)
+
+        try:
+            lotes = [poblacion[i:i + self.tamaño_lote]
+                     for i in range(0, len(poblacion), self.tamaño_lote)]
+            resultados = []
+            for fitnesses in self._obtener_pool().map(_evaluar_lote_individuos, lotes):
+                resultados.extend(fitnesses)
+            return resultados
+
+        except Exception as e:
+            self.log_error("Error en evaluación paralela, usando evaluación en serie", e)
+            self._desactivar()
+            return self.eval_operator.evaluar_poblacion(poblacion)
+
+    def evaluar_matrices(self, rutas: np.ndarray, insumos: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+        return self._mapear_matrices(_evaluar_lote_matrices, self.eval_operator.evaluar_matrices,
+                                     rutas, insumos, pesos)
+
+    def objetivos_matrices(self, rutas: np.ndarray, insumos: np.ndarray, pesos: np.ndarray) -> np.ndarray:
+        return self._mapear_matrices(_objetivos_lote_matrices, self.eval_operator.objetivos_matrices,
+                                     rutas, insumos, pesos)
+
+    def _mapear_matrices(self, funcion_worker, funcion_local, rutas: np.ndarray, insumos: np.ndarray,
+                         pesos: np.ndarray) -> np.ndarray:
+        if not self._usar_pool(len(rutas)):
+            return funcion_local(rutas, insumos, pesos)
+
+        try:
+            cortes = range(0, len(rutas), self.tamaño_lote)
+            resultados = self._obtener_pool().map(
+                funcion_worker,
+                [rutas[i:i + self.tamaño_lote] for i in cortes],
+                [insumos[i:i + self.tamaño_lote] for i in cortes],
+                [pesos[i:i + self.tamaño_lote] for i in cortes]
+            )
+            return np.concatenate(list(resultados))
+
+        except Exception as e:
+            self.log_error("Error en evaluación paralela, usando evaluación en serie", e)
+            self._desactivar()
+            return funcion_local(rutas, insumos, pesos)
+
+    def _desactivar(self) -> None:
+        self.habilitado = False
+        self.cerrar()
+
+    def cerrar(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
@@ -0,0 +1,119 @@
+import numpy as np
+from typing import Any, Dict, List, Tuple
+
+
+def matriz_dominancia(objetivos: np.ndarray) -> np.ndarray:
+    """domina[i, j] si i domina a j (maximización): >= en todo y > en algún objetivo."""
+    a = objetivos[:, None, :]
+    b = objetivos[None, :, :]
+    return (a >= b).all(axis=2) & (a > b).any(axis=2)
+
+
+def ordenamiento_no_dominado(objetivos: np.ndarray) -> np.ndarray:
+    """Rango de frente de cada individuo (0 = no dominado), fast non-dominated sort.
+
+    La matriz de dominancia se calcula de una vez; cada frente se extrae
+    restando sus dominados del contador de dominadores del resto.
+    """
+    total = len(objetivos)
+    rangos = np.full(total, -1, dtype=np.int64)
+    if total == 0:
+        return rangos
+
+    domina = matriz_dominancia(objetivos)
+    dominadores = domina.sum(axis=0)
+    pendientes = np.ones(total, dtype=bool)
+
+    rango = 0
+    while pendientes.any():
+        frente = pendientes & (dominadores == 0)
+        rangos[frente] = rango
+        pendientes &= ~frente
+        dominadores -= domina[frente].sum(axis=0)
+        rango += 1
+
+    return rangos
+
+
+def distancia_crowding(objetivos: np.ndarray, rangos: np.ndarray) -> np.ndarray:
+    """Distancia de crowding de cada individuo dentro de su frente; los extremos valen inf."""
+    total, total_objetivos = objetivos.shape
+    distancia = np.zeros(total, dtype=np.float64)
+
+    for rango in np.unique(rangos):
+        miembros = np.nonzero(rangos == rango)[0]
+        if len(miembros) <= 2:
+            distancia[miembros] = np.inf
+            continue
+
+        valores = objetivos[miembros]
+        orden = np.argsort(valores, axis=0, kind='stable')
+        ordenados = np.take_along_axis(valores, orden, axis=0)
+        amplitud = ordenados[-1] - ordenados[0]
+        amplitud[amplitud == 0] = 1.0
+
+        aporte = np.zeros_like(valores)
+        aporte[1:-1] = (ordenados[2:] - ordenados[:-2]) / amplitud
+        aporte[0] = aporte[-1] = np.inf
+
+        acumulada = np.zeros(len(miembros), dtype=np.float64)
+        for k in range(total_objetivos):
+            acumulada[orden[:, k]] += aporte[:, k]
+        distancia[miembros] = acumulada
+
+    return distancia
+
+
+def seleccion_supervivientes(rangos: np.ndarray, crowding: np.ndarray, cantidad: int) -> np.ndarray:
+    """Índices de los `cantidad` mejores por (rango ascendente, crowding descendente)."""
+    if cantidad >= len(rangos):
+        return np.arange(len(rangos))
+
+    orden = np.lexsort((-crowding, rangos))
+    return orden[:cantidad]
+
+
+def torneo_binario(rangos: np.ndarray, crowding: np.ndarray, cantidad: int,
+                   rng: np.random.Generator) -> np.ndarray:
+    """Ganadores de `cantidad` torneos binarios por comparación de crowding."""
+    a = rng.integers(0, len(rangos), cantidad)
+    b = rng.integers(0, len(rangos), cantidad)
+    gana_a = (rangos[a] < rangos[b]) | ((rangos[a] == rangos[b]) & (crowding[a] >= crowding[b]))
+    return np.where(gana_a, a, b)
+
+
+def frente_unico(objetivos: np.ndarray, rangos: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Índices del primer frente sin vectores de objetivos repetidos, y sus objetivos."""
+    primer_frente = np.nonzero(rangos == 0)[0]
+    _, unicos = np.unique(objetivos[primer_frente], axis=0, return_index=True)
+    indices = primer_frente[np.sort(unicos)]
+    return indices, objetivos[indices]
+
+
+def recortar_frente(objetivos: np.ndarray, maximo: int) -> np.ndarray:
+    """Posiciones de hasta `maximo` miembros de un frente, los de mayor crowding (los extremos siempre)."""
+    if len(objetivos) <= maximo:
+        return np.arange(len(objetivos))
+
+    crowding = distancia_crowding(objetivos, np.zeros(len(objetivos), dtype=np.int64))
+    return np.argsort(-crowding, kind='stable')[:maximo]
+
+
+def combinar_frentes(frentes: List[List[Tuple[Any, float, Dict[str, float]]]],
+                     maximo: int) -> List[Tuple[Any, float, Dict[str, float]]]:
+    """Primer frente de la unión de varios frentes (p. ej. de islas o reinicios).
+
+    Cada entrada es (individuo, fitness, objetivos); el resultado conserva
+    esa forma, sin vectores de objetivos repetidos, recortado por crowding
+    a `maximo` y ordenado por fitness ponderado.
+    """
+    candidatos = [entrada for frente in frentes for entrada in frente]
+    if not candidatos:
+        return []
+
+    nombres = list(candidatos[0][2])
+    objetivos = np.array([[entrada[2][nombre] for nombre in nombres] for entrada in candidatos],
+                         dtype=np.float64)
+    indices, objetivos = frente_unico(objetivos, ordenamiento_no_dominado(objetivos))
+    indices = indices[recortar_frente(objetivos, maximo)]
+    return sorted((candidatos[i] for i in indices.tolist()), key=lambda entrada: entrada[1], reverse=True)
@@ -0,0 +1,101 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import List, Dict
+from ..models import Individual, AsignacionVehiculo, Ruta, vector_insumos
+
+
+@dataclass
+class PoblacionArrays:
+    """Población completa almacenada como matrices NumPy.
+
+    rutas: (poblacion, vehiculos) id de ruta por vehículo, -1 = standby
+    insumos: (poblacion, vehiculos, insumos) cantidades por insumo
+    pesos: (poblacion, vehiculos) peso_total_kg por asignación
+    """
+    rutas: np.ndarray
+    insumos: np.ndarray
+    pesos: np.ndarray
+
+    def __len__(self) -> int:
+        return self.rutas.shape[0]
+
+    def tomar(self, indices) -> 'PoblacionArrays':
+        return PoblacionArrays(
+            rutas=self.rutas[indices],
+            insumos=self.insumos[indices],
+            pesos=self.pesos[indices]
+        )
+
+    def concatenar(self, otra: 'PoblacionArrays') -> 'PoblacionArrays':
+        return PoblacionArrays(
+            rutas=np.concatenate([self.rutas, otra.rutas]),
+            insumos=np.concatenate([self.insumos, otra.insumos]),
+            pesos=np.concatenate([self.pesos, otra.pesos])
+        )
+
+
+class CodificadorGenoma:
+    """Convierte entre individuos de AsignacionVehiculo y PoblacionArrays.
+
+    La columna de cada matriz corresponde al vehiculo_id expandido.
+    """
+
+    def __init__(self, rutas: List[Ruta], vehiculos_expandidos: List[dict], total_insumos: int):
+        self.rutas: Dict[int, Ruta] = {r.id: r for r in rutas}
+        self.vehiculos_expandidos = vehiculos_expandidos
+        self.total_vehiculos = len(vehiculos_expandidos)
+        self.total_insumos = total_insumos
+
+    def poblacion_vacia(self, tamaño: int) -> PoblacionArrays:
+        return PoblacionArrays(
+            rutas=np.full((tamaño, self.total_vehiculos), -1, dtype=np.int64),
+            insumos=np.zeros((tamaño, self.total_vehiculos, self.total_insumos), dtype=np.int64),
+            pesos=np.zeros((tamaño, self.total_vehiculos), dtype=np.float64)
+        )
+
+    def codificar(self, poblacion: List[Individual]) -> PoblacionArrays:
+        arrays = self.poblacion_vacia(len(poblacion))
+        asignado = np.zeros(self.total_vehiculos, dtype=bool)
+
+        for p, individuo in enumerate(poblacion):
+            asignado[:] = False
+            for asignacion in individuo:
+                v = asignacion.vehiculo_id
+                if not 0 <= v < self.total_vehiculos or asignado[v]:
+                    continue
+                asignado[v] = True
+
+                arrays.rutas[p, v] = asignacion.ruta_id
+                arrays.insumos[p, v] = asignacion.insumos
+                arrays.pesos[p, v] = asignacion.peso_total_kg
+
+        return arrays
+
+    def decodificar(self, arrays: PoblacionArrays, indice: int) -> Individual:
+        individuo = []
+
+        for v, vehiculo in enumerate(self.vehiculos_expandidos):
+            ruta_id = int(arrays.rutas[indice, v])
+            ruta = self.rutas.get(ruta_id)
+
+            if ruta is None:
+                individuo.append(AsignacionVehiculo(
+                    vehiculo_id=vehiculo['id'],
+                    ruta_id=-1,
+                    insumos=vector_insumos(self.total_insumos),
+                    peso_total_kg=0,
+                    distancia_km=0,
+                    combustible_usado=0
+                ))
+                continue
+
+            individuo.append(AsignacionVehiculo(
+                vehiculo_id=vehiculo['id'],
+                ruta_id=ruta_id,
+                insumos=vector_insumos(self.total_insumos, arrays.insumos[indice, v].tolist()),
+                peso_total_kg=float(arrays.pesos[indice, v]),
+                distancia_km=ruta.distancia_km,
+                combustible_usado=ruta.distancia_km * vehiculo['consumo_litros_km']
+            ))
+
+        return individuo
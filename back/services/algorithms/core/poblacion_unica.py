@@ -0,0 +1,77 @@
+from typing import Dict, List, Sequence, Tuple
+from ..models import Individual
+from .fitness_cache import FitnessCache
+
+
+class PoblacionUnica:
+    """Población evaluada sin genomas repetidos.
+
+    Cada individuo entra con su clave estructural (la misma de FitnessCache:
+    vehículo, ruta, peso e insumos de cada asignación) y su firma de rutas,
+    calculadas una sola vez; la pertenencia se consulta en O(1) por clave,
+    así que los clones se descartan antes de evaluarse. Dos individuos que
+    sólo intercambian vehículos entre rutas son soluciones distintas.
+    `evaluados` conserva la forma [(individuo, fitness)] que usan los motores.
+    """
+
+    def __init__(self):
+        self.evaluados: List[Tuple[Individual, float]] = []
+        self._claves: List[bytes] = []
+        self._firmas: List[tuple] = []
+        self._posiciones: Dict[bytes, int] = {}
+        self.descartados = 0
+
+    def __len__(self) -> int:
+        return len(self.evaluados)
+
+    def __contains__(self, clave: bytes) -> bool:
+        return clave in self._posiciones
+
+    def filtrar_nuevos(self, individuos: Sequence[Individual]) -> Tuple[List[Individual], List[bytes]]:
+        """Individuos que no están en la población ni repetidos en el lote, con sus claves."""
+        nuevos, claves, vistas = [], [], set()
+        for individuo in individuos:
+            clave = FitnessCache.clave_individuo(individuo)
+            if clave in self._posiciones or clave in vistas:
+                self.descartados += 1
+                continue
+            vistas.add(clave)
+            nuevos.append(individuo)
+            claves.append(clave)
+        return nuevos, claves
+
+    def agregar(self, evaluados: Sequence[Tuple[Individual, float]], claves: Sequence[bytes]) -> None:
+        for evaluado, clave in zip(evaluados, claves):
+            self._posiciones[clave] = len(self.evaluados)
+            self.evaluados.append(evaluado)
+            self._claves.append(clave)
+            self._firmas.append(self._firma(evaluado[0]))
+
+    def reemplazar(self, posicion: int, evaluado: Tuple[Individual, float], clave: bytes) -> None:
+        del self._posiciones[self._claves[posicion]]
+        self._posiciones[clave] = posicion
+        self.evaluados[posicion] = evaluado
+        self._claves[posicion] = clave
+        self._firmas[posicion] = self._firma(evaluado[0])
+
+    def conservar(self, indices: Sequence[int]) -> None:
+        self.evaluados = [self.evaluados[i] for i in indices]
+        self._claves = [self._claves[i] for i in indices]
+        self._firmas = [self._firmas[i] for i in indices]
+        self._posiciones = {clave: i for i, clave in enumerate(self._claves)}
+
+    def clave(self, posicion: int) -> bytes:
+        return self._claves[posicion]
+
+    def indice_mejor(self) -> int:
+        return max(range(len(self.evaluados)), key=lambda i: self.evaluados[i][1])
+
+    def diversidad(self) -> float:
+        """Fracción de asignaciones de rutas distintas en la población."""
+        if not self._firmas:
+            return 0.0
+        return len(set(self._firmas)) / len(self._firmas)
+
+    @staticmethod
+    def _firma(individuo: Individual) -> tuple:
+        return tuple(sorted((asignacion.vehiculo_id, asignacion.ruta_id) for asignacion in individuo))
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from core.base_service import BaseService
+from ..models import Individual, AsignacionVehiculo, Ruta, ScenarioData, vector_insumos
+
+
+def _clave_ruta(ruta: Ruta) -> str:
+    # Los id de ruta los asigna el frontend; localidad, distancia y vehículos permitidos
+    # sobreviven a una renumeración
+    return (f"{ruta.localidad.clave_localidad}@{ruta.distancia_km:.1f}"
+            f"#{','.join(sorted(ruta.vehiculos_permitidos))}")
+
+
+def _rutas_por_clave(rutas: List[Ruta]) -> Dict[str, Optional[Ruta]]:
+    """Ruta de cada clave estable; None si la clave es ambigua (más de una ruta la comparte)."""
+    por_clave: Dict[str, Optional[Ruta]] = {}
+    for ruta in rutas:
+        clave = _clave_ruta(ruta)
+        por_clave[clave] = None if clave in por_clave else ruta
+    return por_clave
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class SolutionStore(BaseService):
+    """Élite final de cada ejecución, persistida por huella de escenario.
+
+    Cada escenario se guarda como un JSON con su descriptor (desastre, rutas
+    y flota) y los genes de la élite expresados en claves estables: la ruta
+    por localidad, distancia y vehículos permitidos, y el vehículo por su
+    modelo expandido. Así pueden traducirse a un escenario parecido, donde
+    los genes obsoletos los corrige la reparación. Las claves que comparten
+    varias rutas son ambiguas y no se traducen.
+    """
+
+    def __init__(self, directorio: str, max_escenarios: int = 200, similitud_minima: float = 0.5):
+        super().__init__()
+        self.directorio = directorio
+        self.max_escenarios = max_escenarios
+        self.similitud_minima = similitud_minima
+        self._descriptores: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def descriptor(scenario_data: ScenarioData, vehiculos_expandidos: List[dict],
+                   total_insumos: int) -> Dict[str, Any]:
+        return {
+            'tipo_desastre': scenario_data.tipo_desastre.tipo,
+            'total_insumos': total_insumos,
+            'rutas': sorted(f"{_clave_ruta(r)}|{r.estado.value}" for r in scenario_data.rutas),
+            'vehiculos': sorted(v['modelo'] for v in vehiculos_expandidos)
+        }
+
+    @staticmethod
+    def huella(descriptor: Dict[str, Any]) -> str:
+        canonico = json.dumps(descriptor, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+    def buscar(self, descriptor: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Escenario guardado más parecido y su similitud, si supera similitud_minima."""
+        huella = self.huella(descriptor)
+        rutas = set(descriptor['rutas'])
+        vehiculos = set(descriptor['vehiculos'])
+
+        with self._lock:
+            candidatos = list(self._indice().items())
+
+        mejor, mejor_similitud = None, 0.0
+        for huella_guardada, guardado in candidatos:
+            if (guardado['tipo_desastre'] != descriptor['tipo_desastre'] or
+                    guardado['total_insumos'] != descriptor['total_insumos']):
+                continue
+
+            similitud = 1.0 if huella_guardada == huella else (
+                _jaccard(rutas, set(guardado['rutas'])) + _jaccard(vehiculos, set(guardado['vehiculos']))
+            ) / 2
+            if similitud > mejor_similitud:
+                mejor, mejor_similitud = huella_guardada, similitud
+
+        if mejor is None or mejor_similitud < self.similitud_minima:
+            return None
+
+        entrada = self._leer(mejor)
+        return (entrada, mejor_similitud) if entrada else None
+
+    def guardar(self, descriptor: Dict[str, Any], rutas: List[Ruta], vehiculos_expandidos: List[dict],
+                elite: List[Individual]) -> str:
+        huella = self.huella(descriptor)
+        entrada = {
+            'descriptor': descriptor,
+            'guardado': time.time(),
+            'elite': self.exportar(rutas, vehiculos_expandidos, elite)
+        }
+
+        with self._lock:
+            os.makedirs(self.directorio, exist_ok=True)
+            descriptor_fd, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+            with os.fdopen(descriptor_fd, 'w', encoding='utf-8') as archivo:
+                json.dump(entrada, archivo, ensure_ascii=False)
+            os.replace(temporal, self._ruta_archivo(huella))
+
+            self._indice()[huella] = dict(descriptor, guardado=entrada['guardado'])
+            self._desalojar()
+
+        return huella
+
+    @staticmethod
+    def exportar(rutas: List[Ruta], vehiculos_expandidos: List[dict],
+                 individuos: List[Individual]) -> List[List[Dict[str, Any]]]:
+        """Genes de los individuos en claves estables, serializables a JSON."""
+        claves_ruta = {ruta.id: clave for clave, ruta in _rutas_por_clave(rutas).items() if ruta}
+        modelos = {v['id']: v['modelo'] for v in vehiculos_expandidos}
+
+        return [
+            [
+                {
+                    'vehiculo': modelos[a.vehiculo_id],
+                    'ruta': claves_ruta.get(a.ruta_id),
+                    'insumos': list(a.insumos),
+                    'peso': a.peso_total_kg,
+                    'combustible': a.combustible_usado
+                }
+                for a in individuo if a.vehiculo_id in modelos
+            ]
+            for individuo in individuos
+        ]
+
+    @staticmethod
+    def traducir(entrada: Dict[str, Any], rutas: List[Ruta], vehiculos_expandidos: List[dict],
+                 total_insumos: int) -> List[Individual]:
+        """Genes guardados en términos del escenario actual, sin reparar.
+
+        Las rutas que ya no existen o cuya clave es ambigua quedan en standby
+        y los vehículos que ya no existen se descartan; la reparación se ocupa del resto. Los genes
+        que conservan ruta y vehículo mantienen sus métricas y no se recalculan.
+        """
+        ids_ruta = _rutas_por_clave(rutas)
+        ids_vehiculo = {v['modelo']: v for v in vehiculos_expandidos}
+
+        individuos = []
+        for genes in entrada.get('elite', []):
+            individuo = []
+            for gen in genes:
+                vehiculo = ids_vehiculo.get(gen['vehiculo'])
+                if vehiculo is None or len(gen['insumos']) != total_insumos:
+                    continue
+
+                ruta = ids_ruta.get(gen['ruta'])
+                asignacion = AsignacionVehiculo(
+                    vehiculo_id=vehiculo['id'],
+                    ruta_id=ruta.id if ruta else -1,
+                    insumos=vector_insumos(total_insumos, gen['insumos']),
+                    peso_total_kg=gen.get('peso', 0) if ruta else 0,
+                    distancia_km=ruta.distancia_km if ruta else 0,
+                    combustible_usado=gen.get('combustible', 0) if ruta else 0
+                )
+                asignacion.sucia = ruta is None or 'peso' not in gen
+                individuo.append(asignacion)
+            if individuo:
+                individuos.append(individuo)
+
+        return individuos
+
+    def _ruta_archivo(self, huella: str) -> str:
+        return os.path.join(self.directorio, f"{huella}.json")
+
+    def _leer(self, huella: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._ruta_archivo(huella), 'r', encoding='utf-8') as archivo:
+                return json.load(archivo)
+        except (OSError, ValueError) as e:
+            self.log_error(f"No se pudo leer la solución guardada {huella}", e)
+            return None
+
+    def _indice(self) -> Dict[str, Dict[str, Any]]:
+        """Descriptores de los escenarios guardados, cargados una vez del disco (con _lock)."""
+        if self._descriptores is None:
+            self._descriptores = {}
+            if os.path.isdir(self.directorio):
+                for nombre in os.listdir(self.directorio):
+                    if not nombre.endswith('.json'):
+                        continue
+                    entrada = self._leer(nombre[:-len('.json')])
+                    if entrada and 'descriptor' in entrada:
+                        self._descriptores[nombre[:-len('.json')]] = dict(
+                            entrada['descriptor'], guardado=entrada.get('guardado', 0)
+                        )
+        return self._descriptores
+
+    def _desalojar(self) -> None:
+        sobrantes = len(self._descriptores) - self.max_escenarios
+        if sobrantes <= 0:
+            return
+
+        antiguos = sorted(self._descriptores, key=lambda h: self._descriptores[h]['guardado'])[:sobrantes]
+        for huella in antiguos:
+            del self._descriptores[huella]
+            try:
+                os.remove(self._ruta_archivo(huella))
+            except OSError:
+                pass
@@ -0,0 +1,177 @@
+import numpy as np
+from typing import List, Tuple
+from core.base_service import BaseService
+from ..core.execution_control import ExecutionControl
+from ..core.operator_profiler import OperatorProfiler
+from ..core.poblacion_arrays import PoblacionArrays, CodificadorGenoma
+from ..core.fitness_cache import FitnessCache
+from ..models import Individual, ConfiguracionAG
+from ..operators.initialization import InitializationOperator
+from ..operators.knapsack_loading import KnapsackLoadingOperator
+from ..core.parallel_evaluator import ParallelEvaluator
+from ..operators.array_operators import (
+    ArraySelectionOperator, ArrayCrossoverOperator,
+    ArrayMutationOperator, ArrayRepairOperator
+)
+
+
+class ArrayGeneticEngine(BaseService):
+    """Motor genético con la población completa en matrices NumPy.
+
+    Selección, cruza, mutación, reparación y evaluación operan sobre
+    PoblacionArrays; sólo el mejor individuo y el top 3 se convierten
+    de vuelta a AsignacionVehiculo para _generar_resultados.
+    """
+
+    def __init__(self, config: ConfiguracionAG, init_operator: InitializationOperator,
+                 evaluador: ParallelEvaluator, fitness_cache: FitnessCache, evolucion_fitness: List[float],
+                 control: ExecutionControl, rng: np.random.Generator,
+                 perfilador: OperatorProfiler = None, loading_operator: KnapsackLoadingOperator = None):
+        super().__init__()
+        self.config = config
+        self.fitness_cache = fitness_cache
+        self.init_operator = init_operator
+        self.evaluador = evaluador
+        self.evolucion_fitness = evolucion_fitness
+        self.control = control
+        self.perfilador = perfilador or OperatorProfiler()
+        self.loading_operator = loading_operator
+        self.rng = rng
+
+        rutas = init_operator.rutas
+        vehiculos = init_operator.vehiculos_expandidos
+
+        self.codificador = CodificadorGenoma(rutas, vehiculos, init_operator.TOTAL_INSUMOS)
+
+        self.selection_operator = ArraySelectionOperator()
+        self.crossover_operator = ArrayCrossoverOperator(self.rng)
+        self.mutation_operator = ArrayMutationOperator(init_operator.carga, self.rng)
+        self.repair_operator = ArrayRepairOperator(
+            rutas, init_operator.carga, init_operator.compatibilidad.matriz_factibilidad, self.rng
+        )
+
+        self.poblacion: PoblacionArrays = self.codificador.poblacion_vacia(0)
+        self.fitness = np.zeros(0, dtype=np.float64)
+        self.mejor_arrays = None
+        self.mejor_fitness = 0
+
+    def ejecutar(self) -> Tuple[Individual, List[tuple]]:
+        self.inicializar()
+        self.evolucionar(self.config.generaciones)
+        return self.resultado()
+
+    def inicializar(self):
+        with self.perfilador.medir("inicializacion"):
+            poblacion = self.init_operator.generar_poblacion_inicial(self.config.poblacion_size)
+            if self.loading_operator:
+                self.loading_operator.sembrar(poblacion, self.config.siembra_mochila,
+                                              len(self.init_operator.individuos_semilla))
+            self.poblacion = self.codificador.codificar(poblacion)
+        with self.perfilador.medir("evaluacion"):
+            self.fitness = self._evaluar(self.poblacion)
+
+    def evolucionar(self, generaciones: int):
+        for _ in range(generaciones):
+            if self.control.detenido:
+                break
+            self._generacion()
+            self.perfilador.cerrar_generacion()
+            self.control.registrar_generacion(self.evolucion_fitness[-1])
+            if self.control.debe_notificar():
+                self.control.notificar(self.evolucion_fitness[-1], self.fitness_medio())
+
+    def _generacion(self):
+        poblacion, fitness = self.poblacion, self.fitness
+
+        idx_mejor = int(np.argmax(fitness))
+        fitness_actual = float(fitness[idx_mejor])
+        self.evolucion_fitness.append(fitness_actual)
+
+        if fitness_actual > self.mejor_fitness:
+            self.mejor_fitness = fitness_actual
+            self.mejor_arrays = poblacion.tomar([idx_mejor])
+
+        with self.perfilador.medir("seleccion"):
+            padres1, padres2 = self.selection_operator.seleccion_por_orden(fitness)
+        with self.perfilador.medir("cruza"):
+            descendencia = self.crossover_operator.cruza_simple(
+                poblacion, padres1, padres2, self.config.prob_cruza
+            )
+        with self.perfilador.medir("mutacion"):
+            descendencia = self.mutation_operator.mutacion_segmento_aleatorio(
+                descendencia, self.config.prob_mutacion
+            )
+        if self.loading_operator:
+            with self.perfilador.medir("mejora_local"):
+                descendencia = self.loading_operator.mejora_local_arrays(
+                    descendencia, self.config.prob_mejora_local, self.rng
+                )
+        with self.perfilador.medir("reparacion"):
+            descendencia = self.repair_operator.reparar_poblacion(descendencia)
+        with self.perfilador.medir("evaluacion"):
+            fitness_descendencia = self._evaluar(descendencia)
+
+        with self.perfilador.medir("poda"):
+            poblacion_total = poblacion.concatenar(descendencia)
+            fitness_total = np.concatenate([fitness, fitness_descendencia])
+
+            supervivientes = self._poda_conservando_mejor(fitness_total, self.config.poblacion_size)
+            self.poblacion = poblacion_total.tomar(supervivientes)
+            self.fitness = fitness_total[supervivientes]
+
+    def fitness_medio(self) -> float:
+        return float(self.fitness.mean()) if len(self.fitness) else 0.0
+
+    def mejores(self, n: int) -> List[tuple]:
+        indices = np.argsort(-self.fitness, kind='stable')[:n]
+        return [(self.codificador.decodificar(self.poblacion, int(i)), float(self.fitness[i])) for i in indices]
+
+    def incorporar(self, individuos_evaluados: List[tuple]):
+        """Reemplazar a los peores individuos por inmigrantes ya evaluados."""
+        if not individuos_evaluados:
+            return
+
+        inmigrantes = self.codificador.codificar([individuo for individuo, _ in individuos_evaluados])
+        fitness_inmigrantes = np.array([fitness for _, fitness in individuos_evaluados], dtype=np.float64)
+
+        cantidad = min(len(inmigrantes), len(self.poblacion))
+        peores = np.argsort(self.fitness, kind='stable')[:cantidad]
+        self.poblacion.rutas[peores] = inmigrantes.rutas[:cantidad]
+        self.poblacion.insumos[peores] = inmigrantes.insumos[:cantidad]
+        self.poblacion.pesos[peores] = inmigrantes.pesos[:cantidad]
+        self.fitness[peores] = fitness_inmigrantes[:cantidad]
+
+        idx_mejor = int(np.argmax(self.fitness))
+        if self.fitness[idx_mejor] > self.mejor_fitness:
+            self.mejor_fitness = float(self.fitness[idx_mejor])
+            self.mejor_arrays = self.poblacion.tomar([idx_mejor])
+
+    def resultado(self) -> Tuple[Individual, List[tuple]]:
+        top_3 = self.mejores(3)
+
+        if top_3 and (self.mejor_arrays is None or top_3[0][1] >= self.mejor_fitness):
+            self.mejor_fitness = top_3[0][1]
+            return top_3[0][0], top_3
+
+        return self.codificador.decodificar(self.mejor_arrays, 0), top_3
+
+    def _evaluar(self, poblacion: PoblacionArrays) -> np.ndarray:
+        def clave(i: int) -> bytes:
+            return FitnessCache.clave_arrays(poblacion.rutas[i], poblacion.insumos[i], poblacion.pesos[i])
+
+        def evaluar_lote(indices: List[int]) -> List[float]:
+            lote = poblacion.tomar(indices)
+            return self.evaluador.evaluar_matrices(lote.rutas, lote.insumos, lote.pesos).tolist()
+
+        fitness = self.fitness_cache.evaluar(range(len(poblacion)), clave, evaluar_lote)
+        return np.array(fitness, dtype=np.float64)
+
+    def _poda_conservando_mejor(self, fitness: np.ndarray, poblacion_maxima: int) -> np.ndarray:
+        if len(fitness) <= poblacion_maxima:
+            return np.arange(len(fitness))
+
+        idx_mejor = int(np.argmax(fitness))
+        resto = np.delete(np.arange(len(fitness)), idx_mejor)
+        conservados = self.rng.choice(resto, max(0, poblacion_maxima - 1), replace=False)
+
+        return np.concatenate([[idx_mejor], conservados])
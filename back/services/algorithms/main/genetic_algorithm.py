@@ -1,10 +1,20 @@
+import cProfile
+import os
 import random
-from typing import List, Dict, Any
+import time
+import numpy as np
+from typing import Callable, List, Dict, Any, Optional
 from core.base_service import BaseService
 from core.exceptions import GeneticAlgorithmError
 from ..core.data_manager import DataManager
+from ..core.fitness_cache import FitnessCache
+from ..core.parallel_evaluator import ParallelEvaluator
+from ..core.execution_control import ExecutionControl
+from ..core.operator_profiler import OperatorProfiler
+from ..core.pareto import combinar_frentes
+from ..core.solution_store import SolutionStore
 from ..models import (
-    Individual, ResultadoIndividuo, EstadoRuta
+    Individual, ResultadoIndividuo, EstadoRuta, ScenarioData, Insumo
 )
 from ..operators.initialization import InitializationOperator
 from ..operators.evaluation import EvaluationOperator
@@ -13,15 +23,46 @@ from ..operators.simple_crossover import SimpleCrossoverOperator
 from ..operators.simple_mutation import SimpleMutationOperator
 from ..operators.simple_pruning import SimplePruningOperator
 from ..operators.simple_repair import SimpleRepairOperator
+from ..operators.knapsack_loading import KnapsackLoadingOperator
 from ..output.result_formatter import ResultFormatter
+from .array_engine import ArrayGeneticEngine
+from .object_engine import ObjectGeneticEngine
+from .nsga2_engine import ParetoGeneticEngine
+from .steady_state_engine import SteadyStateGeneticEngine
+from .island_model import IslandModel
+from .multi_start import MultiStartModel
+
+MOTOR_OBJETOS = "objetos"
+MOTOR_ARRAYS = "arrays"
+MOTOR_NSGA2 = "nsga2"
+MOTOR_ESTABLE = "estable"
 
 class LogisticsGeneticAlgorithm(BaseService):
-    def __init__(self, datos_frontend: Dict[str, Any], parametros_ag: Dict[str, Any] = None):
+    def __init__(self, datos_frontend: Dict[str, Any], parametros_ag: Dict[str, Any] = None,
+                 data_manager: Optional[DataManager] = None, solution_store: Optional[SolutionStore] = None,
+                 directorio_cprofile: Optional[str] = None):
         super().__init__()
-        self.data_manager = DataManager()
-        self.scenario_data, self.insumos = self.data_manager.procesar_datos_entrada(datos_frontend)
-        
-        self._configurar_operadores()
+        self.data_manager = data_manager or DataManager()
+        self.solution_store = solution_store
+        self.directorio_cprofile = directorio_cprofile
+        scenario_data, insumos = self.data_manager.procesar_datos_entrada(datos_frontend)
+        self._inicializar(scenario_data, insumos, parametros_ag)
+    
+    @classmethod
+    def desde_escenario(cls, scenario_data: ScenarioData, insumos: List[Insumo],
+                        parametros_ag: Dict[str, Any] = None) -> 'LogisticsGeneticAlgorithm':
+        """Construir el AG a partir de datos ya procesados, sin DataManager."""
+        ag = cls.__new__(cls)
+        BaseService.__init__(ag)
+        ag.data_manager = None
+        ag.solution_store = None
+        ag.directorio_cprofile = None
+        ag._inicializar(scenario_data, insumos, parametros_ag)
+        return ag
+    
+    def _inicializar(self, scenario_data: ScenarioData, insumos: List[Insumo],
+                     parametros_ag: Optional[Dict[str, Any]]):
+        self.scenario_data, self.insumos = scenario_data, insumos
         
         config = self.scenario_data.configuracion_ag
         if parametros_ag:
@@ -29,39 +70,112 @@ class LogisticsGeneticAlgorithm(BaseService):
             config.generaciones = parametros_ag.get('generaciones', config.generaciones)
             config.prob_cruza = parametros_ag.get('prob_cruza', config.prob_cruza)
             config.prob_mutacion = parametros_ag.get('prob_mutacion', config.prob_mutacion)
+            config.motor = parametros_ag.get('motor', config.motor)
+            config.cache_fitness = parametros_ag.get('cache_fitness', config.cache_fitness)
+            config.cache_fitness_max = parametros_ag.get('cache_fitness_max', config.cache_fitness_max)
+            config.evaluacion_paralela = parametros_ag.get('evaluacion_paralela', config.evaluacion_paralela)
+            config.procesos_evaluacion = parametros_ag.get('procesos_evaluacion', config.procesos_evaluacion)
+            config.lote_evaluacion = parametros_ag.get('lote_evaluacion', config.lote_evaluacion)
+            config.islas = parametros_ag.get('islas', config.islas)
+            config.intervalo_migracion = parametros_ag.get('intervalo_migracion', config.intervalo_migracion)
+            config.migrantes = parametros_ag.get('migrantes', config.migrantes)
+            config.topologia_migracion = parametros_ag.get('topologia_migracion', config.topologia_migracion)
+            config.generaciones_estancamiento = parametros_ag.get('generaciones_estancamiento', config.generaciones_estancamiento)
+            config.mejora_minima = parametros_ag.get('mejora_minima', config.mejora_minima)
+            config.fitness_objetivo = parametros_ag.get('fitness_objetivo', config.fitness_objetivo)
+            config.max_segundos = parametros_ag.get('max_segundos', config.max_segundos)
+            config.seed = parametros_ag.get('seed', config.seed)
+            config.perfil = parametros_ag.get('perfil', config.perfil)
+            config.siembra_mochila = parametros_ag.get('siembra_mochila', config.siembra_mochila)
+            config.prob_mejora_local = parametros_ag.get('prob_mejora_local', config.prob_mejora_local)
+            config.siembra_historial = parametros_ag.get('siembra_historial', config.siembra_historial)
+            config.tamaño_frente = parametros_ag.get('tamaño_frente', config.tamaño_frente)
+            config.elitismo_rate = parametros_ag.get('elitismo_rate', config.elitismo_rate)
+            config.tamaño_torneo = parametros_ag.get('tamaño_torneo', config.tamaño_torneo)
+            config.siembra_emparejamiento = parametros_ag.get('siembra_emparejamiento',
+                                                              config.siembra_emparejamiento)
+            config.reinicios = parametros_ag.get('reinicios', config.reinicios)
         
         self.config = config
+        self.seed = config.seed if config.seed is not None else random.SystemRandom().randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.np_rng = np.random.default_rng(self.seed)
+        
+        self._configurar_operadores()
+        
         self.evolucion_fitness = []
+        self.arranque_historial: Optional[Dict[str, Any]] = None
+        self.motor = None
+        self.elite_final: List[Individual] = []
+        self.modelo_islas: Optional[IslandModel] = None
+        self.modelo_reinicios: Optional[MultiStartModel] = None
+        self.control = ExecutionControl(config)
+        self.perfilador = OperatorProfiler(config.perfil)
+        self.fitness_cache = FitnessCache(config.cache_fitness_max, config.cache_fitness)
+        self.evaluador = ParallelEvaluator(
+            self.eval_operator, config.evaluacion_paralela,
+            config.procesos_evaluacion, config.lote_evaluacion
+        )
     
     def _configurar_operadores(self):
         try:
             self.init_operator = InitializationOperator(
                 self.scenario_data.rutas, 
                 self.scenario_data.vehiculos_disponibles, 
-                self.insumos
+                self.insumos,
+                self.rng,
+                fraccion_emparejamiento=self.config.siembra_emparejamiento
             )
             
             self.eval_operator = EvaluationOperator(
                 self.scenario_data.rutas, 
                 self.scenario_data.tipo_desastre, 
-                self.insumos
+                self.insumos,
+                self.init_operator.vehiculos_expandidos,
+                self.init_operator.carga
+            )
+            
+            self.loading_operator = KnapsackLoadingOperator(
+                self.insumos,
+                self.scenario_data.tipo_desastre,
+                self.init_operator.carga,
+                self.rng
             )
             
-            self.selection_operator = SimpleSelectionOperator()
-            self.crossover_operator = SimpleCrossoverOperator()
-            self.mutation_operator = SimpleMutationOperator()
-            self.pruning_operator = SimplePruningOperator()
+            self.selection_operator = SimpleSelectionOperator(self.rng)
+            self.crossover_operator = SimpleCrossoverOperator(self.rng)
+            self.mutation_operator = SimpleMutationOperator(self.init_operator.carga, self.rng)
+            self.pruning_operator = SimplePruningOperator(self.rng)
             self.repair_operator = SimpleRepairOperator(
                 self.scenario_data.rutas,
-                self.init_operator.vehiculos_expandidos
+                self.init_operator.vehiculos_expandidos,
+                self.init_operator.carga,
+                self.rng,
+                self.init_operator.compatibilidad
             )
             
         except Exception as e:
             self.log_error("Error configurando operadores", e)
             raise GeneticAlgorithmError(f"Error en configuración: {e}")
     
-    def ejecutar(self) -> Dict[str, Any]:
+    def ejecutar(self, al_generacion: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 cada: int = 1, archivo_cprofile: Optional[str] = None) -> Dict[str, Any]:
+        """Ejecutar el AG.
+
+        al_generacion recibe el progreso cada `cada` generaciones; con
+        archivo_cprofile la ejecución se perfila con cProfile y se vuelca
+        en formato pstats. Sin archivo_cprofile, si el AG se construyó con
+        directorio_cprofile (AG_CPROFILE_DIR), cada ejecución se vuelca ahí.
+        """
+        self.control.iniciar()
+        self.control.observar(al_generacion, cada)
+        archivo_cprofile = archivo_cprofile or self._archivo_cprofile()
+        perfil_cprofile = cProfile.Profile() if archivo_cprofile else None
+        
         try:
+            if perfil_cprofile:
+                perfil_cprofile.enable()
+            
             rutas_abiertas = [r for r in self.scenario_data.rutas if r.estado == EstadoRuta.ABIERTA]
             
             if not rutas_abiertas:
@@ -70,43 +184,21 @@ class LogisticsGeneticAlgorithm(BaseService):
             if not self.scenario_data.vehiculos_disponibles:
                 raise GeneticAlgorithmError("No hay vehículos disponibles")
             
-            poblacion = self.init_operator.generar_poblacion_inicial(self.config.poblacion_size)
-            
-            mejor_individuo = None
-            mejor_fitness = 0
-            
-            for generacion in range(self.config.generaciones):
-                poblacion_evaluada = self._evaluar_poblacion(poblacion)
-                
-                fitness_actual = max(fitness for _, fitness in poblacion_evaluada)
-                self.evolucion_fitness.append(fitness_actual)
-                
-                if fitness_actual > mejor_fitness:
-                    mejor_fitness = fitness_actual
-                    mejor_individuo = max(poblacion_evaluada, key=lambda x: x[1])[0]
-                
-                parejas = self.selection_operator.seleccion_por_orden(poblacion_evaluada)
-                descendencia = self.crossover_operator.cruza_simple(parejas, self.config.prob_cruza)
-                
-                descendencia_mutada = self.mutation_operator.mutacion_segmento_aleatorio(
-                    descendencia, self.config.prob_mutacion
-                )
-                
-                descendencia_reparada = []
-                for individuo in descendencia_mutada:
-                    individuo_reparado = self.repair_operator.reparar_individuo(individuo)
-                    descendencia_reparada.append(individuo_reparado)
-                
-                descendencia_evaluada = self._evaluar_poblacion(descendencia_reparada)
-                poblacion_total = poblacion_evaluada + descendencia_evaluada
-                
-                poblacion = self.pruning_operator.poda_aleatoria_conservando_mejor(
-                    poblacion_total, self.config.poblacion_size
-                )
-            
-            poblacion_final = self._evaluar_poblacion(poblacion)
-            top_3 = sorted(poblacion_final, key=lambda x: x[1], reverse=True)[:3]
+            if self.config.reinicios > 1:
+                mejor_individuo, top_3 = self._ejecutar_reinicios()
+                self.elite_final = [individuo for individuo, _ in
+                                    self.modelo_reinicios.poblacion[:self._tamaño_elite()]]
+            elif self.config.islas > 1:
+                mejor_individuo, top_3 = self._ejecutar_islas()
+                self.elite_final = [individuo for individuo, _ in top_3]
+            else:
+                if not self.init_operator.individuos_semilla:
+                    self._sembrar_desde_historial()
+                self.motor = self.crear_motor()
+                mejor_individuo, top_3 = self.motor.ejecutar()
+                self.elite_final = [individuo for individuo, _ in self.motor.mejores(self._tamaño_elite())]
             
+            self._guardar_en_historial(self.elite_final)
             resultado_ag = self._generar_resultados(mejor_individuo, top_3)
             
             return ResultFormatter.formatear_para_frontend(resultado_ag)
@@ -114,8 +206,157 @@ class LogisticsGeneticAlgorithm(BaseService):
         except Exception as e:
             self.log_error("Error ejecutando AG", e)
             raise GeneticAlgorithmError(f"Error en ejecución: {e}")
+        
+        finally:
+            if perfil_cprofile:
+                perfil_cprofile.disable()
+                perfil_cprofile.dump_stats(archivo_cprofile)
+            self.evaluador.cerrar()
+    
+    def _archivo_cprofile(self) -> Optional[str]:
+        if not self.directorio_cprofile:
+            return None
+        
+        os.makedirs(self.directorio_cprofile, exist_ok=True)
+        return os.path.join(self.directorio_cprofile,
+                            f"ag_{time.strftime('%Y%m%d_%H%M%S')}_{self.seed}.pstats")
+    
+    def crear_motor(self):
+        if self.config.motor in (MOTOR_ARRAYS, MOTOR_NSGA2):
+            motor = ParetoGeneticEngine if self.config.motor == MOTOR_NSGA2 else ArrayGeneticEngine
+            return motor(
+                self.config, self.init_operator, self.evaluador, self.fitness_cache,
+                self.evolucion_fitness, self.control, self.np_rng, self.perfilador,
+                self.loading_operator
+            )
+        
+        motor = SteadyStateGeneticEngine if self.config.motor == MOTOR_ESTABLE else ObjectGeneticEngine
+        return motor(
+            self.config, self.init_operator, self.selection_operator,
+            self.crossover_operator, self.mutation_operator, self.repair_operator,
+            self.pruning_operator, self._evaluar_poblacion, self.evolucion_fitness, self.control,
+            self.perfilador, self.loading_operator
+        )
+    
+    def exportar_poblacion(self) -> Dict[str, Any]:
+        """Población final (combinada con reinicios, élite con islas) en el formato de SolutionStore."""
+        if self.motor is not None:
+            individuos = [individuo for individuo, _ in self.motor.mejores(self.config.poblacion_size)]
+        elif self.modelo_reinicios is not None:
+            individuos = [individuo for individuo, _ in
+                          self.modelo_reinicios.poblacion[:self.config.poblacion_size]]
+        else:
+            individuos = self.elite_final
+        
+        return {
+            'descriptor': self._descriptor_escenario(),
+            'elite': SolutionStore.exportar(self.scenario_data.rutas, self.init_operator.vehiculos_expandidos,
+                                            individuos)
+        }
+    
+    def sembrar_poblacion(self, entrada: Dict[str, Any]) -> int:
+        """Sembrar con una población exportada de un escenario casi igual.
+
+        Solo se reparan las asignaciones afectadas por el cambio (rutas
+        cerradas, vehículos retirados o agregados); el resto conserva sus
+        métricas. Devuelve cuántos individuos se sembraron.
+        """
+        individuos = SolutionStore.traducir(
+            entrada, self.scenario_data.rutas, self.init_operator.vehiculos_expandidos, len(self.insumos)
+        )[:self.config.poblacion_size]
+        
+        self.init_operator.individuos_semilla = [
+            self.repair_operator.reparar_individuo(individuo) for individuo in individuos
+        ]
+        self.arranque_historial = {
+            "origen": "reoptimizacion",
+            "individuos": len(self.init_operator.individuos_semilla)
+        }
+        return len(self.init_operator.individuos_semilla)
+    
+    def _descriptor_escenario(self) -> Dict[str, Any]:
+        return SolutionStore.descriptor(self.scenario_data, self.init_operator.vehiculos_expandidos,
+                                        len(self.insumos))
+    
+    def _tamaño_elite(self) -> int:
+        return max(1, int(round(self.config.poblacion_size * self.config.elitismo_rate)))
+    
+    def _sembrar_desde_historial(self):
+        """Reparar la élite del escenario guardado más parecido y usarla como semilla."""
+        if not self.solution_store or self.config.siembra_historial <= 0:
+            return
+        
+        try:
+            encontrado = self.solution_store.buscar(self._descriptor_escenario())
+            if not encontrado:
+                return
+            
+            entrada, similitud = encontrado
+            maximo = max(1, int(round(self.config.poblacion_size * self.config.siembra_historial)))
+            individuos = SolutionStore.traducir(
+                entrada, self.scenario_data.rutas, self.init_operator.vehiculos_expandidos, len(self.insumos)
+            )[:maximo]
+            
+            self.init_operator.individuos_semilla = [
+                self.repair_operator.reparar_individuo(individuo) for individuo in individuos
+            ]
+            self.arranque_historial = {
+                "origen": "historial",
+                "similitud": similitud,
+                "individuos": len(self.init_operator.individuos_semilla)
+            }
+        except Exception as e:
+            self.log_error("Error sembrando desde el historial de soluciones", e)
+    
+    def _guardar_en_historial(self, elite: List[Individual]):
+        if not self.solution_store or not elite:
+            return
+        
+        try:
+            self.solution_store.guardar(
+                self._descriptor_escenario(), self.scenario_data.rutas,
+                self.init_operator.vehiculos_expandidos, elite
+            )
+        except Exception as e:
+            self.log_error("Error guardando la élite en el historial de soluciones", e)
+    
+    def _ejecutar_islas(self) -> tuple:
+        self.modelo_islas = IslandModel(self.scenario_data, self.insumos, self.control, self.seed)
+        mejor_individuo, top_3 = self.modelo_islas.ejecutar()
+        
+        self.evolucion_fitness.extend(self.modelo_islas.evolucion_fitness)
+        self.control.motivo_parada = self.modelo_islas.motivo_parada or self.control.motivo_parada
+        for metricas in self.modelo_islas.metricas_cache:
+            self.fitness_cache.acumular(metricas)
+        for perfil in self.modelo_islas.perfiles:
+            self.perfilador.acumular(perfil)
+        
+        return mejor_individuo, top_3
+    
+    def _ejecutar_reinicios(self) -> tuple:
+        if not self.init_operator.individuos_semilla:
+            self._sembrar_desde_historial()
+        self.modelo_reinicios = MultiStartModel(self.scenario_data, self.insumos, self.control, self.seed,
+                                                self.init_operator.individuos_semilla)
+        mejor_individuo, top_3 = self.modelo_reinicios.ejecutar()
+        
+        self.evolucion_fitness.extend(self.modelo_reinicios.evolucion_fitness)
+        for metricas in self.modelo_reinicios.metricas_cache:
+            self.fitness_cache.acumular(metricas)
+        for perfil in self.modelo_reinicios.perfiles:
+            self.perfilador.acumular(perfil)
+        
+        return mejor_individuo, top_3
     
     def _evaluar_poblacion(self, poblacion: List[Individual]) -> List[tuple]:
+        try:
+            fitnesses = self.fitness_cache.evaluar(
+                poblacion, FitnessCache.clave_individuo, self.evaluador.evaluar_poblacion
+            )
+            return list(zip(poblacion, fitnesses))
+        except Exception as e:
+            self.log_error(f"Error evaluando población: {e}", e)
+        
         poblacion_evaluada = []
         for individuo in poblacion:
             try:
@@ -141,12 +382,24 @@ class LogisticsGeneticAlgorithm(BaseService):
             "mejor_solucion": mejor_resultado.__dict__,
             "top_3_soluciones": [r.__dict__ for r in top_3_resultados],
             "evolucion_fitness": self.evolucion_fitness,
+            "evolucion_islas": self.modelo_islas.evolucion_islas if self.modelo_islas else [],
+            "evolucion_reinicios": self.modelo_reinicios.evolucion_reinicios if self.modelo_reinicios else [],
+            "frente_pareto": self._frente_pareto(),
+            "perfil": self.perfilador.resumen() if self.config.perfil else None,
             "metricas_optimizacion": {
-                "generaciones_ejecutadas": self.config.generaciones,
+                "generaciones_ejecutadas": len(self.evolucion_fitness),
                 "poblacion_size": self.config.poblacion_size,
+                "seed": self.seed,
+                "arranque_historial": self.arranque_historial,
                 "fitness_final": mejor_resultado.fitness,
                 "mejora_total": (self.evolucion_fitness[-1] - self.evolucion_fitness[0] 
-                               if len(self.evolucion_fitness) > 1 else 0)
+                               if len(self.evolucion_fitness) > 1 else 0),
+                "cache_fitness": self.fitness_cache.metricas(),
+                "islas": self.modelo_islas.metricas() if self.modelo_islas else None,
+                "reinicios": self.modelo_reinicios.metricas() if self.modelo_reinicios else None,
+                "diversidad": (self.motor.metricas_diversidad()
+                               if isinstance(self.motor, ObjectGeneticEngine) else None),
+                **self.control.metricas()
             },
             "resumen_escenario": {
                 "tipo_desastre": self.scenario_data.tipo_desastre.tipo,
@@ -162,6 +415,23 @@ class LogisticsGeneticAlgorithm(BaseService):
             "analisis_eficiencia": self._calcular_eficiencia_simple(mejor_individuo)
         }
     
+    def _frente_pareto(self) -> Optional[List[Dict[str, Any]]]:
+        """Frente del motor NSGA-II, o la combinación de los frentes de cada isla o reinicio."""
+        if isinstance(self.motor, ParetoGeneticEngine):
+            candidatos = self.motor.frente_pareto(self.config.tamaño_frente)
+        elif self.config.motor == MOTOR_NSGA2 and (self.modelo_reinicios or self.modelo_islas):
+            modelo = self.modelo_reinicios or self.modelo_islas
+            candidatos = combinar_frentes(modelo.frentes, self.config.tamaño_frente)
+        else:
+            return None
+        
+        frente = []
+        for individuo, fitness, objetivos in candidatos:
+            resultado = self._procesar_individuo_resultado(individuo, fitness).__dict__
+            resultado["objetivos"] = objetivos
+            frente.append(resultado)
+        return frente
+    
     def _procesar_individuo_resultado(self, individuo: Individual, fitness: float) -> ResultadoIndividuo:
         if not individuo:
             return ResultadoIndividuo(
@@ -208,12 +478,15 @@ class LogisticsGeneticAlgorithm(BaseService):
     def _calcular_distribucion_simple(self, individuo: Individual) -> Dict[str, Any]:
         vehiculos_activos = [a for a in individuo if a.ruta_id != -1]
         total_peso = sum(a.peso_total_kg for a in vehiculos_activos)
-        total_capacidad = len(self.init_operator.vehiculos_expandidos) * 1000
+        carga = self.init_operator.carga
+        total_capacidad = float(carga.capacidades_kg.sum())
+        utilizaciones = [a.peso_total_kg / carga.capacidad(a.vehiculo_id)
+                         for a in vehiculos_activos if carga.capacidad(a.vehiculo_id) > 0]
         
         return {
             "utilizacion_promedio": (total_peso / total_capacidad * 100) if total_capacidad > 0 else 0,
-            "vehiculos_optimos": len([a for a in vehiculos_activos if 700 <= a.peso_total_kg <= 950]),
-            "vehiculos_subutilizados": len([a for a in vehiculos_activos if a.peso_total_kg < 700]),
+            "vehiculos_optimos": len([u for u in utilizaciones if 0.70 <= u <= 0.95]),
+            "vehiculos_subutilizados": len([u for u in utilizaciones if u < 0.70]),
             "peso_total_transportado": total_peso,
             "capacidad_total_disponible": total_capacidad,
             "utilizacion_total": (total_peso / total_capacidad * 100) if total_capacidad > 0 else 0
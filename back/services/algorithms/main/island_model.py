@@ -0,0 +1,201 @@
+import copy
+import multiprocessing
+import numpy as np
+from itertools import zip_longest
+from typing import Any, Dict, List, Optional, Tuple
+from core.base_service import BaseService
+from core.exceptions import GeneticAlgorithmError
+from ..core.execution_control import ExecutionControl, PARADA_ESTANCAMIENTO
+from ..models import Individual, Insumo, ScenarioData
+from .nsga2_engine import ParetoGeneticEngine
+
+TOPOLOGIA_ANILLO = "anillo"
+TOPOLOGIA_COMPLETA = "completa"
+
+
+def _ejecutar_isla(conexion, scenario_data: ScenarioData, insumos: List[Insumo], seed: int) -> None:
+    """Proceso de una isla: evoluciona por tramos y atiende órdenes del coordinador."""
+    from .genetic_algorithm import LogisticsGeneticAlgorithm
+
+    try:
+        ag = LogisticsGeneticAlgorithm.desde_escenario(scenario_data, insumos, {'seed': seed})
+        motor = ag.crear_motor()
+        motor.inicializar()
+
+        while True:
+            orden, *argumentos = conexion.recv()
+
+            if orden == 'evolucionar':
+                generaciones, migrantes, inmigrantes = argumentos
+                motor.incorporar(inmigrantes)
+                motor.evolucionar(generaciones)
+                conexion.send(('ok', (motor.mejores(migrantes), motor.fitness_medio(), ag.control.motivo_parada)))
+
+            elif orden == 'finalizar':
+                mejor_individuo, top_3 = motor.resultado()
+                conexion.send(('resultado', {
+                    'mejor_individuo': mejor_individuo,
+                    'mejor_fitness': top_3[0][1] if top_3 else 0,
+                    'top_3': top_3,
+                    'frente_pareto': motor.frente_pareto(ag.config.tamaño_frente)
+                    if isinstance(motor, ParetoGeneticEngine) else [],
+                    'evolucion_fitness': ag.evolucion_fitness,
+                    'cache_fitness': ag.fitness_cache.metricas(),
+                    'perfil': ag.perfilador.resumen()
+                }))
+                break
+
+    except Exception as e:
+        conexion.send(('error', str(e)))
+
+    finally:
+        conexion.close()
+
+
+class IslandModel(BaseService):
+    """Modelo de islas: N poblaciones independientes en procesos separados.
+
+    Cada intervalo_migracion generaciones las islas intercambian sus mejores
+    individuos siguiendo una topología de anillo o completamente conectada.
+    """
+
+    def __init__(self, scenario_data: ScenarioData, insumos: List[Insumo], control: ExecutionControl,
+                 seed: int):
+        super().__init__()
+        self.control = control
+        self.seed = seed
+        self.config = scenario_data.configuracion_ag
+        self.total_islas = self.config.islas
+
+        self.scenario_data = copy.deepcopy(scenario_data)
+        self.scenario_data.configuracion_ag.islas = 1
+        self.scenario_data.configuracion_ag.evaluacion_paralela = False
+        self.insumos = insumos
+
+        self.evolucion_fitness: List[float] = []
+        self.evolucion_islas: List[List[float]] = []
+        self.metricas_cache: List[Dict[str, Any]] = []
+        self.perfiles: List[Dict[str, Any]] = []
+        self.frentes: List[List[tuple]] = []
+        self.motivo_parada: Optional[str] = None
+
+    def ejecutar(self) -> Tuple[Individual, List[tuple]]:
+        contexto = multiprocessing.get_context()
+        conexiones = []
+        procesos = []
+
+        try:
+            for semilla in self._semillas_islas():
+                conexion_padre, conexion_hijo = contexto.Pipe()
+                proceso = contexto.Process(
+                    target=_ejecutar_isla,
+                    args=(conexion_hijo, self.scenario_data, self.insumos, semilla),
+                    daemon=True
+                )
+                proceso.start()
+                conexion_hijo.close()
+                conexiones.append(conexion_padre)
+                procesos.append(proceso)
+
+            self._evolucionar_islas(conexiones)
+
+            resultados = []
+            for conexion in conexiones:
+                conexion.send(('finalizar',))
+            for conexion in conexiones:
+                resultados.append(self._recibir(conexion, 'resultado'))
+
+            return self._combinar_resultados(resultados)
+
+        finally:
+            for conexion in conexiones:
+                conexion.close()
+            for proceso in procesos:
+                proceso.join(timeout=5)
+                if proceso.is_alive():
+                    proceso.terminate()
+
+    def _semillas_islas(self) -> List[int]:
+        """Flujos aleatorios independientes y reproducibles para cada isla."""
+        return [
+            int(secuencia.generate_state(1)[0])
+            for secuencia in np.random.SeedSequence(self.seed).spawn(self.total_islas)
+        ]
+
+    def _evolucionar_islas(self, conexiones: List) -> None:
+        intervalo = max(1, self.config.intervalo_migracion)
+        restantes = self.config.generaciones
+        inmigrantes: List[List[tuple]] = [[] for _ in conexiones]
+
+        while restantes > 0:
+            tramo = min(intervalo, restantes)
+            restantes -= tramo
+
+            for conexion, recibidos in zip(conexiones, inmigrantes):
+                conexion.send(('evolucionar', tramo, self.config.migrantes, recibidos))
+
+            respuestas = [self._recibir(conexion, 'ok') for conexion in conexiones]
+            emigrantes = [migrantes for migrantes, _, _ in respuestas]
+            inmigrantes = self._migrar(emigrantes)
+
+            mejor_tramo = max((fitness for migrantes in emigrantes for _, fitness in migrantes), default=0)
+            for _ in range(tramo):
+                self.control.registrar_generacion(mejor_tramo)
+            if self.control.observado:
+                medios = [medio for _, medio, _ in respuestas]
+                self.control.notificar(mejor_tramo, sum(medios) / len(medios))
+
+            self.motivo_parada = self._motivo_parada_global([motivo for _, _, motivo in respuestas])
+            if self.motivo_parada or self.control.detenido:
+                break
+
+    def _motivo_parada_global(self, motivos: List[Optional[str]]) -> Optional[str]:
+        """Una isla que alcanza el objetivo o el tiempo detiene a todas; el estancamiento debe ser general."""
+        for motivo in motivos:
+            if motivo and motivo != PARADA_ESTANCAMIENTO:
+                return motivo
+        if motivos and all(motivo == PARADA_ESTANCAMIENTO for motivo in motivos):
+            return PARADA_ESTANCAMIENTO
+        return None
+
+    def _migrar(self, emigrantes: List[List[tuple]]) -> List[List[tuple]]:
+        total = len(emigrantes)
+
+        if self.config.topologia_migracion == TOPOLOGIA_COMPLETA:
+            return [
+                [individuo for j in range(total) if j != i for individuo in emigrantes[j]]
+                for i in range(total)
+            ]
+
+        return [emigrantes[(i - 1) % total] for i in range(total)]
+
+    def _recibir(self, conexion, esperado: str) -> Any:
+        estado, contenido = conexion.recv()
+        if estado != esperado:
+            raise GeneticAlgorithmError(f"Error en isla: {contenido}")
+        return contenido
+
+    def _combinar_resultados(self, resultados: List[Dict[str, Any]]) -> Tuple[Individual, List[tuple]]:
+        self.evolucion_islas = [resultado['evolucion_fitness'] for resultado in resultados]
+        self.evolucion_fitness = [
+            max(valores) for valores in
+            zip_longest(*self.evolucion_islas, fillvalue=float('-inf'))
+        ]
+        self.metricas_cache = [resultado['cache_fitness'] for resultado in resultados]
+        self.perfiles = [resultado['perfil'] for resultado in resultados]
+        self.frentes = [resultado['frente_pareto'] for resultado in resultados]
+
+        candidatos = [candidato for resultado in resultados for candidato in resultado['top_3']]
+        top_3 = sorted(candidatos, key=lambda x: x[1], reverse=True)[:3]
+
+        mejor = max(resultados, key=lambda r: r['mejor_fitness'])
+        return mejor['mejor_individuo'], top_3
+
+    def metricas(self) -> Dict[str, Any]:
+        return {
+            "total_islas": self.total_islas,
+            "intervalo_migracion": self.config.intervalo_migracion,
+            "migrantes": self.config.migrantes,
+            "topologia": self.config.topologia_migracion,
+            "fitness_final_islas": [evolucion[-1] if evolucion else 0 for evolucion in self.evolucion_islas]
+        }
@@ -0,0 +1,210 @@
+import copy
+import multiprocessing
+import os
+import statistics
+import time
+import numpy as np
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import zip_longest
+from typing import Any, Dict, List, Optional, Tuple
+from core.base_service import BaseService
+from core.exceptions import GeneticAlgorithmError
+from ..core.execution_control import ExecutionControl, PARADA_CANCELADA
+from ..core.fitness_cache import FitnessCache
+from ..models import Individual, Insumo, ScenarioData
+from .nsga2_engine import ParetoGeneticEngine
+
+# Un reinicio está "cerca" del mejor global si su fitness final queda a menos de esta fracción
+TOLERANCIA_CERCANIA = 0.01
+# Cada cuánto revisa el coordinador si se pidió cancelar mientras espera a los reinicios
+INTERVALO_ESPERA_S = 0.2
+
+
+def _ejecutar_reinicio(scenario_data: ScenarioData, insumos: List[Insumo], seed: int,
+                       cancelacion, limite: Optional[float],
+                       individuos_semilla: List[Individual]) -> Dict[str, Any]:
+    """Proceso de un reinicio: una ejecución completa e independiente del AG.
+
+    `limite` es el instante (time.time()) en que vence el presupuesto de
+    tiempo de toda la ejecución; el reinicio sólo dispone de lo que queda.
+    """
+    from .genetic_algorithm import LogisticsGeneticAlgorithm
+
+    inicio = time.monotonic()
+    parametros_ag = {'seed': seed}
+    if limite is not None:
+        parametros_ag['max_segundos'] = max(0.0, limite - time.time())
+    ag = LogisticsGeneticAlgorithm.desde_escenario(scenario_data, insumos, parametros_ag)
+    ag.init_operator.individuos_semilla = individuos_semilla
+    # La cancelación del coordinador se consulta una vez por generación
+    ag.control.observar(lambda _: cancelacion.is_set() and ag.control.cancelar())
+    try:
+        motor = ag.crear_motor()
+        motor.ejecutar()
+        poblacion = motor.mejores(ag.config.poblacion_size)
+        return {
+            'seed': seed,
+            'poblacion': poblacion,
+            'mejor_fitness': poblacion[0][1] if poblacion else 0.0,
+            'frente_pareto': motor.frente_pareto(ag.config.tamaño_frente)
+            if isinstance(motor, ParetoGeneticEngine) else [],
+            'evolucion_fitness': ag.evolucion_fitness,
+            'motivo_parada': ag.control.motivo_parada,
+            'tiempo_s': time.monotonic() - inicio,
+            'cache_fitness': ag.fitness_cache.metricas(),
+            'perfil': ag.perfilador.resumen()
+        }
+    finally:
+        ag.evaluador.cerrar()
+
+
+class MultiStartModel(BaseService):
+    """Varias ejecuciones independientes del AG en un pool de procesos.
+
+    Cada reinicio tiene su propia semilla y no intercambia individuos con
+    los demás; al terminar, sus poblaciones finales se combinan sin
+    duplicados y de ahí salen la mejor solución y el top 3. La dispersión
+    del fitness final entre reinicios indica cuánto fiarse de una sola
+    ejecución. Todos parten de los mismos `individuos_semilla` (p. ej. la
+    élite del historial) y completan el resto de su población al azar.
+
+    `max_segundos` limita la ejecución completa, no cada reinicio: cada uno
+    recibe el tiempo que queda al empezar. Al cancelar o agotarse el
+    tiempo, los reinicios pendientes se descartan y los que están en curso
+    se detienen en su siguiente generación y aportan la población que tengan.
+    """
+
+    def __init__(self, scenario_data: ScenarioData, insumos: List[Insumo], control: ExecutionControl,
+                 seed: int, individuos_semilla: Optional[List[Individual]] = None):
+        super().__init__()
+        self.control = control
+        self.seed = seed
+        self.individuos_semilla = individuos_semilla or []
+        self.config = scenario_data.configuracion_ag
+        self.total_reinicios = self.config.reinicios
+
+        self.scenario_data = copy.deepcopy(scenario_data)
+        self.scenario_data.configuracion_ag.reinicios = 1
+        self.scenario_data.configuracion_ag.islas = 1
+        self.scenario_data.configuracion_ag.evaluacion_paralela = False
+        self.insumos = insumos
+
+        self.resultados: List[Dict[str, Any]] = []
+        self.poblacion: List[Tuple[Individual, float]] = []
+        self.duplicados = 0
+        self.evolucion_fitness: List[float] = []
+        self.evolucion_reinicios: List[List[float]] = []
+        self.metricas_cache: List[Dict[str, Any]] = []
+        self.perfiles: List[Dict[str, Any]] = []
+        self.frentes: List[List[tuple]] = []
+
+    def ejecutar(self) -> Tuple[Individual, List[tuple]]:
+        procesos = min(self.total_reinicios, os.cpu_count() or 1)
+        limite = None
+        if self.config.max_segundos is not None:
+            limite = time.time() + self.config.max_segundos - self.control.segundos_transcurridos()
+
+        with multiprocessing.Manager() as gestor, ProcessPoolExecutor(max_workers=procesos) as pool:
+            cancelacion = gestor.Event()
+            pendientes = {
+                pool.submit(_ejecutar_reinicio, self.scenario_data, self.insumos, semilla, cancelacion,
+                            limite, self.individuos_semilla)
+                for semilla in self._semillas_reinicios()
+            }
+            while pendientes:
+                terminados, pendientes = wait(pendientes, timeout=INTERVALO_ESPERA_S,
+                                              return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    if futuro.cancelled():
+                        continue
+                    try:
+                        self.resultados.append(futuro.result())
+                    except Exception as e:
+                        raise GeneticAlgorithmError(f"Error en reinicio: {e}")
+                    self._notificar_avance()
+
+                if self.control.detenido and not cancelacion.is_set():
+                    cancelacion.set()
+                    for pendiente in pendientes:
+                        pendiente.cancel()
+
+        if not self.resultados:
+            raise GeneticAlgorithmError("Ejecución detenida antes de completar algún reinicio")
+
+        return self._combinar_resultados()
+
+    def _semillas_reinicios(self) -> List[int]:
+        """Flujos aleatorios independientes y reproducibles para cada reinicio."""
+        return [
+            int(secuencia.generate_state(1)[0])
+            for secuencia in np.random.SeedSequence(self.seed).spawn(self.total_reinicios)
+        ]
+
+    def _notificar_avance(self) -> None:
+        """Reflejar en el control los reinicios terminados como fracción de las generaciones."""
+        mejores = [resultado['mejor_fitness'] for resultado in self.resultados]
+        self.control.generaciones = int(round(
+            self.config.generaciones * len(self.resultados) / self.total_reinicios
+        ))
+        self.control.mejor_fitness = max(mejores)
+        if self.control.observado:
+            self.control.notificar(max(mejores), sum(mejores) / len(mejores))
+
+    def _combinar_resultados(self) -> Tuple[Individual, List[tuple]]:
+        self.resultados.sort(key=lambda resultado: resultado['seed'])
+        self.evolucion_reinicios = [resultado['evolucion_fitness'] for resultado in self.resultados]
+        self.evolucion_fitness = [
+            max(valores) for valores in
+            zip_longest(*self.evolucion_reinicios, fillvalue=float('-inf'))
+        ]
+        self.metricas_cache = [resultado['cache_fitness'] for resultado in self.resultados]
+        self.perfiles = [resultado['perfil'] for resultado in self.resultados]
+        self.frentes = [resultado['frente_pareto'] for resultado in self.resultados]
+
+        vistos = set()
+        candidatos = sorted(
+            (evaluado for resultado in self.resultados for evaluado in resultado['poblacion']),
+            key=lambda x: x[1], reverse=True
+        )
+        for individuo, fitness in candidatos:
+            clave = FitnessCache.clave_individuo(individuo)
+            if clave in vistos:
+                self.duplicados += 1
+                continue
+            vistos.add(clave)
+            self.poblacion.append((individuo, fitness))
+
+        if self.control.cancelado:
+            self.control.motivo_parada = PARADA_CANCELADA
+        elif self.control.motivo_parada is None:
+            motivos = {resultado['motivo_parada'] for resultado in self.resultados}
+            self.control.motivo_parada = motivos.pop() if len(motivos) == 1 else None
+
+        return self.poblacion[0][0], self.poblacion[:3]
+
+    def metricas(self) -> Dict[str, Any]:
+        finales = [resultado['mejor_fitness'] for resultado in self.resultados]
+        mejor = max(finales)
+        media = statistics.fmean(finales)
+        desviacion = statistics.pstdev(finales)
+
+        return {
+            "total_reinicios": self.total_reinicios,
+            "reinicios_completados": len(self.resultados),
+            "seeds": [resultado['seed'] for resultado in self.resultados],
+            "fitness_final_reinicios": finales,
+            "tiempo_reinicios_s": [resultado['tiempo_s'] for resultado in self.resultados],
+            "motivos_parada": [resultado['motivo_parada'] for resultado in self.resultados],
+            "seed_mejor": self.resultados[finales.index(mejor)]['seed'],
+            "fitness_mejor": mejor,
+            "fitness_peor": min(finales),
+            "fitness_medio": media,
+            "desviacion_estandar": desviacion,
+            "coeficiente_variacion": desviacion / media if media > 0 else 0.0,
+            "brecha_media": mejor - media,
+            "fraccion_cerca_mejor": sum(
+                1 for fitness in finales if fitness >= mejor * (1 - TOLERANCIA_CERCANIA)
+            ) / len(finales),
+            "poblacion_combinada": len(self.poblacion),
+            "duplicados_descartados": self.duplicados
+        }
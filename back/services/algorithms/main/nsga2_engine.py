@@ -0,0 +1,133 @@
+import numpy as np
+from typing import Any, Dict, List, Tuple
+from ..core.fitness_cache import FitnessCache
+from ..core.pareto import (
+    ordenamiento_no_dominado, distancia_crowding, seleccion_supervivientes, torneo_binario, frente_unico,
+    recortar_frente
+)
+from ..core.poblacion_arrays import PoblacionArrays
+from ..operators.evaluation import EvaluationOperator, OBJETIVOS
+from .array_engine import ArrayGeneticEngine
+
+
+class ParetoGeneticEngine(ArrayGeneticEngine):
+    """NSGA-II sobre la representación de arrays.
+
+    Cada individuo se evalúa con los cuatro objetivos de EvaluationOperator
+    sin ponderar. La selección es por torneo binario de (frente, crowding) y
+    la supervivencia (μ+λ) por ordenamiento no dominado y distancia de
+    crowding. El fitness ponderado se conserva sólo para informar el
+    progreso y elegir la solución destacada del frente.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.objetivos = np.zeros((0, len(OBJETIVOS)), dtype=np.float64)
+        self.rangos = np.zeros(0, dtype=np.int64)
+        self.crowding = np.zeros(0, dtype=np.float64)
+
+    def inicializar(self):
+        with self.perfilador.medir("inicializacion"):
+            poblacion = self.init_operator.generar_poblacion_inicial(self.config.poblacion_size)
+            if self.loading_operator:
+                self.loading_operator.sembrar(poblacion, self.config.siembra_mochila,
+                                              len(self.init_operator.individuos_semilla))
+            self.poblacion = self.codificador.codificar(poblacion)
+        with self.perfilador.medir("evaluacion"):
+            self._asignar(self.poblacion, self._evaluar_objetivos(self.poblacion))
+
+    def _generacion(self):
+        poblacion, fitness = self.poblacion, self.fitness
+
+        idx_mejor = int(np.argmax(fitness))
+        fitness_actual = float(fitness[idx_mejor])
+        self.evolucion_fitness.append(fitness_actual)
+
+        if fitness_actual > self.mejor_fitness:
+            self.mejor_fitness = fitness_actual
+            self.mejor_arrays = poblacion.tomar([idx_mejor])
+
+        with self.perfilador.medir("seleccion"):
+            pares = (len(poblacion) + 1) // 2
+            padres = torneo_binario(self.rangos, self.crowding, 2 * pares, self.rng)
+        with self.perfilador.medir("cruza"):
+            descendencia = self.crossover_operator.cruza_simple(
+                poblacion, padres[0::2], padres[1::2], self.config.prob_cruza
+            )
+        with self.perfilador.medir("mutacion"):
+            descendencia = self.mutation_operator.mutacion_segmento_aleatorio(
+                descendencia, self.config.prob_mutacion
+            )
+        if self.loading_operator:
+            with self.perfilador.medir("mejora_local"):
+                descendencia = self.loading_operator.mejora_local_arrays(
+                    descendencia, self.config.prob_mejora_local, self.rng
+                )
+        with self.perfilador.medir("reparacion"):
+            descendencia = self.repair_operator.reparar_poblacion(descendencia)
+        with self.perfilador.medir("evaluacion"):
+            objetivos_descendencia = self._evaluar_objetivos(descendencia)
+
+        with self.perfilador.medir("poda"):
+            self._asignar(poblacion.concatenar(descendencia),
+                          np.concatenate([self.objetivos, objetivos_descendencia]),
+                          self.config.poblacion_size)
+
+    def incorporar(self, individuos_evaluados: List[tuple]):
+        """Añadir inmigrantes y volver a seleccionar por frentes."""
+        if not individuos_evaluados:
+            return
+
+        inmigrantes = self.codificador.codificar([individuo for individuo, _ in individuos_evaluados])
+        self._asignar(self.poblacion.concatenar(inmigrantes),
+                      np.concatenate([self.objetivos, self._evaluar_objetivos(inmigrantes)]),
+                      len(self.poblacion))
+
+        idx_mejor = int(np.argmax(self.fitness))
+        if self.fitness[idx_mejor] > self.mejor_fitness:
+            self.mejor_fitness = float(self.fitness[idx_mejor])
+            self.mejor_arrays = self.poblacion.tomar([idx_mejor])
+
+    def frente_pareto(self, maximo: int) -> List[Tuple[Any, float, Dict[str, float]]]:
+        """Primer frente sin duplicados como (individuo, fitness, objetivos).
+
+        Si supera `maximo`, se conservan los de mayor crowding (los extremos
+        siempre); el resultado se ordena por fitness ponderado.
+        """
+        indices, objetivos = frente_unico(self.objetivos, self.rangos)
+        elegidos = recortar_frente(objetivos, maximo)
+        indices, objetivos = indices[elegidos], objetivos[elegidos]
+
+        orden = np.argsort(-self.fitness[indices], kind='stable')
+        return [
+            (
+                self.codificador.decodificar(self.poblacion, int(indices[i])),
+                float(self.fitness[indices[i]]),
+                dict(zip(OBJETIVOS, objetivos[i].tolist()))
+            )
+            for i in orden
+        ]
+
+    def _asignar(self, poblacion: PoblacionArrays, objetivos: np.ndarray, tamaño: int = None):
+        rangos = ordenamiento_no_dominado(objetivos)
+        crowding = distancia_crowding(objetivos, rangos)
+        supervivientes = seleccion_supervivientes(rangos, crowding, tamaño or len(poblacion))
+
+        self.poblacion = poblacion.tomar(supervivientes)
+        self.objetivos = objetivos[supervivientes]
+        self.rangos = rangos[supervivientes]
+        self.crowding = crowding[supervivientes]
+        self.fitness = EvaluationOperator.combinar_objetivos(self.objetivos)
+
+    def _evaluar_objetivos(self, poblacion: PoblacionArrays) -> np.ndarray:
+        def clave(i: int) -> bytes:
+            return FitnessCache.clave_arrays(poblacion.rutas[i], poblacion.insumos[i], poblacion.pesos[i])
+
+        def evaluar_lote(indices: List[int]) -> List[tuple]:
+            lote = poblacion.tomar(indices)
+            return [tuple(fila) for fila in self.evaluador.objetivos_matrices(
+                lote.rutas, lote.insumos, lote.pesos
+            ).tolist()]
+
+        objetivos = self.fitness_cache.evaluar(range(len(poblacion)), clave, evaluar_lote)
+        return np.array(objetivos, dtype=np.float64).reshape(len(poblacion), len(OBJETIVOS))
@@ -0,0 +1,162 @@
+from typing import Any, Callable, Dict, List, Tuple
+from core.base_service import BaseService
+from ..core.execution_control import ExecutionControl
+from ..core.operator_profiler import OperatorProfiler
+from ..core.poblacion_unica import PoblacionUnica
+from ..models import Individual, ConfiguracionAG
+from ..operators.initialization import InitializationOperator
+from ..operators.simple_selection import SimpleSelectionOperator
+from ..operators.simple_crossover import SimpleCrossoverOperator
+from ..operators.simple_mutation import SimpleMutationOperator
+from ..operators.simple_pruning import SimplePruningOperator
+from ..operators.simple_repair import SimpleRepairOperator
+from ..operators.knapsack_loading import KnapsackLoadingOperator
+
+
+class ObjectGeneticEngine(BaseService):
+    """Motor genético donde cada individuo es una lista de AsignacionVehiculo.
+
+    Los motores mantienen su población como estado para poder avanzar por
+    tramos de generaciones (evolucionar) e intercambiar individuos
+    (mejores / incorporar), como requiere el modelo de islas. La población
+    no admite genomas repetidos: los clones se descartan antes de evaluarse.
+    """
+
+    def __init__(self, config: ConfiguracionAG, init_operator: InitializationOperator,
+                 selection_operator: SimpleSelectionOperator, crossover_operator: SimpleCrossoverOperator,
+                 mutation_operator: SimpleMutationOperator, repair_operator: SimpleRepairOperator,
+                 pruning_operator: SimplePruningOperator,
+                 evaluar_poblacion: Callable[[List[Individual]], List[tuple]],
+                 evolucion_fitness: List[float], control: ExecutionControl,
+                 perfilador: OperatorProfiler = None, loading_operator: KnapsackLoadingOperator = None):
+        super().__init__()
+        self.config = config
+        self.init_operator = init_operator
+        self.selection_operator = selection_operator
+        self.crossover_operator = crossover_operator
+        self.mutation_operator = mutation_operator
+        self.repair_operator = repair_operator
+        self.pruning_operator = pruning_operator
+        self.evaluar_poblacion = evaluar_poblacion
+        self.evolucion_fitness = evolucion_fitness
+        self.control = control
+        self.perfilador = perfilador or OperatorProfiler()
+        self.loading_operator = loading_operator
+
+        self.poblacion = PoblacionUnica()
+        self.poblacion_evaluada: List[tuple] = []
+        self.evolucion_diversidad: List[float] = []
+        self.mejor_individuo = None
+        self.mejor_fitness = 0
+
+    def ejecutar(self) -> Tuple[Individual, List[tuple]]:
+        self.inicializar()
+        self.evolucionar(self.config.generaciones)
+        return self.resultado()
+
+    def inicializar(self):
+        with self.perfilador.medir("inicializacion"):
+            poblacion = self.init_operator.generar_poblacion_inicial(self.config.poblacion_size)
+            if self.loading_operator:
+                self.loading_operator.sembrar(poblacion, self.config.siembra_mochila,
+                                              len(self.init_operator.individuos_semilla))
+        self.poblacion = PoblacionUnica()
+        with self.perfilador.medir("duplicados"):
+            poblacion, claves = self.poblacion.filtrar_nuevos(poblacion)
+        with self.perfilador.medir("evaluacion"):
+            self.poblacion.agregar(self.evaluar_poblacion(poblacion), claves)
+        self.poblacion_evaluada = self.poblacion.evaluados
+
+    def evolucionar(self, generaciones: int):
+        for _ in range(generaciones):
+            if self.control.detenido:
+                break
+            self._generacion()
+            self.perfilador.cerrar_generacion()
+            self.control.registrar_generacion(self.evolucion_fitness[-1])
+            if self.control.debe_notificar():
+                self.control.notificar(self.evolucion_fitness[-1], self.fitness_medio())
+
+    def _generacion(self):
+        poblacion_evaluada = self.poblacion_evaluada
+
+        fitness_actual = max(fitness for _, fitness in poblacion_evaluada)
+        self.evolucion_fitness.append(fitness_actual)
+
+        if fitness_actual > self.mejor_fitness:
+            self.mejor_fitness = fitness_actual
+            self.mejor_individuo = poblacion_evaluada[self.poblacion.indice_mejor()][0]
+
+        with self.perfilador.medir("seleccion"):
+            parejas = self.selection_operator.seleccion_por_orden(poblacion_evaluada)
+        with self.perfilador.medir("cruza"):
+            descendencia = self.crossover_operator.cruza_simple(parejas, self.config.prob_cruza)
+
+        with self.perfilador.medir("mutacion"):
+            descendencia_mutada = self.mutation_operator.mutacion_segmento_aleatorio(
+                descendencia, self.config.prob_mutacion
+            )
+
+        if self.loading_operator:
+            with self.perfilador.medir("mejora_local"):
+                descendencia_mutada = self.loading_operator.mejora_local(
+                    descendencia_mutada, self.config.prob_mejora_local
+                )
+
+        with self.perfilador.medir("reparacion"):
+            descendencia_reparada = []
+            for individuo in descendencia_mutada:
+                individuo_reparado = self.repair_operator.reparar_individuo(individuo)
+                descendencia_reparada.append(individuo_reparado)
+
+        with self.perfilador.medir("duplicados"):
+            descendencia_nueva, claves = self.poblacion.filtrar_nuevos(descendencia_reparada)
+        with self.perfilador.medir("evaluacion"):
+            self.poblacion.agregar(self.evaluar_poblacion(descendencia_nueva), claves)
+
+        with self.perfilador.medir("poda"):
+            self.poblacion.conservar(self.pruning_operator.poda_indices_conservando_mejor(
+                [fitness for _, fitness in self.poblacion.evaluados], self.config.poblacion_size,
+                max(1, int(round(self.config.poblacion_size * self.config.elitismo_rate)))
+            ))
+        self.poblacion_evaluada = self.poblacion.evaluados
+        self.evolucion_diversidad.append(self.poblacion.diversidad())
+
+    def fitness_medio(self) -> float:
+        if not self.poblacion_evaluada:
+            return 0.0
+        return sum(fitness for _, fitness in self.poblacion_evaluada) / len(self.poblacion_evaluada)
+
+    def mejores(self, n: int) -> List[tuple]:
+        return sorted(self.poblacion_evaluada, key=lambda x: x[1], reverse=True)[:n]
+
+    def metricas_diversidad(self) -> Dict[str, Any]:
+        return {
+            "final": self.poblacion.diversidad(),
+            "evolucion": self.evolucion_diversidad,
+            "duplicados_descartados": self.poblacion.descartados
+        }
+
+    def incorporar(self, individuos_evaluados: List[tuple]):
+        """Reemplazar a los peores individuos por inmigrantes ya evaluados."""
+        if not individuos_evaluados:
+            return
+
+        inmigrantes, claves = self.poblacion.filtrar_nuevos([individuo for individuo, _ in individuos_evaluados])
+        aptitud = {id(individuo): fitness for individuo, fitness in individuos_evaluados}
+
+        orden = sorted(range(len(self.poblacion)), key=lambda i: self.poblacion.evaluados[i][1], reverse=True)
+        self.poblacion.conservar(orden[:max(0, len(orden) - len(inmigrantes))])
+        self.poblacion.agregar([(individuo, aptitud[id(individuo)]) for individuo in inmigrantes], claves)
+        self.poblacion_evaluada = self.poblacion.evaluados
+
+        for individuo, fitness in individuos_evaluados:
+            if fitness > self.mejor_fitness:
+                self.mejor_fitness = fitness
+                self.mejor_individuo = individuo
+
+    def resultado(self) -> Tuple[Individual, List[tuple]]:
+        top_3 = self.mejores(3)
+        if top_3 and (self.mejor_individuo is None or top_3[0][1] >= self.mejor_fitness):
+            self.mejor_individuo, self.mejor_fitness = top_3[0]
+        return self.mejor_individuo or [], top_3
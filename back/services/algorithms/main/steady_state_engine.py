@@ -0,0 +1,122 @@
+import heapq
+import itertools
+from typing import List, Tuple
+from ..models import Individual
+from .object_engine import ObjectGeneticEngine
+
+
+class SteadyStateGeneticEngine(ObjectGeneticEngine):
+    """Motor de estado estable sobre individuos de AsignacionVehiculo.
+
+    Cada paso elige dos padres por torneo de tamaño k, genera dos hijos y
+    cada hijo reemplaza al peor individuo si lo supera, de modo que los
+    hijos pueden ser padres en el paso siguiente. Una generación son
+    poblacion_size hijos. El peor se obtiene de un montículo de mínimos y
+    la élite (elitismo_rate de la población) vive en un archivo aparte que
+    se reinyecta al cerrar cada generación, así que nunca se pierde. Los
+    hijos idénticos a un miembro de la población se descartan sin evaluarse.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tamaño_elite = max(1, int(round(self.config.poblacion_size * self.config.elitismo_rate)))
+        # (fitness, posición) de cada individuo; la cima es el peor
+        self._peores: List[Tuple[float, int]] = []
+        # (fitness, orden, clave, individuo) de los mejores distintos vistos; la cima es el peor de la élite
+        self._elite: List[tuple] = []
+        self._claves_elite = set()
+        self._orden = itertools.count()
+
+    def inicializar(self):
+        super().inicializar()
+        self._peores = [(fitness, i) for i, (_, fitness) in enumerate(self.poblacion_evaluada)]
+        heapq.heapify(self._peores)
+        self._elite, self._claves_elite = [], set()
+        for posicion, (individuo, fitness) in enumerate(self.poblacion_evaluada):
+            self._archivar(individuo, fitness, self.poblacion.clave(posicion))
+
+    def _generacion(self):
+        fitness_actual = self._elite_maximo()[0] if self._elite else 0.0
+        self.evolucion_fitness.append(fitness_actual)
+
+        if fitness_actual > self.mejor_fitness:
+            self.mejor_fitness = fitness_actual
+            self.mejor_individuo = self._elite_maximo()[3]
+
+        for _ in range(max(1, self.config.poblacion_size // 2)):
+            with self.perfilador.medir("seleccion"):
+                parejas = self.selection_operator.seleccion_por_torneo(
+                    self.poblacion_evaluada, 1, self.config.tamaño_torneo
+                )
+            with self.perfilador.medir("cruza"):
+                hijos = self.crossover_operator.cruza_simple(parejas, self.config.prob_cruza)
+            with self.perfilador.medir("mutacion"):
+                hijos = self.mutation_operator.mutacion_segmento_aleatorio(hijos, self.config.prob_mutacion)
+            if self.loading_operator:
+                with self.perfilador.medir("mejora_local"):
+                    hijos = self.loading_operator.mejora_local(hijos, self.config.prob_mejora_local)
+            with self.perfilador.medir("reparacion"):
+                hijos = [self.repair_operator.reparar_individuo(hijo) for hijo in hijos]
+            with self.perfilador.medir("duplicados"):
+                hijos, claves = self.poblacion.filtrar_nuevos(hijos)
+            with self.perfilador.medir("evaluacion"):
+                hijos_evaluados = self.evaluar_poblacion(hijos)
+
+            with self.perfilador.medir("poda"):
+                for (individuo, fitness), clave in zip(hijos_evaluados, claves):
+                    if len(self.poblacion) < self.config.poblacion_size:
+                        # Huecos de clones descartados al inicializar
+                        heapq.heappush(self._peores, (fitness, len(self.poblacion)))
+                        self.poblacion.agregar([(individuo, fitness)], [clave])
+                    elif fitness > self._peores[0][0]:
+                        self._reemplazar_peor(individuo, fitness, clave)
+                    self._archivar(individuo, fitness, clave)
+
+        with self.perfilador.medir("poda"):
+            self._reinyectar_elite()
+        self.evolucion_diversidad.append(self.poblacion.diversidad())
+
+    def mejores(self, n: int) -> List[tuple]:
+        if n <= len(self._elite):
+            return [(individuo, fitness) for fitness, _, _, individuo in heapq.nlargest(n, self._elite)]
+        return heapq.nlargest(n, self.poblacion_evaluada, key=lambda x: x[1])
+
+    def incorporar(self, individuos_evaluados: List[tuple]):
+        """Reemplazar a los peores individuos por inmigrantes ya evaluados."""
+        aptitud = {id(individuo): fitness for individuo, fitness in individuos_evaluados}
+        inmigrantes, claves = self.poblacion.filtrar_nuevos([individuo for individuo, _ in individuos_evaluados])
+
+        for individuo, clave in list(zip(inmigrantes, claves))[:len(self.poblacion_evaluada)]:
+            fitness = aptitud[id(individuo)]
+            self._reemplazar_peor(individuo, fitness, clave)
+            self._archivar(individuo, fitness, clave)
+            if fitness > self.mejor_fitness:
+                self.mejor_fitness = fitness
+                self.mejor_individuo = individuo
+
+    def _reemplazar_peor(self, individuo: Individual, fitness: float, clave: bytes):
+        _, posicion = heapq.heapreplace(self._peores, (fitness, self._peores[0][1]))
+        self.poblacion.reemplazar(posicion, (individuo, fitness), clave)
+
+    def _archivar(self, individuo: Individual, fitness: float, clave: bytes):
+        if len(self._elite) >= self.tamaño_elite and fitness <= self._elite[0][0]:
+            return
+
+        if clave in self._claves_elite:
+            return
+
+        entrada = (fitness, next(self._orden), clave, individuo)
+        if len(self._elite) < self.tamaño_elite:
+            heapq.heappush(self._elite, entrada)
+        else:
+            self._claves_elite.discard(heapq.heappushpop(self._elite, entrada)[2])
+        self._claves_elite.add(clave)
+
+    def _elite_maximo(self) -> tuple:
+        return max(self._elite)
+
+    def _reinyectar_elite(self):
+        """Devolver a la población los miembros de la élite que hayan sido reemplazados."""
+        for fitness, _, clave, individuo in self._elite:
+            if clave not in self.poblacion:
+                self._reemplazar_peor(individuo, fitness, clave)
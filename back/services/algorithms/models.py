@@ -1,7 +1,11 @@
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
 from enum import Enum
 
+# Cantidades por insumo: enteros sin signo de 16 bits, un elemento por insumo del catálogo
+TIPO_CANTIDAD_INSUMO = 'H'
+
 
 class EstadoRuta(str, Enum):
     ABIERTA = "abierta"
@@ -63,15 +67,30 @@ class TipoDesastre:
     prioridades: List[PrioridadCategoria]
 
 
+def vector_insumos(total_insumos: int, cantidades: Optional[Iterable[int]] = None) -> array:
+    """Vector de cantidades de ancho fijo para AsignacionVehiculo.insumos."""
+    if cantidades is None:
+        return array(TIPO_CANTIDAD_INSUMO, bytes(2 * total_insumos))
+    return array(TIPO_CANTIDAD_INSUMO, cantidades)
+
+
 @dataclass
 class AsignacionVehiculo:
+    __slots__ = ('vehiculo_id', 'ruta_id', 'insumos', 'peso_total_kg', 'distancia_km', 'combustible_usado',
+                 'sucia')
+
     vehiculo_id: int
     ruta_id: int
-    insumos: List[int]
+    insumos: array
     peso_total_kg: float
     distancia_km: float
     combustible_usado: float
 
+    def __post_init__(self):
+        # Peso y combustible pendientes de recalcular por la reparación. Quien
+        # modifique la asignación en sitio debe volver a marcarla.
+        self.sucia = True
+
 
 @dataclass
 class ConfiguracionAG:
@@ -80,6 +99,29 @@ class ConfiguracionAG:
     prob_cruza: float = 0.8
     prob_mutacion: float = 0.1
     elitismo_rate: float = 0.1
+    motor: str = "objetos"
+    cache_fitness: bool = True
+    cache_fitness_max: int = 10000
+    evaluacion_paralela: bool = False
+    procesos_evaluacion: int = 0
+    lote_evaluacion: int = 16
+    islas: int = 1
+    intervalo_migracion: int = 10
+    migrantes: int = 2
+    topologia_migracion: str = "anillo"
+    generaciones_estancamiento: int = 0
+    mejora_minima: float = 0.0
+    fitness_objetivo: Optional[float] = None
+    max_segundos: Optional[float] = None
+    seed: Optional[int] = None
+    perfil: bool = False
+    siembra_mochila: float = 0.2
+    prob_mejora_local: float = 0.1
+    siembra_historial: float = 0.2
+    tamaño_frente: int = 20
+    tamaño_torneo: int = 3
+    siembra_emparejamiento: float = 0.2
+    reinicios: int = 1
 
 
 @dataclass
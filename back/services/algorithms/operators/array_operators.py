@@ -0,0 +1,220 @@
+import numpy as np
+from typing import List, Tuple
+from core.base_service import BaseService
+from ..core.load_kernel import LoadKernel
+from ..core.poblacion_arrays import PoblacionArrays
+from ..models import Ruta
+
+
+class ArraySelectionOperator(BaseService):
+    def __init__(self):
+        super().__init__()
+
+    def seleccion_por_orden(self, fitness: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        orden = np.argsort(-fitness, kind='stable')
+        pares = len(orden) // 2
+
+        padres1 = orden[0:2 * pares:2]
+        padres2 = orden[1:2 * pares:2]
+
+        if len(orden) % 2 != 0:
+            padres1 = np.append(padres1, orden[-1])
+            padres2 = np.append(padres2, orden[0])
+
+        return padres1, padres2
+
+
+class ArrayCrossoverOperator(BaseService):
+    def __init__(self, rng: np.random.Generator):
+        super().__init__()
+        self.rng = rng
+
+    def cruza_simple(self, poblacion: PoblacionArrays, padres1: np.ndarray, padres2: np.ndarray,
+                     prob_cruza: float = 0.8) -> PoblacionArrays:
+        p1 = poblacion.tomar(padres1)
+        p2 = poblacion.tomar(padres2)
+        total_parejas, total_vehiculos = p1.rutas.shape
+
+        cruzar = self.rng.random(total_parejas) < prob_cruza
+        intercambio_rutas = (self.rng.random((total_parejas, total_vehiculos)) < 0.5) & cruzar[:, None]
+        mezcla1 = (self.rng.random(p1.insumos.shape) < 0.5) | ~cruzar[:, None, None]
+        mezcla2 = (self.rng.random(p1.insumos.shape) < 0.5) | ~cruzar[:, None, None]
+
+        hijos1 = PoblacionArrays(
+            rutas=np.where(intercambio_rutas, p2.rutas, p1.rutas),
+            insumos=np.where(mezcla1, p1.insumos, p2.insumos),
+            pesos=np.where(cruzar[:, None], 0.0, p1.pesos)
+        )
+        hijos2 = PoblacionArrays(
+            rutas=np.where(intercambio_rutas, p1.rutas, p2.rutas),
+            insumos=np.where(mezcla2, p2.insumos, p1.insumos),
+            pesos=np.where(cruzar[:, None], 0.0, p2.pesos)
+        )
+
+        return hijos1.concatenar(hijos2)
+
+
+class ArrayMutationOperator(BaseService):
+    def __init__(self, carga: LoadKernel, rng: np.random.Generator):
+        super().__init__()
+        self.carga = carga
+        self.rng = rng
+
+    def mutacion_segmento_aleatorio(self, poblacion: PoblacionArrays,
+                                    prob_mutacion_ind: float = 0.15) -> PoblacionArrays:
+        total_poblacion, total_vehiculos = poblacion.rutas.shape
+        if total_vehiculos <= 1:
+            return poblacion
+
+        mutar = np.nonzero(self.rng.random(total_poblacion) < prob_mutacion_ind)[0]
+
+        for p in mutar:
+            self._mutar_segmento_asignaciones(poblacion, p)
+            self._mutar_insumos_aleatorios(poblacion, p)
+
+        return poblacion
+
+    def _mutar_segmento_asignaciones(self, poblacion: PoblacionArrays, p: int):
+        total_vehiculos = poblacion.rutas.shape[1]
+        longitud_segmento = int(self.rng.integers(2, min(3, total_vehiculos) + 1))
+        pos_inicial = int(self.rng.integers(0, total_vehiculos - longitud_segmento + 1))
+
+        segmento = slice(pos_inicial, pos_inicial + longitud_segmento)
+        permutacion = self.rng.permutation(longitud_segmento)
+
+        poblacion.rutas[p, segmento] = poblacion.rutas[p, segmento][permutacion]
+        poblacion.insumos[p, segmento] = poblacion.insumos[p, segmento][permutacion]
+
+    def _mutar_insumos_aleatorios(self, poblacion: PoblacionArrays, p: int):
+        total_vehiculos, total_insumos = poblacion.insumos.shape[1:]
+        num_asignaciones_mutar = int(self.rng.integers(1, min(3, total_vehiculos) + 1))
+        asignaciones_a_mutar = self.rng.choice(total_vehiculos, num_asignaciones_mutar, replace=False)
+
+        for v in asignaciones_a_mutar:
+            insumos = poblacion.insumos[p, v]
+            capacidad_kg = self.carga.capacidades_kg[v]
+            utilizacion_actual = self.carga.peso(insumos) / capacidad_kg * 100 if capacidad_kg > 0 else 100
+
+            if utilizacion_actual < 50:
+                cantidad = min(int(self.rng.integers(3, 7)), total_insumos)
+                indices = self.rng.choice(total_insumos, cantidad, replace=False)
+                aumentar = self.rng.random(len(indices)) < 0.8
+                incrementos = self.rng.integers(2, 5, len(indices))
+                insumos[indices] = np.where(aumentar, np.minimum(12, insumos[indices] + incrementos),
+                                            np.maximum(0, insumos[indices] - 1))
+
+            elif utilizacion_actual < 70:
+                cantidad = min(int(self.rng.integers(2, 5)), total_insumos)
+                indices = self.rng.choice(total_insumos, cantidad, replace=False)
+                aumentar = self.rng.random(len(indices)) < 0.7
+                incrementos = self.rng.integers(1, 4, len(indices))
+                insumos[indices] = np.where(aumentar, np.minimum(10, insumos[indices] + incrementos),
+                                            np.maximum(0, insumos[indices] - 1))
+
+            elif utilizacion_actual > 95:
+                cantidad = min(int(self.rng.integers(2, 5)), total_insumos)
+                indices = self.rng.choice(total_insumos, cantidad, replace=False)
+                decrementos = self.rng.integers(1, 4, len(indices))
+                insumos[indices] = np.maximum(0, insumos[indices] - decrementos)
+
+            else:
+                cantidad = min(int(self.rng.integers(1, 3)), total_insumos)
+                indices = self.rng.choice(total_insumos, cantidad, replace=False)
+                aumentar = self.rng.random(len(indices)) < 0.5
+                insumos[indices] = np.where(aumentar, np.minimum(8, insumos[indices] + 1),
+                                            np.maximum(0, insumos[indices] - 1))
+
+
+class ArrayRepairOperator(BaseService):
+    def __init__(self, rutas: List[Ruta], carga: LoadKernel,
+                 factibilidad: np.ndarray, rng: np.random.Generator):
+        """factibilidad: (vehiculos, rutas) True si la ruta está abierta y es compatible."""
+        super().__init__()
+        self.rng = rng
+        self.carga = carga
+        self.factibilidad = factibilidad
+
+        self.ids_rutas = np.array([r.id for r in rutas], dtype=np.int64)
+        self._orden_ids = np.argsort(self.ids_rutas, kind='stable')
+        self._ids_ordenados = self.ids_rutas[self._orden_ids]
+
+        self.capacidades_kg = carga.capacidades_kg
+
+    def reparar_poblacion(self, poblacion: PoblacionArrays) -> PoblacionArrays:
+        total_poblacion, total_vehiculos = poblacion.rutas.shape
+        total_rutas = len(self.ids_rutas)
+        if total_poblacion == 0 or total_vehiculos == 0:
+            return poblacion
+
+        indices = self._indices_ruta(poblacion.rutas)
+
+        asignado = indices >= 0
+        columnas = np.where(asignado, indices, 0)
+        valido = asignado & self.factibilidad[np.arange(total_vehiculos)[None, :], columnas]
+
+        filas, vehiculos = np.nonzero(valido)
+        claves = filas * total_rutas + indices[filas, vehiculos]
+        _, primeras = np.unique(claves, return_index=True)
+        unico = np.zeros_like(valido)
+        unico[filas[primeras], vehiculos[primeras]] = True
+
+        indices[~unico] = -1
+
+        for p in np.nonzero((indices < 0).any(axis=1))[0]:
+            self._asignar_vehiculos_libres(poblacion, indices, p)
+
+        asignado = indices >= 0
+        poblacion.rutas = np.where(asignado, self.ids_rutas[np.maximum(indices, 0)], -1)
+        poblacion.insumos[~asignado] = 0
+        poblacion.pesos = self.carga.recortar_matrices(poblacion.insumos, self.capacidades_kg[None, :])
+
+        return poblacion
+
+    def _indices_ruta(self, rutas: np.ndarray) -> np.ndarray:
+        posiciones = np.searchsorted(self._ids_ordenados, rutas)
+        posiciones = np.minimum(posiciones, len(self._ids_ordenados) - 1)
+        coincide = self._ids_ordenados[posiciones] == rutas
+        return np.where(coincide, self._orden_ids[posiciones], -1)
+
+    def _asignar_vehiculos_libres(self, poblacion: PoblacionArrays, indices: np.ndarray, p: int):
+        rutas_usadas = np.zeros(len(self.ids_rutas), dtype=bool)
+        rutas_usadas[indices[p][indices[p] >= 0]] = True
+
+        for v in np.nonzero(indices[p] < 0)[0]:
+            rutas_libres = self.factibilidad[v] & ~rutas_usadas
+            if not rutas_libres.any():
+                continue
+
+            ruta_idx = int(rutas_libres.argmax())
+            rutas_usadas[ruta_idx] = True
+            indices[p, v] = ruta_idx
+            poblacion.insumos[p, v] = self._insumos_optimizados(v, poblacion.insumos.shape[2])
+
+    def _insumos_optimizados(self, v: int, total_insumos: int) -> np.ndarray:
+        capacidad_kg = self.capacidades_kg[v]
+
+        if capacidad_kg >= 2500:
+            objetivo_aprovechamiento = self.rng.uniform(0.85, 0.95)
+            rango_cantidad = (3, 8)
+        elif capacidad_kg >= 1500:
+            objetivo_aprovechamiento = self.rng.uniform(0.80, 0.92)
+            rango_cantidad = (2, 6)
+        else:
+            objetivo_aprovechamiento = self.rng.uniform(0.75, 0.88)
+            rango_cantidad = (1, 4)
+
+        insumos = np.zeros(total_insumos, dtype=np.int64)
+        if total_insumos == 0:
+            return insumos
+
+        peso_objetivo = capacidad_kg * objetivo_aprovechamiento
+        peso_promedio_insumo = self.carga.peso_medio_kg or 1.0
+
+        cantidad_insumos_activos = min(total_insumos, int(self.rng.integers(8, 16)))
+        indices_activos = self.rng.choice(total_insumos, cantidad_insumos_activos, replace=False)
+
+        cantidad_base = int(peso_objetivo / cantidad_insumos_activos / peso_promedio_insumo)
+        variacion = self.rng.integers(rango_cantidad[0], rango_cantidad[1] + 1, cantidad_insumos_activos)
+        insumos[indices_activos] = np.maximum(1, cantidad_base + variacion)
+
+        return insumos
@@ -0,0 +1,101 @@
+import numpy as np
+from typing import List, Optional
+from core.base_service import BaseService
+from ..core.asignacion_optima import asignacion_minima
+from ..core.compatibility_index import CompatibilityIndex
+from ..models import Ruta
+
+# Pesos del costo de asignar un vehículo a una ruta (la cobertura vale 1)
+PESO_COMBUSTIBLE = 0.3
+PESO_POBLACION = 0.3
+# Ruido uniforme añadido a los costos al diversificar un emparejamiento
+RUIDO_EMPAREJAMIENTO = 0.3
+# Fracción de vehículos que se liberan y reasignan en cada emparejamiento diversificado
+FRACCION_LIBERADA = 0.25
+COSTO_PROHIBIDO = 1e6
+
+
+class AssignmentSeedingOperator(BaseService):
+    """Emparejamientos vehículo-ruta de costo mínimo para sembrar la población.
+
+    El costo de una pareja compatible y abierta es -1 (una ruta cubierta)
+    más el combustible normalizado (distancia por consumo_litros_km) menos
+    capacidad por población normalizadas, de modo que los vehículos grandes
+    van a las localidades más pobladas. Cada vehículo tiene además una
+    columna de espera de costo 0, así que el emparejamiento cubre tantas
+    rutas como sea posible. El primero es el óptimo exacto; cada uno de los
+    siguientes libera una fracción aleatoria de vehículos del óptimo y los
+    reasigna, con ruido en los costos, entre sus rutas y las que quedaron
+    libres. Así se obtienen soluciones casi óptimas distintas resolviendo
+    sólo subproblemas pequeños.
+    """
+
+    def __init__(self, rutas: List[Ruta], vehiculos_expandidos: List[dict], compatibilidad: CompatibilityIndex,
+                 rng: Optional[np.random.Generator] = None):
+        super().__init__()
+        self.rng = rng or np.random.default_rng()
+        self.rutas = rutas
+        self.costos = self._matriz_costos(rutas, vehiculos_expandidos, compatibilidad.matriz_factibilidad)
+        self.factibles = compatibilidad.matriz_factibilidad
+
+    @staticmethod
+    def _matriz_costos(rutas: List[Ruta], vehiculos_expandidos: List[dict], factibles: np.ndarray) -> np.ndarray:
+        distancias = np.array([ruta.distancia_km for ruta in rutas], dtype=np.float64)
+        poblaciones = np.array([ruta.localidad.poblacion for ruta in rutas], dtype=np.float64)
+        consumos = np.array([v['consumo_litros_km'] for v in vehiculos_expandidos], dtype=np.float64)
+        capacidades = np.array([v['maximo_peso_ton'] for v in vehiculos_expandidos], dtype=np.float64)
+
+        combustible = np.outer(consumos, distancias)
+        maximo_combustible = combustible[factibles].max() if factibles.any() else 0.0
+        if maximo_combustible > 0:
+            combustible /= maximo_combustible
+        atencion = np.outer(capacidades / max(capacidades.max(initial=0.0), 1e-9),
+                            poblaciones / max(poblaciones.max(initial=0.0), 1e-9))
+
+        costos = -1.0 + PESO_COMBUSTIBLE * combustible - PESO_POBLACION * atencion
+        return np.where(factibles, costos, COSTO_PROHIBIDO)
+
+    def emparejamientos(self, cantidad: int) -> List[List[int]]:
+        """Hasta `cantidad` emparejamientos distintos como ruta_id por vehículo (-1 en espera)."""
+        total_vehiculos = self.costos.shape[0]
+        if cantidad <= 0 or total_vehiculos == 0:
+            return []
+
+        optimo = self._resolver(self.costos)
+        resultado, vistos = [self._rutas_id(optimo)], {tuple(optimo)}
+        liberados = max(1, int(round(total_vehiculos * FRACCION_LIBERADA)))
+
+        for _ in range(3 * (cantidad - 1)):
+            if len(resultado) >= cantidad:
+                break
+            columnas = self._diversificar(optimo, liberados)
+            if tuple(columnas) not in vistos:
+                vistos.add(tuple(columnas))
+                resultado.append(self._rutas_id(columnas))
+        return resultado
+
+    def _diversificar(self, optimo: np.ndarray, liberados: int) -> np.ndarray:
+        filas = self.rng.choice(len(optimo), size=liberados, replace=False)
+        ocupadas = np.zeros(len(self.rutas), dtype=bool)
+        ocupadas[optimo[optimo >= 0]] = True
+        ocupadas[optimo[filas][optimo[filas] >= 0]] = False
+        libres = np.flatnonzero(~ocupadas)
+
+        subcostos = self.costos[np.ix_(filas, libres)]
+        subcostos = subcostos + self.rng.uniform(0.0, RUIDO_EMPAREJAMIENTO, subcostos.shape)
+        subcostos[~self.factibles[np.ix_(filas, libres)]] = COSTO_PROHIBIDO
+
+        columnas = optimo.copy()
+        columnas[filas] = [libres[j] if j >= 0 else -1 for j in self._resolver(subcostos).tolist()]
+        return columnas
+
+    def _resolver(self, costos: np.ndarray) -> np.ndarray:
+        """Columna asignada a cada fila, o -1 si queda en espera o sólo tiene rutas prohibidas."""
+        filas, total_columnas = costos.shape
+        columnas = asignacion_minima(np.hstack([costos, np.zeros((filas, filas))]))
+        prohibidas = np.array([j >= total_columnas or costos[i, j] >= COSTO_PROHIBIDO
+                               for i, j in enumerate(columnas.tolist())], dtype=bool)
+        return np.where(prohibidas, -1, columnas)
+
+    def _rutas_id(self, columnas: np.ndarray) -> List[int]:
+        return [self.rutas[j].id if j >= 0 else -1 for j in columnas.tolist()]
@@ -1,17 +1,40 @@
-from typing import List, Dict, Any
+import numpy as np
+from array import array
+from typing import List, Dict, Any, Optional
 from core.base_service import BaseService
+from ..core.load_kernel import LoadKernel
 from ..models import Individual, AsignacionVehiculo, Insumo, TipoDesastre
 
+# Objetivos que combina el fitness, en el orden de las columnas de objetivos_matrices
+OBJETIVOS = ("cobertura_rutas", "eficiencia_vehiculos", "diversidad_insumos", "prioridad_insumos")
+PESOS_OBJETIVOS = (0.3, 0.25, 0.2, 0.25)
+
 class EvaluationOperator(BaseService):    
-    def __init__(self, rutas: List, tipo_desastre: TipoDesastre, insumos: List[Insumo]):
+    def __init__(self, rutas: List, tipo_desastre: TipoDesastre, insumos: List[Insumo],
+                 vehiculos_expandidos: List[dict], carga: Optional[LoadKernel] = None):
         super().__init__()
         self.rutas = rutas
         self.tipo_desastre = tipo_desastre
         self.insumos = insumos
+        self.carga = carga or LoadKernel(insumos, vehiculos_expandidos)
         
         self.prioridades_categoria = {}
         for prioridad in tipo_desastre.prioridades:
             self.prioridades_categoria[prioridad.categoria] = prioridad.nivel.value
+        
+        self._preparar_vectores_insumos()
+    
+    def _preparar_vectores_insumos(self):
+        self.vector_peso_prioridad = np.array([
+            self._calcular_peso_prioridad(self.prioridades_categoria.get(insumo.categoria, 'baja'))
+            for insumo in self.insumos
+        ], dtype=np.int64)
+        
+        ids_unicos = sorted(set(insumo.id for insumo in self.insumos))
+        columna_id = {insumo_id: j for j, insumo_id in enumerate(ids_unicos)}
+        self.matriz_ids_insumos = np.zeros((len(self.insumos), len(ids_unicos)), dtype=np.int64)
+        for i, insumo in enumerate(self.insumos):
+            self.matriz_ids_insumos[i, columna_id[insumo.id]] = 1
     
     def evaluar_individuo(self, individuo: Individual) -> float:
         if not individuo:
@@ -43,6 +66,136 @@ class EvaluationOperator(BaseService):
             self.log_error(f"Error evaluando individuo", e)
             return 0.0
     
+    def evaluar_poblacion(self, poblacion: List[Individual]) -> List[float]:
+        """Evaluar una población completa en una sola llamada vectorizada.
+
+        El resultado es idéntico bit a bit al de evaluar_individuo; los individuos
+        cuyos insumos no son vectores de cantidades se evalúan por la vía escalar.
+        """
+        resultados = [0.0] * len(poblacion)
+        vectorizables = []
+        
+        for i, individuo in enumerate(poblacion):
+            if not individuo:
+                continue
+            if self._es_vectorizable(individuo):
+                vectorizables.append(i)
+            else:
+                resultados[i] = self.evaluar_individuo(individuo)
+        
+        if not vectorizables:
+            return resultados
+        
+        try:
+            rutas, insumos, pesos, longitudes, capacidades = self._empaquetar_individuos(
+                [poblacion[i] for i in vectorizables]
+            )
+            fitness = self.evaluar_matrices(rutas, insumos, pesos, longitudes, capacidades)
+            
+            for i, valor in zip(vectorizables, fitness.tolist()):
+                resultados[i] = valor
+                
+        except Exception as e:
+            self.log_error("Error en evaluación vectorizada, usando evaluación escalar", e)
+            for i in vectorizables:
+                resultados[i] = self.evaluar_individuo(poblacion[i])
+        
+        return resultados
+    
+    def _es_vectorizable(self, individuo: Individual) -> bool:
+        total_insumos = len(self.insumos)
+        for asignacion in individuo:
+            if not isinstance(asignacion.insumos, array) or len(asignacion.insumos) != total_insumos:
+                return False
+        return True
+    
+    def _empaquetar_individuos(self, individuos: List[Individual]) -> tuple:
+        total_insumos = len(self.insumos)
+        longitudes = np.array([len(individuo) for individuo in individuos], dtype=np.int64)
+        longitud_maxima = int(longitudes.max())
+        
+        rutas = np.empty((len(individuos), longitud_maxima), dtype=np.int64)
+        pesos = np.zeros((len(individuos), longitud_maxima), dtype=np.float64)
+        capacidades = np.ones((len(individuos), longitud_maxima), dtype=np.float64)
+        insumos = np.zeros((len(individuos), longitud_maxima, total_insumos), dtype=np.int64)
+        
+        for fila, individuo in enumerate(individuos):
+            k = len(individuo)
+            rutas[fila, :k] = [asig.ruta_id for asig in individuo]
+            rutas[fila, k:] = individuo[0].ruta_id
+            pesos[fila, :k] = [asig.peso_total_kg for asig in individuo]
+            capacidades[fila, :k] = [self.carga.capacidad(asig.vehiculo_id) for asig in individuo]
+            insumos[fila, :k] = np.frombuffer(
+                b"".join([asig.insumos.tobytes() for asig in individuo]), dtype=np.uint16
+            ).reshape(k, total_insumos)
+        
+        return rutas, insumos, pesos, longitudes, capacidades
+    
+    def evaluar_matrices(self, rutas: np.ndarray, insumos: np.ndarray, pesos: np.ndarray,
+                         longitudes: Optional[np.ndarray] = None,
+                         capacidades: Optional[np.ndarray] = None) -> np.ndarray:
+        """Fitness de una población completa en representación de arrays.
+
+        Reproduce exactamente evaluar_individuo: rutas (pop, vehiculos),
+        insumos (pop, vehiculos, n) y pesos (pop, vehiculos). Con longitudes,
+        las posiciones de relleno deben repetir una ruta de la fila y tener peso 0.
+        Sin capacidades, la columna v corresponde al vehículo expandido v.
+        """
+        objetivos = self.objetivos_matrices(rutas, insumos, pesos, longitudes, capacidades)
+        return self.combinar_objetivos(objetivos)
+    
+    @staticmethod
+    def combinar_objetivos(objetivos: np.ndarray) -> np.ndarray:
+        """Suma ponderada de las columnas de objetivos (pop, 4), acotada a [0, 1]."""
+        fitness = (
+            objetivos[:, 0] * PESOS_OBJETIVOS[0] +
+            objetivos[:, 1] * PESOS_OBJETIVOS[1] +
+            objetivos[:, 2] * PESOS_OBJETIVOS[2] +
+            objetivos[:, 3] * PESOS_OBJETIVOS[3]
+        )
+        
+        return np.clip(fitness, 0.0, 1.0)
+    
+    def objetivos_matrices(self, rutas: np.ndarray, insumos: np.ndarray, pesos: np.ndarray,
+                           longitudes: Optional[np.ndarray] = None,
+                           capacidades: Optional[np.ndarray] = None) -> np.ndarray:
+        """Objetivos sin ponderar (pop, 4), en el orden de OBJETIVOS; mayor es mejor."""
+        total_poblacion, total_vehiculos = rutas.shape
+        if total_poblacion == 0 or total_vehiculos == 0:
+            return np.zeros((total_poblacion, len(OBJETIVOS)), dtype=np.float64)
+        
+        if longitudes is None:
+            longitudes = total_vehiculos
+        if capacidades is None:
+            capacidades = self.carga.capacidades_kg[None, :total_vehiculos]
+        
+        total_insumos = len(self.insumos)
+        cantidades = insumos[:, :, :total_insumos]
+        cantidades_positivas = np.where(cantidades > 0, cantidades, 0).astype(np.int64)
+        
+        rutas_ordenadas = np.sort(rutas, axis=1)
+        rutas_distintas = 1 + np.count_nonzero(np.diff(rutas_ordenadas, axis=1), axis=1)
+        cobertura_rutas = rutas_distintas / max(1, len(self.rutas))
+        
+        eficiencia = LoadKernel.eficiencia(pesos, capacidades)
+        eficiencia_vehiculos = np.cumsum(eficiencia, axis=1)[:, -1] / longitudes
+        
+        insumos_presentes = (cantidades_positivas > 0).any(axis=1).astype(np.int64)
+        ids_presentes = np.count_nonzero(insumos_presentes @ self.matriz_ids_insumos, axis=1)
+        diversidad_insumos = ids_presentes / max(1, total_insumos)
+        
+        total_items = cantidades_positivas.sum(axis=(1, 2))
+        puntuacion_total = (cantidades_positivas * self.vector_peso_prioridad).sum(axis=(1, 2))
+        prioridad_insumos = np.where(
+            total_items > 0,
+            (puntuacion_total.astype(np.float64) / np.maximum(total_items, 1)) / 3.0,
+            0.0
+        )
+        
+        return np.stack(
+            [cobertura_rutas, eficiencia_vehiculos, diversidad_insumos, prioridad_insumos], axis=1
+        ).astype(np.float64)
+    
     def _evaluar_cobertura_rutas(self, asignaciones: List[AsignacionVehiculo]) -> float:
         if not asignaciones:
             return 0.0
@@ -60,12 +213,14 @@ class EvaluationOperator(BaseService):
         
         for asignacion in asignaciones:
             peso_total = asignacion.peso_total_kg
-            capacidad_maxima = 1000.0
+            capacidad_maxima = self.carga.capacidad(asignacion.vehiculo_id)
             
             if peso_total > capacidad_maxima:
                 eficiencia = 0.1
-            else:
+            elif capacidad_maxima > 0:
                 eficiencia = min(1.0, peso_total / capacidad_maxima)
+            else:
+                eficiencia = 0.0
             
             eficiencia_total += eficiencia
         
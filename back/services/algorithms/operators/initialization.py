@@ -1,15 +1,23 @@
 import random
-from typing import List
+import numpy as np
+from array import array
+from typing import List, Optional
 from core.base_service import BaseService
-from ..models import Individual, AsignacionVehiculo, Ruta, VehiculoDisponible, Insumo
+from ..core.compatibility_index import CompatibilityIndex
+from ..core.load_kernel import LoadKernel
+from .assignment_seeding import AssignmentSeedingOperator
+from ..models import Individual, AsignacionVehiculo, Ruta, VehiculoDisponible, Insumo, vector_insumos
 
 class InitializationOperator(BaseService): 
-    def __init__(self, rutas: List[Ruta], vehiculos_disponibles: List[VehiculoDisponible], insumos: List[Insumo]):
+    def __init__(self, rutas: List[Ruta], vehiculos_disponibles: List[VehiculoDisponible], insumos: List[Insumo],
+                 rng: Optional[random.Random] = None, compatibilidad: Optional[CompatibilityIndex] = None,
+                 carga: Optional[LoadKernel] = None, fraccion_emparejamiento: float = 0.0):
         super().__init__()
+        self.rng = rng or random.Random()
         self.rutas = rutas
         self.vehiculos_disponibles = vehiculos_disponibles
         self.insumos = insumos
-        self.TOTAL_INSUMOS = 25 
+        self.TOTAL_INSUMOS = len(insumos)
 
         self.vehiculos_expandidos = []
         vehiculo_id = 0
@@ -24,26 +32,61 @@ class InitializationOperator(BaseService):
                     'velocidad_kmh': getattr(vehiculo_disp.vehiculo, 'velocidad_kmh', 65)
                 })
                 vehiculo_id += 1
+        
+        self.compatibilidad = compatibilidad or CompatibilityIndex(rutas, self.vehiculos_expandidos)
+        self.carga = carga or LoadKernel(insumos, self.vehiculos_expandidos)
+        self._insumos_por_peso = sorted(range(self.TOTAL_INSUMOS), key=lambda i: self.insumos[i].peso_kg)
+        # Individuos ya reparados (p. ej. de ejecuciones previas) que ocupan el final de la población
+        self.individuos_semilla: List[Individual] = []
+        # Fracción de la población sembrada con emparejamientos de costo mínimo
+        self.fraccion_emparejamiento = fraccion_emparejamiento
+        self._emparejador: Optional[AssignmentSeedingOperator] = None
     
     def generar_poblacion_inicial(self, tamaño_poblacion: int) -> List[Individual]:
         poblacion = []
+        semillas = self.individuos_semilla[:tamaño_poblacion]
+        libres = tamaño_poblacion - len(semillas)
+        emparejados = self._generar_individuos_emparejados(
+            min(libres, int(round(tamaño_poblacion * self.fraccion_emparejamiento)))
+        )
         
-        for _ in range(tamaño_poblacion):
+        poblacion.extend(emparejados)
+        for _ in range(libres - len(emparejados)):
             individuo = self._generar_individuo_aleatorio()
             poblacion.append(individuo)
         
+        poblacion.extend(semillas)
         return poblacion
     
+    def _generar_individuos_emparejados(self, cantidad: int) -> List[Individual]:
+        if cantidad <= 0:
+            return []
+        
+        if self._emparejador is None:
+            self._emparejador = AssignmentSeedingOperator(
+                self.rutas, self.vehiculos_expandidos, self.compatibilidad,
+                np.random.default_rng(self.rng.randrange(2 ** 32))
+            )
+        
+        rutas_por_id = {ruta.id: ruta for ruta in self.rutas}
+        return [
+            [
+                self._crear_asignacion_con_ruta(vehiculo, rutas_por_id[ruta_id]) if ruta_id != -1
+                else self._crear_asignacion_standby(vehiculo)
+                for vehiculo, ruta_id in zip(self.vehiculos_expandidos, emparejamiento)
+            ]
+            for emparejamiento in self._emparejador.emparejamientos(cantidad)
+        ]
+    
     def _generar_individuo_aleatorio(self) -> Individual:
         asignaciones = []
         rutas_usadas = set()
         
         for vehiculo in self.vehiculos_expandidos:
             ruta_asignada = None
-            rutas_disponibles = [r for r in self.rutas if r.id not in rutas_usadas]
             
-            for ruta in rutas_disponibles:
-                if self._es_compatible_vehiculo_ruta(vehiculo, ruta):
+            for ruta in self.compatibilidad.rutas_compatibles(vehiculo['id']):
+                if ruta.id not in rutas_usadas:
                     ruta_asignada = ruta
                     rutas_usadas.add(ruta.id)
                     break
@@ -60,9 +103,7 @@ class InitializationOperator(BaseService):
     def _crear_asignacion_con_ruta(self, vehiculo: dict, ruta: Ruta) -> AsignacionVehiculo:
         cantidades_insumos = self._generar_cantidades_optimizadas(vehiculo)
         
-        peso_total = sum(cantidad * self.insumos[i].peso_kg 
-                        for i, cantidad in enumerate(cantidades_insumos) 
-                        if i < len(self.insumos))
+        peso_total = self.carga.peso(cantidades_insumos)
         
         velocidad = vehiculo.get('velocidad_kmh', 65)
         combustible = ruta.distancia_km * vehiculo['consumo_litros_km']
@@ -77,7 +118,7 @@ class InitializationOperator(BaseService):
         )
     
     def _crear_asignacion_standby(self, vehiculo: dict) -> AsignacionVehiculo:
-        cantidades_insumos = [0] * self.TOTAL_INSUMOS
+        cantidades_insumos = vector_insumos(self.TOTAL_INSUMOS)
         
         return AsignacionVehiculo(
             vehiculo_id=vehiculo['id'],
@@ -88,27 +129,21 @@ class InitializationOperator(BaseService):
             combustible_usado=0
         )
     
-    def _generar_cantidades_optimizadas(self, vehiculo: dict) -> List[int]:
-        cantidades = [0] * self.TOTAL_INSUMOS
+    def _generar_cantidades_optimizadas(self, vehiculo: dict) -> array:
+        cantidades = vector_insumos(self.TOTAL_INSUMOS)
         capacidad_kg = vehiculo['maximo_peso_ton'] * 1000
         peso_actual = 0.0
         
         if capacidad_kg >= 2500:
-            objetivo_utilizacion = random.uniform(0.85, 0.95)
+            objetivo_utilizacion = self.rng.uniform(0.85, 0.95)
         elif capacidad_kg >= 1500:
-            objetivo_utilizacion = random.uniform(0.80, 0.92)
+            objetivo_utilizacion = self.rng.uniform(0.80, 0.92)
         else:
-            objetivo_utilizacion = random.uniform(0.75, 0.88)
+            objetivo_utilizacion = self.rng.uniform(0.75, 0.88)
         
         objetivo_peso = capacidad_kg * objetivo_utilizacion
         
-        insumos_ordenados = list(range(min(self.TOTAL_INSUMOS, len(self.insumos))))
-        insumos_ordenados.sort(key=lambda i: self.insumos[i].peso_kg if i < len(self.insumos) else 999)
-        
-        for i in insumos_ordenados:
-            if i >= len(self.insumos):
-                continue
-                
+        for i in self._insumos_por_peso:
             insumo = self.insumos[i]
             peso_disponible = objetivo_peso - peso_actual
             
@@ -120,7 +155,7 @@ class InitializationOperator(BaseService):
             if max_cantidad_por_peso > 0:
                 probabilidad_inclusion = 0.85 if insumo.peso_kg <= 3.0 else 0.65
                 
-                if random.random() < probabilidad_inclusion:
+                if self.rng.random() < probabilidad_inclusion:
                     if capacidad_kg >= 2500:
                         cantidad_max = min(max_cantidad_por_peso, 20)
                     elif capacidad_kg >= 1500:
@@ -128,7 +163,7 @@ class InitializationOperator(BaseService):
                     else:
                         cantidad_max = min(max_cantidad_por_peso, 10)
                     
-                    cantidad = random.randint(1, max(1, cantidad_max))
+                    cantidad = self.rng.randint(1, max(1, cantidad_max))
                     peso_insumo = cantidad * insumo.peso_kg
                     
                     if peso_actual + peso_insumo <= capacidad_kg:
@@ -152,12 +187,3 @@ class InitializationOperator(BaseService):
                             peso_actual += cantidad_adicional * insumo.peso_kg
         
         return cantidades
-    
-    def _es_compatible_vehiculo_ruta(self, vehiculo: dict, ruta: Ruta) -> bool:
-        if not ruta.vehiculos_permitidos:
-            return True
-        
-        tipo_vehiculo = vehiculo['tipo'].lower()
-        return any(tipo_permitido.lower() in tipo_vehiculo or 
-                  tipo_vehiculo in tipo_permitido.lower() 
-                  for tipo_permitido in ruta.vehiculos_permitidos)
\ No newline at end of file
@@ -0,0 +1,138 @@
+import math
+import random
+import numpy as np
+from array import array
+from functools import lru_cache
+from typing import List, Optional, Tuple
+from core.base_service import BaseService
+from ..core.load_kernel import LoadKernel
+from ..core.poblacion_arrays import PoblacionArrays
+from ..models import Individual, Insumo, TipoDesastre, vector_insumos
+
+PESOS_PRIORIDAD = {'alta': 3.0, 'media': 2.0, 'baja': 1.0}
+
+# Celdas máximas de la tabla de programación dinámica por capacidad
+CELDAS_MAXIMAS_DP = 20000
+
+
+@lru_cache(maxsize=256)
+def _mochila_acotada(pesos: Tuple[int, ...], valores: Tuple[float, ...], cotas: Tuple[int, ...],
+                     capacidad: int) -> Tuple[int, ...]:
+    """Mochila acotada por programación dinámica con descomposición binaria.
+
+    pesos y capacidad están en unidades enteras; devuelve la cantidad de
+    cada artículo. La caché es por proceso, así que escenarios con el mismo
+    catálogo, desastre y clase de capacidad reutilizan la solución.
+    """
+    piezas = []
+    for i, (peso, valor, cota) in enumerate(zip(pesos, valores, cotas)):
+        multiplicador = 1
+        while cota > 0 and peso <= capacidad:
+            k = min(multiplicador, cota)
+            piezas.append((i, k, peso * k, valor * k))
+            cota -= k
+            multiplicador *= 2
+
+    mejor = np.zeros(capacidad + 1, dtype=np.float64)
+    tomadas = np.zeros((len(piezas), capacidad + 1), dtype=bool)
+
+    for fila, (_, _, peso, valor) in enumerate(piezas):
+        candidato = mejor[:-peso] + valor
+        destino = mejor[peso:]
+        mejora = candidato > destino
+        tomadas[fila, peso:] = mejora
+        mejor[peso:] = np.where(mejora, candidato, destino)
+
+    cantidades = [0] * len(pesos)
+    restante = capacidad
+    for fila in range(len(piezas) - 1, -1, -1):
+        if tomadas[fila, restante]:
+            i, k, peso, _ = piezas[fila]
+            cantidades[i] += k
+            restante -= peso
+
+    return tuple(cantidades)
+
+
+class KnapsackLoadingOperator(BaseService):
+    """Carga de vehículos por mochila acotada ponderada por prioridad.
+
+    El valor de cada unidad es el peso de prioridad de su categoría para el
+    desastre (alta 3, media 2, baja 1). Cada insumo puede ocupar como mucho
+    2/n de la capacidad, de modo que la carga llena el vehículo sin
+    concentrarse en un único artículo. Se usa para sembrar la población
+    inicial y como paso de mejora local sobre la descendencia.
+    """
+
+    def __init__(self, insumos: List[Insumo], tipo_desastre: TipoDesastre, carga: LoadKernel,
+                 rng: Optional[random.Random] = None):
+        super().__init__()
+        self.rng = rng or random.Random()
+        self.carga = carga
+        self.total_insumos = len(insumos)
+
+        prioridades = {p.categoria: p.nivel.value for p in tipo_desastre.prioridades}
+        self.valores = tuple(PESOS_PRIORIDAD.get(prioridades.get(insumo.categoria, 'baja'), 1.0)
+                             for insumo in insumos)
+        self._cargas = {}
+
+    def carga_optima(self, capacidad_kg: float) -> array:
+        """Cantidades óptimas para un vehículo de la capacidad dada (copia nueva)."""
+        if capacidad_kg not in self._cargas:
+            self._cargas[capacidad_kg] = self._resolver(capacidad_kg)
+        return self._cargas[capacidad_kg][:]
+
+    def _resolver(self, capacidad_kg: float) -> array:
+        if capacidad_kg <= 0 or not self.total_insumos:
+            return vector_insumos(self.total_insumos)
+
+        resolucion = max(0.1, capacidad_kg / CELDAS_MAXIMAS_DP)
+        # Redondear hacia arriba el peso garantiza no exceder la capacidad real
+        pesos = tuple(max(1, math.ceil(peso / resolucion - 1e-9)) for peso in self.carga.vector_peso_kg)
+        cuota_kg = 2 * capacidad_kg / self.total_insumos
+        cotas = tuple(min(0xFFFF, max(1, int(cuota_kg // peso))) if peso > 0 else 0
+                      for peso in self.carga.vector_peso_kg)
+
+        cantidades = _mochila_acotada(pesos, self.valores, cotas, int(capacidad_kg // resolucion))
+        return vector_insumos(self.total_insumos, cantidades)
+
+    def sembrar(self, poblacion: List[Individual], fraccion: float, semillas: int = 0) -> List[Individual]:
+        """Cargar por mochila las asignaciones de la primera fracción de la población.
+
+        Las `semillas` últimas posiciones (individuos sembrados desde fuera) no se tocan.
+        """
+        limite = min(int(round(len(poblacion) * fraccion)), max(0, len(poblacion) - semillas))
+        for individuo in poblacion[:limite]:
+            for asignacion in individuo:
+                if asignacion.ruta_id != -1:
+                    self._cargar(asignacion)
+        return poblacion
+
+    def mejora_local(self, poblacion: List[Individual], prob_mejora: float) -> List[Individual]:
+        """Con probabilidad prob_mejora, cargar óptimamente una asignación al azar del individuo."""
+        if prob_mejora <= 0:
+            return poblacion
+        for individuo in poblacion:
+            if self.rng.random() >= prob_mejora:
+                continue
+            con_ruta = [asignacion for asignacion in individuo if asignacion.ruta_id != -1]
+            if con_ruta:
+                self._cargar(self.rng.choice(con_ruta))
+        return poblacion
+
+    def mejora_local_arrays(self, poblacion: PoblacionArrays, prob_mejora: float,
+                            rng: np.random.Generator) -> PoblacionArrays:
+        if prob_mejora <= 0:
+            return poblacion
+        for p in np.nonzero(rng.random(len(poblacion)) < prob_mejora)[0]:
+            con_ruta = np.nonzero(poblacion.rutas[p] >= 0)[0]
+            if len(con_ruta):
+                v = int(rng.choice(con_ruta))
+                poblacion.insumos[p, v] = self.carga_optima(float(self.carga.capacidades_kg[v]))
+        return poblacion
+
+    def _cargar(self, asignacion) -> None:
+        capacidad_kg = self.carga.capacidad(asignacion.vehiculo_id)
+        asignacion.insumos = self.carga_optima(capacidad_kg)
+        asignacion.peso_total_kg = self.carga.peso(asignacion.insumos)
+        asignacion.sucia = True
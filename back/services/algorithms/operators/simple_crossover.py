@@ -1,17 +1,19 @@
 import random
-from typing import List, Tuple
+from array import array
+from typing import List, Tuple, Optional
 from core.base_service import BaseService
 from ..models import Individual, AsignacionVehiculo
 
 class SimpleCrossoverOperator(BaseService):  
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         super().__init__()
+        self.rng = rng or random.Random()
     
     def cruza_simple(self, parejas: List[Tuple[Individual, Individual]], prob_cruza: float = 0.8) -> List[Individual]:
         descendencia = []
         
         for padre1, padre2 in parejas:
-            if random.random() < prob_cruza:
+            if self.rng.random() < prob_cruza:
                 hijo1, hijo2 = self._cruzar_individuos_simple(padre1, padre2)
                 descendencia.extend([hijo1, hijo2])
             else:
@@ -33,7 +35,7 @@ class SimpleCrossoverOperator(BaseService):
             asig2 = padre2_ext[i] if i < len(padre2_ext) else None
             
             if asig1 and asig2:
-                if random.random() < 0.5:
+                if self.rng.random() < 0.5:
 
                     nueva_asig1 = AsignacionVehiculo(
                         vehiculo_id=asig1.vehiculo_id,
@@ -82,18 +84,12 @@ class SimpleCrossoverOperator(BaseService):
         
         return hijo1, hijo2
     
-    def _mezclar_insumos(self, insumos1: List[int], insumos2: List[int]) -> List[int]:
-        TOTAL_INSUMOS = 25
+    def _mezclar_insumos(self, insumos1: array, insumos2: array) -> array:
+        resultado = insumos1[:]
         
-        insumos1_completo = (insumos1 + [0] * TOTAL_INSUMOS)[:TOTAL_INSUMOS]
-        insumos2_completo = (insumos2 + [0] * TOTAL_INSUMOS)[:TOTAL_INSUMOS]
-        
-        resultado = []
-        for i in range(TOTAL_INSUMOS):
-            if random.random() < 0.5:
-                resultado.append(insumos1_completo[i])
-            else:
-                resultado.append(insumos2_completo[i])
+        for i in range(len(resultado)):
+            if self.rng.random() >= 0.5:
+                resultado[i] = insumos2[i]
         
         return resultado
     
@@ -104,7 +100,7 @@ class SimpleCrossoverOperator(BaseService):
         individuo_extendido = individuo.copy()
         while len(individuo_extendido) < tamaño_objetivo:
             if individuo:
-                asig_copia = self._clonar_asignacion(random.choice(individuo))
+                asig_copia = self._clonar_asignacion(self.rng.choice(individuo))
                 individuo_extendido.append(asig_copia)
             else:
                 break
@@ -115,11 +111,13 @@ class SimpleCrossoverOperator(BaseService):
         return [self._clonar_asignacion(asig) for asig in individuo]
     
     def _clonar_asignacion(self, asignacion: AsignacionVehiculo) -> AsignacionVehiculo:
-        return AsignacionVehiculo(
+        clon = AsignacionVehiculo(
             vehiculo_id=asignacion.vehiculo_id,
             ruta_id=asignacion.ruta_id,
-            insumos=asignacion.insumos.copy() if asignacion.insumos else [],
+            insumos=asignacion.insumos[:],
             peso_total_kg=asignacion.peso_total_kg,
             distancia_km=asignacion.distancia_km,
             combustible_usado=asignacion.combustible_usado
-        )
\ No newline at end of file
+        )
+        clon.sucia = asignacion.sucia
+        return clon
\ No newline at end of file
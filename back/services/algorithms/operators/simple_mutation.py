@@ -1,15 +1,18 @@
 import random
-from typing import List
+from typing import List, Optional
 from core.base_service import BaseService
+from ..core.load_kernel import LoadKernel
 from ..models import Individual, AsignacionVehiculo
 
 class SimpleMutationOperator(BaseService):
-    def __init__(self):
+    def __init__(self, carga: LoadKernel, rng: Optional[random.Random] = None):
         super().__init__()
+        self.carga = carga
+        self.rng = rng or random.Random()
     
     def mutacion_segmento_aleatorio(self, poblacion: List[Individual], prob_mutacion_ind: float = 0.15) -> List[Individual]:
         for i in range(len(poblacion)):
-            if random.random() < prob_mutacion_ind:
+            if self.rng.random() < prob_mutacion_ind:
                 individuo = poblacion[i]
                 if len(individuo) <= 1:
                     continue
@@ -25,17 +28,17 @@ class SimpleMutationOperator(BaseService):
             return individuo
         
         max_longitud = min(3, len(individuo))
-        longitud_segmento = random.randint(2, max_longitud)
+        longitud_segmento = self.rng.randint(2, max_longitud)
         
         if len(individuo) - longitud_segmento < 0:
             return individuo
         
-        pos_inicial = random.randint(0, len(individuo) - longitud_segmento)
+        pos_inicial = self.rng.randint(0, len(individuo) - longitud_segmento)
         
         segmento = individuo[pos_inicial:pos_inicial + longitud_segmento]
         
         segmento_reordenado = segmento.copy()
-        random.shuffle(segmento_reordenado)
+        self.rng.shuffle(segmento_reordenado)
         
         individuo_mutado = individuo.copy()
         for j in range(longitud_segmento):
@@ -47,58 +50,52 @@ class SimpleMutationOperator(BaseService):
         if not individuo:
             return individuo
         
-        TOTAL_INSUMOS = 25
-        num_asignaciones_mutar = random.randint(1, min(3, len(individuo)))
-        asignaciones_a_mutar = random.sample(range(len(individuo)), num_asignaciones_mutar)
+        num_asignaciones_mutar = self.rng.randint(1, min(3, len(individuo)))
+        asignaciones_a_mutar = self.rng.sample(range(len(individuo)), num_asignaciones_mutar)
         
         for idx in asignaciones_a_mutar:
             asignacion = individuo[idx]
+            asignacion.sucia = True
+            total_insumos = len(asignacion.insumos)
             
-            if len(asignacion.insumos) < TOTAL_INSUMOS:
-                asignacion.insumos.extend([0] * (TOTAL_INSUMOS - len(asignacion.insumos)))
-            elif len(asignacion.insumos) > TOTAL_INSUMOS:
-                asignacion.insumos = asignacion.insumos[:TOTAL_INSUMOS]
-            
-            vehiculo_id = asignacion.vehiculo_id
-            capacidad_kg = 1000 
-
-            peso_actual = sum(asignacion.insumos) * 5.0
-            utilizacion_actual = (peso_actual / capacidad_kg) * 100
+            capacidad_kg = self.carga.capacidad(asignacion.vehiculo_id)
+            peso_actual = self.carga.peso(asignacion.insumos)
+            utilizacion_actual = (peso_actual / capacidad_kg) * 100 if capacidad_kg > 0 else 100
             
             if utilizacion_actual < 50:
-                num_insumos_mutar = random.randint(3, 6)
-                indices_insumos = random.sample(range(TOTAL_INSUMOS), num_insumos_mutar)
+                num_insumos_mutar = self.rng.randint(3, 6)
+                indices_insumos = self.rng.sample(range(total_insumos), min(num_insumos_mutar, total_insumos))
                 
                 for insumo_idx in indices_insumos:
-                    if random.random() < 0.8:
-                        asignacion.insumos[insumo_idx] = min(12, asignacion.insumos[insumo_idx] + random.randint(2, 4))
+                    if self.rng.random() < 0.8:
+                        asignacion.insumos[insumo_idx] = min(12, asignacion.insumos[insumo_idx] + self.rng.randint(2, 4))
                     else:
                         asignacion.insumos[insumo_idx] = max(0, asignacion.insumos[insumo_idx] - 1)
             
             elif utilizacion_actual < 70: 
-                num_insumos_mutar = random.randint(2, 4)
-                indices_insumos = random.sample(range(TOTAL_INSUMOS), num_insumos_mutar)
+                num_insumos_mutar = self.rng.randint(2, 4)
+                indices_insumos = self.rng.sample(range(total_insumos), min(num_insumos_mutar, total_insumos))
                 
                 for insumo_idx in indices_insumos:
-                    if random.random() < 0.7:
-                        asignacion.insumos[insumo_idx] = min(10, asignacion.insumos[insumo_idx] + random.randint(1, 3))
+                    if self.rng.random() < 0.7:
+                        asignacion.insumos[insumo_idx] = min(10, asignacion.insumos[insumo_idx] + self.rng.randint(1, 3))
                     else:
                         asignacion.insumos[insumo_idx] = max(0, asignacion.insumos[insumo_idx] - 1)
             
             elif utilizacion_actual > 95: 
-                num_insumos_mutar = random.randint(2, 4)
-                indices_insumos = random.sample(range(TOTAL_INSUMOS), num_insumos_mutar)
+                num_insumos_mutar = self.rng.randint(2, 4)
+                indices_insumos = self.rng.sample(range(total_insumos), min(num_insumos_mutar, total_insumos))
                 
                 for insumo_idx in indices_insumos:
                     if asignacion.insumos[insumo_idx] > 0:
-                        asignacion.insumos[insumo_idx] = max(0, asignacion.insumos[insumo_idx] - random.randint(1, 3))
+                        asignacion.insumos[insumo_idx] = max(0, asignacion.insumos[insumo_idx] - self.rng.randint(1, 3))
             
             else: 
-                num_insumos_mutar = random.randint(1, 2)
-                indices_insumos = random.sample(range(TOTAL_INSUMOS), num_insumos_mutar)
+                num_insumos_mutar = self.rng.randint(1, 2)
+                indices_insumos = self.rng.sample(range(total_insumos), min(num_insumos_mutar, total_insumos))
                 
                 for insumo_idx in indices_insumos:
-                    if random.random() < 0.5:
+                    if self.rng.random() < 0.5:
                         asignacion.insumos[insumo_idx] = min(8, asignacion.insumos[insumo_idx] + 1)
                     else:
                         asignacion.insumos[insumo_idx] = max(0, asignacion.insumos[insumo_idx] - 1)
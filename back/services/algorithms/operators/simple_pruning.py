@@ -1,36 +1,37 @@
+import heapq
 import random
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 from core.base_service import BaseService
 from ..models import Individual
 
 class SimplePruningOperator(BaseService):
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         super().__init__()
+        self.rng = rng or random.Random()
     
     def poda_aleatoria_conservando_mejor(self, poblacion_evaluada: List[Tuple[Individual, float]], 
                                        poblacion_maxima: int) -> List[Individual]:
-        if len(poblacion_evaluada) <= poblacion_maxima:
-            return [individuo for individuo, _ in poblacion_evaluada]
-        
-        if not poblacion_evaluada:
-            return []
-        
-        mejor_individuo = max(poblacion_evaluada, key=lambda x: x[1])[0]
-        
-        poblacion_temp = []
-        for individuo, fitness in poblacion_evaluada:
-            if individuo != mejor_individuo:
-                poblacion_temp.append(individuo)
-        
-        individuos_a_conservar = poblacion_maxima - 1
-        if individuos_a_conservar < 0:
-            individuos_a_conservar = 0
+        indices = self.poda_indices_conservando_mejor(
+            [fitness for _, fitness in poblacion_evaluada], poblacion_maxima
+        )
+        return [poblacion_evaluada[i][0] for i in indices]
+    
+    def poda_indices_conservando_mejor(self, fitnesses: List[float], poblacion_maxima: int,
+                                       elite: int = 1) -> List[int]:
+        """Índices a conservar: los `elite` mejores (por posición, no por igualdad) y una muestra aleatoria del resto."""
+        if len(fitnesses) <= poblacion_maxima:
+            return list(range(len(fitnesses)))
         
-        if individuos_a_conservar >= len(poblacion_temp):
-            nueva_poblacion = [mejor_individuo] + poblacion_temp
+        elite = max(1, min(elite, poblacion_maxima))
+        if elite == 1:
+            mejores = [max(range(len(fitnesses)), key=fitnesses.__getitem__)]
         else:
-            indices_seleccionados = random.sample(range(len(poblacion_temp)), individuos_a_conservar)
-            nueva_poblacion = [mejor_individuo]
-            nueva_poblacion.extend([poblacion_temp[i] for i in indices_seleccionados])
+            mejores = heapq.nlargest(elite, range(len(fitnesses)), key=fitnesses.__getitem__)
+        elegidos = set(mejores)
+        resto = [i for i in range(len(fitnesses)) if i not in elegidos]
+        
+        individuos_a_conservar = poblacion_maxima - len(mejores)
+        if individuos_a_conservar >= len(resto):
+            return mejores + resto
         
-        return nueva_poblacion
\ No newline at end of file
+        return mejores + self.rng.sample(resto, individuos_a_conservar)
\ No newline at end of file
@@ -1,122 +1,102 @@
 import random
-from typing import List, Set
+from typing import List, Set, Optional, Tuple
 from core.base_service import BaseService
-from ..models import Individual, AsignacionVehiculo, EstadoRuta
+from ..core.compatibility_index import CompatibilityIndex
+from ..core.load_kernel import LoadKernel
+from ..models import Individual, AsignacionVehiculo, vector_insumos
 
 class SimpleRepairOperator(BaseService):
-    def __init__(self, rutas_data: List, vehiculos_expandidos: List[dict]):
+    def __init__(self, rutas_data: List, vehiculos_expandidos: List[dict], carga: LoadKernel,
+                 rng: Optional[random.Random] = None,
+                 compatibilidad: Optional[CompatibilityIndex] = None):
         super().__init__()
+        self.rng = rng or random.Random()
+        self.carga = carga
+        self.total_insumos = carga.total_insumos
         self.rutas = {r.id: r for r in rutas_data}
         self.vehiculos = {v['id']: v for v in vehiculos_expandidos}
         self.vehiculos_disponibles = vehiculos_expandidos
+        self.compatibilidad = compatibilidad or CompatibilityIndex(rutas_data, vehiculos_expandidos)
     
     def reparar_individuo(self, individuo: Individual) -> Individual:
         if not individuo:
             return self._generar_individuo_basico()
-    
-        individuo_limpio = self._eliminar_asignaciones_invalidas(individuo)
-        individuo_sin_duplicados = self._resolver_duplicados(individuo_limpio)
-        individuo_completo = self._asegurar_uso_vehiculos_con_rutas_validas(individuo_sin_duplicados)
-        individuo_final = self._recalcular_metricas_correctas(individuo_completo)
-        
-        return individuo_final
-    
-    def _eliminar_asignaciones_invalidas(self, individuo: Individual) -> Individual:
+
+        individuo_valido, vehiculos_usados, rutas_usadas = self._filtrar_asignaciones(individuo)
+        individuo_completo = self._completar_vehiculos_sin_ruta(individuo_valido, vehiculos_usados, rutas_usadas)
+
+        return self._recalcular_metricas_correctas(individuo_completo)
+
+    def _filtrar_asignaciones(self, individuo: Individual) -> Tuple[Individual, Set[int], int]:
+        """Descarta asignaciones inválidas y duplicadas en una sola pasada.
+
+        Una asignación se conserva si su ruta está abierta y es compatible con
+        el vehículo, y ni el vehículo ni la ruta aparecieron antes. Las rutas
+        usadas se devuelven como máscara de bits sobre el índice de compatibilidad.
+        """
+        indice_ruta = self.compatibilidad.indice_ruta
+        mascara_factible = self.compatibilidad.mascara_factible
+        vehiculos_usados: Set[int] = set()
+        rutas_usadas = 0
         asignaciones_validas = []
-        
+
         for asignacion in individuo:
-            if asignacion.vehiculo_id not in self.vehiculos:
+            posicion = indice_ruta.get(asignacion.ruta_id)
+            if posicion is None or asignacion.vehiculo_id in vehiculos_usados:
                 continue
-            
-            if asignacion.ruta_id not in self.rutas:
-                continue
-            
-            ruta = self.rutas[asignacion.ruta_id]
-            
-            if ruta.estado == EstadoRuta.CERRADA:
-                continue
-            
-            vehiculo = self.vehiculos[asignacion.vehiculo_id]
-            if not self._es_compatible_vehiculo_ruta(vehiculo, ruta):
+
+            bit_ruta = 1 << posicion
+            if rutas_usadas & bit_ruta or not mascara_factible(asignacion.vehiculo_id) & bit_ruta:
                 continue
-            
+
+            vehiculos_usados.add(asignacion.vehiculo_id)
+            rutas_usadas |= bit_ruta
             asignaciones_validas.append(asignacion)
-        
-        return asignaciones_validas
-    
-    def _resolver_duplicados(self, individuo: Individual) -> Individual:
-        vehiculos_usados: Set[int] = set()
-        rutas_usadas: Set[int] = set()
-        asignaciones_unicas = []
-        
-        for asignacion in individuo:
-            if (asignacion.vehiculo_id not in vehiculos_usados and 
-                asignacion.ruta_id not in rutas_usadas):
-                
-                vehiculos_usados.add(asignacion.vehiculo_id)
-                rutas_usadas.add(asignacion.ruta_id)
-                asignaciones_unicas.append(asignacion)
-        
-        return asignaciones_unicas
-    
-    def _asegurar_uso_vehiculos_con_rutas_validas(self, individuo: Individual) -> Individual:
-        vehiculos_usados = {asig.vehiculo_id for asig in individuo}
-        rutas_usadas = {asig.ruta_id for asig in individuo}
 
-        vehiculos_sin_usar = [v for v in self.vehiculos_disponibles 
-                             if v['id'] not in vehiculos_usados]
-        
-        rutas_abiertas = [r for r in self.rutas.values() 
-                         if r.estado == EstadoRuta.ABIERTA]
-        rutas_disponibles = [r for r in rutas_abiertas 
-                           if r.id not in rutas_usadas]
-        
-        individuo_completo = individuo.copy()
-        
-        for vehiculo in vehiculos_sin_usar:
-            ruta_asignada = None
-            
-            for ruta in rutas_disponibles:
-                if self._es_compatible_vehiculo_ruta(vehiculo, ruta):
-                    ruta_asignada = ruta
-                    rutas_disponibles.remove(ruta)
-                    break
-            
-            if ruta_asignada:
-                nueva_asignacion = self._crear_asignacion_optimizada(vehiculo, ruta_asignada)
-                individuo_completo.append(nueva_asignacion)
+        return asignaciones_validas, vehiculos_usados, rutas_usadas
+
+    def _completar_vehiculos_sin_ruta(self, individuo: Individual, vehiculos_usados: Set[int],
+                                      rutas_usadas: int) -> Individual:
+        """Asigna a cada vehículo libre la primera ruta factible aún sin usar, o standby."""
+        for vehiculo in self.vehiculos_disponibles:
+            if vehiculo['id'] in vehiculos_usados:
+                continue
+
+            rutas_libres = self.compatibilidad.mascara_factible(vehiculo['id']) & ~rutas_usadas
+            if rutas_libres:
+                posicion = (rutas_libres & -rutas_libres).bit_length() - 1
+                rutas_usadas |= 1 << posicion
+                individuo.append(self._crear_asignacion_optimizada(vehiculo, self.compatibilidad.rutas[posicion]))
             else:
-                asignacion_standby = self._crear_asignacion_standby(vehiculo)
-                individuo_completo.append(asignacion_standby)
-        
-        return individuo_completo
+                individuo.append(self._crear_asignacion_standby(vehiculo))
+
+        return individuo
     
     def _crear_asignacion_optimizada(self, vehiculo: dict, ruta) -> AsignacionVehiculo:
-        TOTAL_INSUMOS = 25
         capacidad_kg = vehiculo['maximo_peso_ton'] * 1000
         
         if capacidad_kg >= 2500:
-            objetivo_aprovechamiento = random.uniform(0.85, 0.95)
+            objetivo_aprovechamiento = self.rng.uniform(0.85, 0.95)
             rango_cantidad = (3, 8)
         elif capacidad_kg >= 1500:
-            objetivo_aprovechamiento = random.uniform(0.80, 0.92)
+            objetivo_aprovechamiento = self.rng.uniform(0.80, 0.92)
             rango_cantidad = (2, 6)
         else:
-            objetivo_aprovechamiento = random.uniform(0.75, 0.88)
+            objetivo_aprovechamiento = self.rng.uniform(0.75, 0.88)
             rango_cantidad = (1, 4)
         
-        insumos = [0] * TOTAL_INSUMOS
+        insumos = vector_insumos(self.total_insumos)
         peso_objetivo = capacidad_kg * objetivo_aprovechamiento
-        peso_promedio_insumo = 5.0
+        peso_promedio_insumo = self.carga.peso_medio_kg or 1.0
         
-        cantidad_insumos_activos = random.randint(8, 15)
-        indices_activos = random.sample(range(TOTAL_INSUMOS), cantidad_insumos_activos)
+        cantidad_insumos_activos = min(self.rng.randint(8, 15), self.total_insumos)
+        indices_activos = self.rng.sample(range(self.total_insumos), cantidad_insumos_activos)
         
-        peso_por_insumo = peso_objetivo / cantidad_insumos_activos
+        peso_por_insumo = peso_objetivo / cantidad_insumos_activos if cantidad_insumos_activos > 0 else 0.0
         
         for idx in indices_activos:
             cantidad_base = int(peso_por_insumo / peso_promedio_insumo)
-            variacion = random.randint(rango_cantidad[0], rango_cantidad[1])
+            variacion = self.rng.randint(rango_cantidad[0], rango_cantidad[1])
             insumos[idx] = max(1, cantidad_base + variacion)
         
         return AsignacionVehiculo(
@@ -129,80 +109,38 @@ class SimpleRepairOperator(BaseService):
         )
     
     def _crear_asignacion_standby(self, vehiculo: dict) -> AsignacionVehiculo:
-        TOTAL_INSUMOS = 25
-        insumos = [0] * TOTAL_INSUMOS
-        
         return AsignacionVehiculo(
             vehiculo_id=vehiculo['id'],
             ruta_id=-1,
-            insumos=insumos,
+            insumos=vector_insumos(self.total_insumos),
             peso_total_kg=0,
             distancia_km=0,
             combustible_usado=0
         )
     
-    def _es_compatible_vehiculo_ruta(self, vehiculo: dict, ruta) -> bool:
-        if not ruta.vehiculos_permitidos:
-            return True
-        
-        tipo_vehiculo = vehiculo['tipo'].lower()
-        return any(tipo_permitido.lower() in tipo_vehiculo or 
-                  tipo_vehiculo in tipo_permitido.lower() 
-                  for tipo_permitido in ruta.vehiculos_permitidos)
-    
     def _recalcular_metricas_correctas(self, individuo: Individual) -> Individual:
-        TOTAL_INSUMOS = 25
-        peso_promedio_insumo = 5.0
-        
         for asignacion in individuo:
-            if len(asignacion.insumos) < TOTAL_INSUMOS:
-                asignacion.insumos.extend([0] * (TOTAL_INSUMOS - len(asignacion.insumos)))
-            elif len(asignacion.insumos) > TOTAL_INSUMOS:
-                asignacion.insumos = asignacion.insumos[:TOTAL_INSUMOS]
-            
+            if not asignacion.sucia:
+                continue
+
             if asignacion.ruta_id == -1:
-                asignacion.insumos = [0] * TOTAL_INSUMOS
+                asignacion.insumos = vector_insumos(self.total_insumos)
                 asignacion.peso_total_kg = 0
                 asignacion.combustible_usado = 0
+                asignacion.sucia = False
                 continue
             
-            peso_total = sum(asignacion.insumos) * peso_promedio_insumo
             vehiculo = self.vehiculos.get(asignacion.vehiculo_id)
             
             if vehiculo:
-                capacidad_kg = vehiculo['maximo_peso_ton'] * 1000
-                asignacion.peso_total_kg = min(peso_total, capacidad_kg)
-                
-                velocidad_kmh = vehiculo.get('velocidad_kmh', 65)
-                if velocidad_kmh > 0:
-                    tiempo_viaje = asignacion.distancia_km / velocidad_kmh
-                else:
-                    tiempo_viaje = 0
-                
+                capacidad_kg = self.carga.capacidad(asignacion.vehiculo_id)
+                asignacion.peso_total_kg = self.carga.recortar(asignacion.insumos, capacidad_kg)
                 asignacion.combustible_usado = (asignacion.distancia_km * 
                                               vehiculo['consumo_litros_km'])
+                asignacion.sucia = False
         
         return individuo
     
     def _generar_individuo_basico(self) -> Individual:
-        individuo = []
-        rutas_abiertas = [r for r in self.rutas.values() 
-                         if r.estado == EstadoRuta.ABIERTA]
-        
-        for i, vehiculo in enumerate(self.vehiculos_disponibles):
-            ruta_asignada = None
-            
-            for ruta in rutas_abiertas:
-                if self._es_compatible_vehiculo_ruta(vehiculo, ruta):
-                    ruta_asignada = ruta
-                    rutas_abiertas.remove(ruta)
-                    break
-            
-            if ruta_asignada:
-                asignacion = self._crear_asignacion_optimizada(vehiculo, ruta_asignada)
-                individuo.append(asignacion)
-            else:
-                asignacion = self._crear_asignacion_standby(vehiculo)
-                individuo.append(asignacion)
-        
-        return self._recalcular_metricas_correctas(individuo)
\ No newline at end of file
+        individuo = self._completar_vehiculos_sin_ruta([], set(), 0)
+        return self._recalcular_metricas_correctas(individuo)
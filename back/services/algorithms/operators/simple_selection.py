@@ -1,12 +1,13 @@
 import random
-from typing import List, Tuple
+from typing import List, Tuple, Optional
 from core.base_service import BaseService
 from ..models import Individual
 
 class SimpleSelectionOperator(BaseService):
     
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         super().__init__()
+        self.rng = rng or random.Random()
     
     def seleccion_por_orden(self, poblacion_evaluada: List[Tuple[Individual, float]]) -> List[Tuple[Individual, Individual]]:
         poblacion_ordenada = sorted(poblacion_evaluada, key=lambda x: x[1], reverse=True)
@@ -23,4 +24,14 @@ class SimpleSelectionOperator(BaseService):
             mejor = poblacion_ordenada[0][0]
             parejas.append((ultimo, mejor))
         
-        return parejas
\ No newline at end of file
+        return parejas
+    
+    def seleccion_por_torneo(self, poblacion_evaluada: List[Tuple[Individual, float]], parejas: int,
+                             tamaño_torneo: int = 3) -> List[Tuple[Individual, Individual]]:
+        """Parejas de ganadores de torneos de tamaño k, sin ordenar la población."""
+        k = max(1, min(tamaño_torneo, len(poblacion_evaluada)))
+        
+        def ganador() -> Individual:
+            return max(self.rng.sample(poblacion_evaluada, k), key=lambda x: x[1])[0]
+        
+        return [(ganador(), ganador()) for _ in range(parejas)]
\ No newline at end of file
@@ -9,7 +9,7 @@ class ResultFormatter:
     def formatear_para_frontend(resultado_ag: Dict[str, Any]) -> Dict[str, Any]:
         """Formatear resultados para el frontend"""
         
-        return {
+        resultado = {
             "solucion_optima": {
                 "asignaciones": resultado_ag["mejor_solucion"]["asignaciones"],
                 "fitness": resultado_ag["mejor_solucion"]["fitness"],
@@ -39,7 +39,9 @@ class ResultFormatter:
                 "evolucion_fitness": {
                     "datos": resultado_ag["evolucion_fitness"],
                     "generaciones": list(range(1, len(resultado_ag["evolucion_fitness"]) + 1)),
-                    "mejora_total": resultado_ag["metricas_optimizacion"]["mejora_total"]
+                    "mejora_total": resultado_ag["metricas_optimizacion"]["mejora_total"],
+                    "islas": resultado_ag.get("evolucion_islas", []),
+                    "reinicios": resultado_ag.get("evolucion_reinicios", [])
                 },
                 
                 "distribucion_carga": resultado_ag["distribucion_carga"],
@@ -57,6 +59,27 @@ class ResultFormatter:
                 "optimizacion": resultado_ag["metricas_optimizacion"]
             }
         }
+        
+        if resultado_ag.get("frente_pareto") is not None:
+            resultado["frente_pareto"] = [
+                {
+                    "posicion": i + 1,
+                    "fitness": solucion["fitness"],
+                    "objetivos": solucion["objetivos"],
+                    "asignaciones": solucion["asignaciones"],
+                    "resumen": {
+                        "rutas": solucion["rutas_utilizadas"],
+                        "vehiculos": solucion["vehiculos_utilizados"],
+                        "peso": solucion["peso_total_transportado"]
+                    }
+                }
+                for i, solucion in enumerate(resultado_ag["frente_pareto"])
+            ]
+        
+        if resultado_ag.get("perfil") is not None:
+            resultado["perfil"] = resultado_ag["perfil"]
+        
+        return resultado
     
     @staticmethod
     def generar_resumen_ejecutivo(resultado_ag: Dict[str, Any]) -> Dict[str, Any]:
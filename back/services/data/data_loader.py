@@ -62,6 +62,16 @@ class DataLoader(CacheableService):
             self.log_error("Error obteniendo categorías de insumos", e)
             raise
     
+    def get_configuracion_ag_recomendada(self) -> Dict[str, Any]:
+        """Configuración del AG recomendada por grupo de tamaño (benchmarks/ag_tuning.py); vacía si no existe"""
+        if not os.path.exists(os.path.join(self.data_path, "configuracion_ag.json")):
+            return {}
+        try:
+            return self._load_json_file("configuracion_ag.json")
+        except Exception as e:
+            self.log_error("Error obteniendo la configuración recomendada del AG", e)
+            return {}
+    
     def get_desastre_by_tipo(self, tipo_desastre: str) -> Dict[str, Any]:
         """Obtener desastre específico por tipo"""
         try:
@@ -0,0 +1,192 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from core.base_service import BaseService
+from core.exceptions import JobQueueFullError, JobStateError
+from services.algorithms.core.solution_store import SolutionStore
+from services.algorithms.main.genetic_algorithm import LogisticsGeneticAlgorithm
+from .reoptimization import aplicar_delta, GENERACIONES_REOPTIMIZACION, SEGUNDOS_REOPTIMIZACION
+
+ESTADO_EN_COLA = "en_cola"
+ESTADO_EJECUTANDO = "ejecutando"
+ESTADO_COMPLETADO = "completado"
+ESTADO_ERROR = "error"
+ESTADO_CANCELADO = "cancelado"
+
+ESTADOS_FINALES = (ESTADO_COMPLETADO, ESTADO_ERROR, ESTADO_CANCELADO)
+
+
+@dataclass
+class TrabajoAG:
+    id: str
+    frontend_data: Dict[str, Any]
+    parametros_ag: Dict[str, Any]
+    estado: str = ESTADO_EN_COLA
+    creado: float = field(default_factory=time.time)
+    iniciado: Optional[float] = None
+    finalizado: Optional[float] = None
+    resultado: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    cancelacion_solicitada: bool = False
+    progreso: Optional[Dict[str, Any]] = None
+    ag: Optional[LogisticsGeneticAlgorithm] = None
+    # Población final exportada; junto con frontend_data permite reoptimizar el trabajo
+    poblacion: Optional[Dict[str, Any]] = None
+    reoptimiza: Optional[str] = None
+    # Reoptimización: población de la que parte y parámetros que sustituyen a parametros_ag
+    semilla: Optional[Dict[str, Any]] = None
+    ajustes_ag: Dict[str, Any] = field(default_factory=dict)
+
+
+class GAJobManager(BaseService):
+    """Cola acotada de ejecuciones del AG en segundo plano"""
+
+    def __init__(self, max_concurrentes: int = 2, max_cola: int = 20, retencion: int = 100,
+                 solution_store: Optional[SolutionStore] = None, directorio_cprofile: Optional[str] = None):
+        super().__init__()
+        self.max_cola = max_cola
+        self.retencion = retencion
+        self.solution_store = solution_store
+        self.directorio_cprofile = directorio_cprofile
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrentes),
+                                            thread_name_prefix="ag-job")
+        self._trabajos: "OrderedDict[str, TrabajoAG]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def enviar(self, frontend_data: Dict[str, Any], parametros_ag: Dict[str, Any]) -> TrabajoAG:
+        with self._lock:
+            return self._encolar(TrabajoAG(id=uuid.uuid4().hex, frontend_data=frontend_data,
+                                           parametros_ag=parametros_ag))
+
+    def _encolar(self, trabajo: TrabajoAG) -> TrabajoAG:
+        """Registrar y enviar al pool un trabajo nuevo (con _lock)."""
+        en_cola = sum(1 for t in self._trabajos.values() if t.estado == ESTADO_EN_COLA)
+        if en_cola >= self.max_cola:
+            raise JobQueueFullError(f"Cola de trabajos llena ({self.max_cola} en espera)")
+
+        self._trabajos[trabajo.id] = trabajo
+        self._purgar_finalizados()
+        self._executor.submit(self._ejecutar, trabajo)
+        return trabajo
+
+    def obtener(self, trabajo_id: str) -> Optional[TrabajoAG]:
+        with self._lock:
+            return self._trabajos.get(trabajo_id)
+
+    def cancelar(self, trabajo_id: str) -> Optional[TrabajoAG]:
+        with self._lock:
+            trabajo = self._trabajos.get(trabajo_id)
+            if trabajo is None or trabajo.estado in ESTADOS_FINALES:
+                return trabajo
+
+            trabajo.cancelacion_solicitada = True
+            if trabajo.estado == ESTADO_EN_COLA:
+                trabajo.estado = ESTADO_CANCELADO
+                trabajo.finalizado = time.time()
+            elif trabajo.ag is not None:
+                trabajo.ag.control.cancelar()
+
+        return trabajo
+
+    def _ejecutar(self, trabajo: TrabajoAG) -> None:
+        with self._lock:
+            if trabajo.estado != ESTADO_EN_COLA:
+                return
+            trabajo.estado = ESTADO_EJECUTANDO
+            trabajo.iniciado = time.time()
+
+        try:
+            parametros_ag = dict(trabajo.parametros_ag, **trabajo.ajustes_ag)
+            ag = LogisticsGeneticAlgorithm(trabajo.frontend_data, parametros_ag,
+                                           solution_store=self.solution_store,
+                                           directorio_cprofile=self.directorio_cprofile)
+            if trabajo.semilla is not None:
+                ag.sembrar_poblacion(trabajo.semilla)
+
+            with self._lock:
+                trabajo.ag = ag
+                if trabajo.cancelacion_solicitada:
+                    ag.control.cancelar()
+
+            resultado = ag.ejecutar()
+
+            poblacion = ag.exportar_poblacion() if not ag.control.cancelado else None
+
+            with self._lock:
+                if ag.control.cancelado:
+                    trabajo.estado = ESTADO_CANCELADO
+                else:
+                    trabajo.estado = ESTADO_COMPLETADO
+                    trabajo.resultado = resultado
+                    trabajo.poblacion = poblacion
+
+        except Exception as e:
+            self.log_error(f"Error en trabajo AG {trabajo.id}", e)
+            with self._lock:
+                trabajo.estado = ESTADO_ERROR
+                trabajo.error = str(e)
+
+        finally:
+            with self._lock:
+                trabajo.finalizado = time.time()
+                trabajo.semilla = None
+                if trabajo.estado != ESTADO_COMPLETADO:
+                    trabajo.frontend_data = {}
+                if trabajo.ag is not None:
+                    trabajo.progreso = trabajo.ag.control.progreso()
+                    trabajo.ag = None
+
+    def reoptimizar(self, trabajo_id: str, delta: Dict[str, Any],
+                    generaciones: int = GENERACIONES_REOPTIMIZACION,
+                    max_segundos: float = SEGUNDOS_REOPTIMIZACION) -> Optional[TrabajoAG]:
+        """Encolar la reoptimización de un trabajo completado tras un cambio de rutas o flota.
+
+        El delta se valida en el hilo que llama; el trabajo nuevo pasa por la
+        misma cola y límite de concurrencia que el resto. Parte de la
+        población final del trabajo, repara solo las asignaciones afectadas
+        por el delta y evoluciona unas pocas generaciones acotadas por
+        tiempo. Al completarse puede a su vez reoptimizarse.
+        """
+        with self._lock:
+            previo = self._trabajos.get(trabajo_id)
+            if previo is None:
+                return None
+            if previo.estado != ESTADO_COMPLETADO or previo.poblacion is None:
+                raise JobStateError(f"El trabajo {trabajo_id} no está completado ({previo.estado})")
+            frontend_data, parametros_ag, poblacion = previo.frontend_data, previo.parametros_ag, previo.poblacion
+
+        frontend_data = aplicar_delta(frontend_data, delta)
+        trabajo = TrabajoAG(
+            id=uuid.uuid4().hex, frontend_data=frontend_data, parametros_ag=parametros_ag,
+            reoptimiza=trabajo_id, semilla=poblacion,
+            # Una sola población y sin pool de procesos: arrancarlo costaría más que las generaciones
+            ajustes_ag={'generaciones': generaciones, 'max_segundos': max_segundos,
+                        'islas': 1, 'reinicios': 1, 'evaluacion_paralela': False}
+        )
+
+        with self._lock:
+            return self._encolar(trabajo)
+
+    def _purgar_finalizados(self) -> None:
+        finalizados = [t.id for t in self._trabajos.values() if t.estado in ESTADOS_FINALES]
+        for trabajo_id in finalizados[:max(0, len(finalizados) - self.retencion)]:
+            del self._trabajos[trabajo_id]
+
+    def describir(self, trabajo: TrabajoAG) -> Dict[str, Any]:
+        with self._lock:
+            progreso = trabajo.ag.control.progreso() if trabajo.ag is not None else trabajo.progreso
+            return {
+                "job_id": trabajo.id,
+                "estado": trabajo.estado,
+                "creado": trabajo.creado,
+                "iniciado": trabajo.iniciado,
+                "finalizado": trabajo.finalizado,
+                "progreso": progreso,
+                "resultado": trabajo.resultado,
+                "error": trabajo.error,
+                "reoptimiza": trabajo.reoptimiza
+            }
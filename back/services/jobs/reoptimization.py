@@ -0,0 +1,67 @@
+import copy
+from typing import Any, Dict, List
+from core.exceptions import ValidationError
+
+GENERACIONES_REOPTIMIZACION = 10
+MAX_GENERACIONES_REOPTIMIZACION = 50
+SEGUNDOS_REOPTIMIZACION = 1.0
+MAX_SEGUNDOS_REOPTIMIZACION = 10.0
+
+CAMPOS_DELTA = ('rutas_cerradas', 'rutas_abiertas', 'vehiculos_agregados', 'vehiculos_retirados')
+
+
+def aplicar_delta(frontend_data: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Copia de frontend_data con rutas cerradas/abiertas y vehículos agregados/retirados.
+
+    Las rutas se identifican por su id (o su posición, como en DataManager)
+    y los vehículos por modelo y cantidad.
+    """
+    if not isinstance(delta, dict) or not any(delta.get(campo) for campo in CAMPOS_DELTA):
+        raise ValidationError(f"El delta requiere al menos uno de {list(CAMPOS_DELTA)}")
+
+    datos = copy.deepcopy(frontend_data)
+    rutas = {ruta.get('id', i + 1): ruta for i, ruta in enumerate(datos['map_data']['rutas_data'])}
+
+    for campo, estado in (('rutas_cerradas', 'cerrada'), ('rutas_abiertas', 'abierta')):
+        for ruta_id in delta.get(campo) or []:
+            if ruta_id not in rutas:
+                raise ValidationError(f"Ruta {ruta_id} no existe en el escenario")
+            rutas[ruta_id]['estado'] = estado
+
+    if not any(str(ruta.get('estado', 'abierta')).lower() == 'abierta' for ruta in rutas.values()):
+        raise ValidationError("El delta cierra todas las rutas")
+
+    flota: List[Dict[str, Any]] = datos['scenario_config']['vehiculos_disponibles']
+
+    for vehiculo in delta.get('vehiculos_agregados') or []:
+        modelo, cantidad = _vehiculo_delta(vehiculo)
+        existente = next((v for v in flota if v.get('modelo') == modelo), None)
+        if existente:
+            existente['cantidad'] = existente.get('cantidad', 1) + cantidad
+        else:
+            flota.append({'modelo': modelo, 'cantidad': cantidad})
+
+    for vehiculo in delta.get('vehiculos_retirados') or []:
+        modelo, cantidad = _vehiculo_delta(vehiculo)
+        existente = next((v for v in flota if v.get('modelo') == modelo), None)
+        if existente is None or existente.get('cantidad', 1) < cantidad:
+            raise ValidationError(f"No hay {cantidad} vehículo(s) {modelo} para retirar")
+        existente['cantidad'] = existente.get('cantidad', 1) - cantidad
+        if existente['cantidad'] == 0:
+            flota.remove(existente)
+
+    if not flota:
+        raise ValidationError("El delta retira todos los vehículos")
+
+    return datos
+
+
+def _vehiculo_delta(vehiculo: Any) -> tuple:
+    if not isinstance(vehiculo, dict) or not vehiculo.get('modelo'):
+        raise ValidationError(f"Vehículo inválido en el delta: {vehiculo}")
+
+    cantidad = vehiculo.get('cantidad', 1)
+    if not isinstance(cantidad, int) or cantidad < 1:
+        raise ValidationError(f"Cantidad inválida para {vehiculo['modelo']}: {cantidad}")
+
+    return vehiculo['modelo'], cantidad
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from core.base_service import BaseService
+
+ORIGEN_CACHE = "cache"
+ORIGEN_COMPARTIDO = "compartido"
+ORIGEN_CALCULADO = "calculado"
+
+
+class _Vuelo:
+    __slots__ = ("listo", "resultado", "error")
+
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+
+
+class GAResultCache(BaseService):
+    """Resultados completos del AG en disco, por hash canónico de la petición.
+
+    Las entradas caducan tras ttl_segundos y, si el directorio supera
+    max_bytes, se eliminan las más antiguas. Las peticiones idénticas que
+    llegan mientras otra se calcula esperan ese mismo cálculo (single-flight)
+    en lugar de lanzar uno nuevo.
+    """
+
+    def __init__(self, directorio: str, ttl_segundos: float = 3600, max_bytes: int = 256 * 1024 * 1024):
+        super().__init__()
+        self.directorio = directorio
+        self.ttl_segundos = ttl_segundos
+        self.max_bytes = max_bytes
+        self._en_curso: Dict[str, _Vuelo] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def clave(frontend_data: Dict[str, Any], parametros_ag: Dict[str, Any]) -> str:
+        # La semilla viaja en parametros_ag; sin ella, cualquier resultado previo es válido
+        canonico = json.dumps({
+            'frontend_data': frontend_data,
+            'parametros_ag': parametros_ag
+        }, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+        return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+    def obtener_o_calcular(self, clave: str,
+                           calcular: Callable[[], Dict[str, Any]]) -> Tuple[Dict[str, Any], str]:
+        """Devolver (resultado, origen): de disco, de un cálculo en curso o calculado ahora."""
+        resultado = self._leer(clave)
+        if resultado is not None:
+            return resultado, ORIGEN_CACHE
+
+        with self._lock:
+            vuelo = self._en_curso.get(clave)
+            lider = vuelo is None
+            if lider:
+                vuelo = self._en_curso[clave] = _Vuelo()
+
+        if not lider:
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado, ORIGEN_COMPARTIDO
+
+        try:
+            vuelo.resultado = calcular()
+            self._escribir(clave, vuelo.resultado)
+            return vuelo.resultado, ORIGEN_CALCULADO
+        except BaseException as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+            vuelo.listo.set()
+
+    def _ruta_archivo(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.json")
+
+    def _leer(self, clave: str) -> Optional[Dict[str, Any]]:
+        ruta = self._ruta_archivo(clave)
+        try:
+            if time.time() - os.path.getmtime(ruta) > self.ttl_segundos:
+                os.remove(ruta)
+                return None
+            with open(ruta, 'r', encoding='utf-8') as archivo:
+                return json.load(archivo)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.log_error(f"Resultado en caché ilegible {clave}", e)
+            return None
+
+    def _escribir(self, clave: str, resultado: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.directorio, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+            try:
+                with os.fdopen(descriptor, 'w', encoding='utf-8') as archivo:
+                    json.dump(resultado, archivo, ensure_ascii=False)
+                os.replace(temporal, self._ruta_archivo(clave))
+            except BaseException:
+                os.remove(temporal)
+                raise
+            self._desalojar()
+        except (OSError, TypeError, ValueError) as e:
+            # Un fallo de la caché no debe invalidar un resultado ya calculado
+            self.log_error(f"No se pudo guardar el resultado {clave} en caché", e)
+
+    def _desalojar(self) -> None:
+        entradas = []
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith('.json'):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            entradas.append((estado.st_mtime, estado.st_size, ruta))
+
+        ahora = time.time()
+        total = sum(tamaño for _, tamaño, _ in entradas)
+        for modificado, tamaño, ruta in sorted(entradas):
+            if total <= self.max_bytes and ahora - modificado <= self.ttl_segundos:
+                continue
+            try:
+                os.remove(ruta)
+                total -= tamaño
+            except OSError:
+                pass